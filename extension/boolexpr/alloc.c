@@ -0,0 +1,185 @@
+/*
+** Filename: alloc.c
+**
+** Slab allocation for expression nodes and arrays
+**
+** Nodes, array headers, and small item arrays are carved out of large
+** chunks, and freed blocks are kept on one free list per block size.
+** This replaces a malloc/free pair per node with a few pointer moves.
+**
+** Chunks are never returned to the system,
+** so memory is reused by later expressions of the same process.
+**
+** The slabs are shared by all threads, and each one has its own spin lock.
+** A block freed by any thread can be reused by any other,
+** so nothing is stranded when a thread exits.
+*/
+
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdlib.h>
+
+#include "atomic.h"
+#include "boolexpr.h"
+#include "share.h"
+
+
+/* Size of a chunk, in bytes */
+#define CHUNK_SIZE (64 * 1024)
+
+/* Item arrays longer than this use malloc */
+#define MAX_ITEMS 8
+
+
+struct _Slab {
+    size_t size;
+
+    /* Guards the fields below */
+    _bx_lock_t lock;
+
+    /* Linked list of free blocks */
+    void *free;
+
+    /* Unused part of the newest chunk */
+    char *next;
+    char *end;
+};
+
+
+/* All chunks, linked through their first word */
+static void *_chunks = NULL;
+static _bx_lock_t _chunks_lock = 0;
+
+static struct _Slab _node_slab = {sizeof(struct BoolExpr), 0, NULL, NULL, NULL};
+static struct _Slab _array_slab = {sizeof(struct BX_Array), 0, NULL, NULL, NULL};
+
+/* _items_slabs[n] holds arrays of n items */
+static struct _Slab _items_slabs[MAX_ITEMS+1] = {
+    {0 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {1 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {2 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {3 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {4 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {5 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {6 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {7 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+    {8 * sizeof(struct BoolExpr *), 0, NULL, NULL, NULL},
+};
+
+
+/* Chunk header, which keeps blocks aligned */
+union _Header {
+    void *next;
+    long double ld;
+    long long ll;
+};
+
+
+/* Return a new chunk, or NULL if malloc fails */
+static char *
+_chunk_new(void)
+{
+    char *chunk = malloc(CHUNK_SIZE);
+    if (chunk == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    _bx_lock_acquire(&_chunks_lock);
+    ((union _Header *) chunk)->next = _chunks;
+    _chunks = chunk;
+    _bx_lock_release(&_chunks_lock);
+
+    return chunk;
+}
+
+
+static void *
+_slab_alloc(struct _Slab *slab)
+{
+    void *block;
+
+    _bx_lock_acquire(&slab->lock);
+
+    if (slab->free != NULL) {
+        block = slab->free;
+        slab->free = *((void **) block);
+        _bx_lock_release(&slab->lock);
+        return block;
+    }
+
+    if (slab->next == slab->end) {
+        char *chunk = _chunk_new();
+        if (chunk == NULL) {
+            _bx_lock_release(&slab->lock); // LCOV_EXCL_LINE
+            return NULL;                   // LCOV_EXCL_LINE
+        }
+
+        slab->next = chunk + sizeof(union _Header);
+        slab->end = slab->next + (CHUNK_SIZE - sizeof(union _Header)) / slab->size * slab->size;
+    }
+
+    block = slab->next;
+    slab->next += slab->size;
+
+    _bx_lock_release(&slab->lock);
+
+    return block;
+}
+
+
+static void
+_slab_free(struct _Slab *slab, void *block)
+{
+    _bx_lock_acquire(&slab->lock);
+    *((void **) block) = slab->free;
+    slab->free = block;
+    _bx_lock_release(&slab->lock);
+}
+
+
+struct BoolExpr *
+_bx_node_alloc(void)
+{
+    return _slab_alloc(&_node_slab);
+}
+
+
+void
+_bx_node_free(struct BoolExpr *ex)
+{
+    _slab_free(&_node_slab, ex);
+}
+
+
+struct BX_Array *
+_bx_array_alloc(void)
+{
+    return _slab_alloc(&_array_slab);
+}
+
+
+void
+_bx_array_free(struct BX_Array *array)
+{
+    _slab_free(&_array_slab, array);
+}
+
+
+struct BoolExpr **
+_bx_items_alloc(size_t n)
+{
+    if (n == 0 || n > MAX_ITEMS)
+        return malloc(n * sizeof(struct BoolExpr *));
+
+    return _slab_alloc(&_items_slabs[n]);
+}
+
+
+void
+_bx_items_free(struct BoolExpr **items, size_t n)
+{
+    if (n == 0 || n > MAX_ITEMS)
+        free(items);
+    else
+        _slab_free(&_items_slabs[n], items);
+}
@@ -12,6 +12,25 @@
 #include "share.h"
 
 
+/* Return the items of a set, allocated for _bx_op_from */
+static struct BoolExpr **
+_set_items(struct BX_Set *set)
+{
+    struct BoolExpr **xs;
+    struct BX_SetIter it;
+    size_t i = 0;
+
+    xs = _bx_items_alloc(set->length);
+    if (xs == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    for (BX_SetIter_Init(&it, set); !it.done; BX_SetIter_Next(&it))
+        xs[i++] = it.item->key;
+
+    return xs;
+}
+
+
 struct BX_OrAndArgSet *
 BX_OrAndArgSet_New(BX_Kind kind)
 {
@@ -95,11 +114,11 @@ BX_OrAndArgSet_Reduce(struct BX_OrAndArgSet *argset)
     if (argset->max)
         return BX_IncRef(_bx_dominator[argset->kind]);
 
-    CHECK_NULL(xs, BX_Set_ToExprs(argset->xs));
+    CHECK_NULL(xs, _set_items(argset->xs));
 
     if (length == 1) {
         struct BoolExpr *y = BX_IncRef(xs[0]);
-        free(xs);
+        _bx_items_free(xs, length);
         return y;
     }
 
@@ -203,17 +222,17 @@ BX_XorArgSet_Reduce(struct BX_XorArgSet *argset)
         return y;
     }
 
-    CHECK_NULL(xs, BX_Set_ToExprs(argset->xs));
+    CHECK_NULL(xs, _set_items(argset->xs));
 
     if (length == 1) {
         temp = BX_IncRef(xs[0]);
-        free(xs);
+        _bx_items_free(xs, length);
     }
     else {
         temp = _bx_op_from(BX_OP_XOR, length, xs);
         if (temp == NULL) {
-            free(xs);    // LCOV_EXCL_LINE
-            return NULL; // LCOV_EXCL_LINE
+            _bx_items_free(xs, length); // LCOV_EXCL_LINE
+            return NULL;                // LCOV_EXCL_LINE
         }
     }
 
@@ -306,19 +325,19 @@ BX_EqArgSet_Reduce(struct BX_EqArgSet *argset)
     if (((size_t) argset->zero + (size_t) argset->one + length) <= 1)
         return BX_IncRef(&BX_One);
 
-    CHECK_NULL(xs, BX_Set_ToExprs(argset->xs));
+    CHECK_NULL(xs, _set_items(argset->xs));
 
     /* Equal(0, x) = ~x */
     if (argset->zero && length == 1) {
         y = BX_Not(xs[0]);
-        free(xs);
+        _bx_items_free(xs, length);
         return y;
     }
 
     /* Equal(1, x) = x */
     if (argset->one && length == 1) {
         y = BX_IncRef(xs[0]);
-        free(xs);
+        _bx_items_free(xs, length);
         return y;
     }
 
@@ -326,8 +345,8 @@ BX_EqArgSet_Reduce(struct BX_EqArgSet *argset)
     if (argset->zero) {
         struct BoolExpr *temp = _bx_op_from(BX_OP_OR, length, xs);
         if (temp == NULL) {
-            free(xs);    // LCOV_EXCL_LINE
-            return NULL; // LCOV_EXCL_LINE
+            _bx_items_free(xs, length); // LCOV_EXCL_LINE
+            return NULL;                // LCOV_EXCL_LINE
         }
         y = BX_Not(temp);
         BX_DecRef(temp);
@@ -8,14 +8,16 @@
 #include <stdlib.h>
 
 #include "boolexpr.h"
+#include "share.h"
 
 
+/* NOTE: exprs must come from _bx_items_alloc, and the array owns it */
 struct BX_Array *
 _bx_array_from(size_t length, struct BoolExpr **exprs)
 {
     struct BX_Array *array;
 
-    array = malloc(sizeof(struct BX_Array));
+    array = _bx_array_alloc();
     if (array == NULL)
         return NULL; // LCOV_EXCL_LINE
 
@@ -33,15 +35,20 @@ struct BX_Array *
 BX_Array_New(size_t length, struct BoolExpr **exprs)
 {
     struct BoolExpr **exprs_copy;
+    struct BX_Array *array;
 
-    exprs_copy = malloc(length * sizeof(struct BoolExpr *));
+    exprs_copy = _bx_items_alloc(length);
     if (exprs_copy == NULL)
         return NULL; // LCOV_EXCL_LINE
 
     for (size_t i = 0; i < length; ++i)
         exprs_copy[i] = exprs[i];
 
-    return _bx_array_from(length, exprs_copy);
+    array = _bx_array_from(length, exprs_copy);
+    if (array == NULL)
+        _bx_items_free(exprs_copy, length); // LCOV_EXCL_LINE
+
+    return array;
 }
 
 
@@ -50,8 +57,8 @@ BX_Array_Del(struct BX_Array *array)
 {
     for (size_t i = 0; i < array->length; ++i)
         BX_DecRef(array->items[i]);
-    free(array->items);
-    free(array);
+    _bx_items_free(array->items, array->length);
+    _bx_array_free(array);
 }
 
 
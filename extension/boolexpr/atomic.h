@@ -0,0 +1,67 @@
+/*
+** Filename: atomic.h
+**
+** Atomic operations and spin locks
+**
+** Expressions are shared between threads,
+** so reference counts and flags are only updated atomically.
+** Global tables are guarded by spin locks,
+** which are only held for a few pointer moves.
+**
+** A reader that sees a stale flag merely repeats some work.
+*/
+
+
+#ifndef ATOMIC_H
+#define ATOMIC_H
+
+
+#if defined(_MSC_VER)
+
+#include <intrin.h>
+
+typedef volatile long _bx_lock_t;
+
+/* Aligned loads and stores are atomic on every MSVC target */
+#define _bx_atomic_load(p) (*(p))
+#define _bx_atomic_store(p, v) (*(p) = (v))
+#define _bx_atomic_cas(p, old, new) \
+    (_InterlockedCompareExchange((volatile long *) (p), (new), (old)) == (old))
+#define _bx_atomic_inc(p) _InterlockedIncrement((volatile long *) (p))
+#define _bx_atomic_dec(p) _InterlockedDecrement((volatile long *) (p))
+#define _bx_atomic_or(p, f) _InterlockedOr8((volatile char *) (p), (char) (f))
+#define _bx_atomic_and(p, f) _InterlockedAnd8((volatile char *) (p), (char) (f))
+
+#define _bx_lock_acquire(lock) \
+do { \
+    while (_InterlockedExchange((lock), 1)) \
+        ; \
+} while (0)
+
+#define _bx_lock_release(lock) _InterlockedExchange((lock), 0)
+
+#else
+
+typedef volatile char _bx_lock_t;
+
+#define _bx_atomic_load(p) __atomic_load_n((p), __ATOMIC_ACQUIRE)
+#define _bx_atomic_store(p, v) __atomic_store_n((p), (v), __ATOMIC_RELEASE)
+#define _bx_atomic_cas(p, old, new) \
+    __atomic_compare_exchange_n((p), &(old), (new), false, __ATOMIC_ACQ_REL, __ATOMIC_ACQUIRE)
+#define _bx_atomic_inc(p) __atomic_add_fetch((p), 1, __ATOMIC_RELAXED)
+#define _bx_atomic_dec(p) __atomic_sub_fetch((p), 1, __ATOMIC_ACQ_REL)
+#define _bx_atomic_or(p, f) __atomic_fetch_or((p), (f), __ATOMIC_RELAXED)
+#define _bx_atomic_and(p, f) __atomic_fetch_and((p), (f), __ATOMIC_RELAXED)
+
+#define _bx_lock_acquire(lock) \
+do { \
+    while (__atomic_test_and_set((lock), __ATOMIC_ACQUIRE)) \
+        ; \
+} while (0)
+
+#define _bx_lock_release(lock) __atomic_clear((lock), __ATOMIC_RELEASE)
+
+#endif
+
+
+#endif // ATOMIC_H
@@ -4,8 +4,12 @@
 ** NOTE: Many of these operations modify the inputs.
 **       For example, creating an operator will update the reference count
 **       of its children.
-**       If we ever decide to allow parallel operations,
-**       we will need a node mutex.
+**       Reference counts and flags are updated atomically,
+**       and the literal vector is guarded by a lock (see atomic.h),
+**       so several threads may transform expressions that share nodes.
+**
+**       Operators are created by _bx_op_from, which returns the existing
+**       node from the unique table if there is one (see unique.c).
 */
 
 
@@ -15,6 +19,7 @@
 #include <stddef.h>
 #include <stdlib.h>
 
+#include "atomic.h"
 #include "boolexpr.h"
 #include "memcheck.h"
 #include "share.h"
@@ -38,6 +43,83 @@ do { \
 } while (0)
 
 
+/* Guards every literal vector */
+static _bx_lock_t _lits_lock = 0;
+
+
+/* Push ex onto the iterator stack */
+static bool
+_iter_push(struct BX_Iter *it, struct BoolExpr *ex)
+{
+    if (it->_depth == it->_capacity) {
+        size_t capacity = 2 * it->_capacity;
+        struct BX_IterFrame *frames;
+
+        if (it->_frames == it->_local) {
+            frames = malloc(capacity * sizeof(struct BX_IterFrame));
+            if (frames == NULL)
+                return false; // LCOV_EXCL_LINE
+            for (size_t i = 0; i < it->_depth; ++i)
+                frames[i] = it->_local[i];
+        }
+        else {
+            frames = realloc(it->_frames, capacity * sizeof(struct BX_IterFrame));
+            if (frames == NULL)
+                return false; // LCOV_EXCL_LINE
+        }
+
+        it->_frames = frames;
+        it->_capacity = capacity;
+    }
+
+    it->_frames[it->_depth].ex = ex;
+    it->_frames[it->_depth].index = 0;
+    it->_depth += 1;
+
+    return true;
+}
+
+
+/* Descend to the first unvisited leaf below the top of the stack */
+static bool
+_iter_descend(struct BX_Iter *it)
+{
+    struct BX_IterFrame *top = &it->_frames[it->_depth-1];
+
+    while (!BX_IS_ATOM(top->ex) && top->index < top->ex->data.xs->length) {
+        if (!_iter_push(it, top->ex->data.xs->items[top->index++]))
+            return false; // LCOV_EXCL_LINE
+        top = &it->_frames[it->_depth-1];
+    }
+
+    it->item = top->ex;
+
+    return true;
+}
+
+
+bool
+BX_Iter_Init(struct BX_Iter *it, struct BoolExpr *ex)
+{
+    it->_depth = 0;
+    it->_capacity = BX_ITER_DEPTH;
+    it->_frames = it->_local;
+    it->done = false;
+
+    _iter_push(it, ex);
+
+    return _iter_descend(it);
+}
+
+
+void
+BX_Iter_Fini(struct BX_Iter *it)
+{
+    if (it->_frames != it->_local)
+        free(it->_frames);
+}
+
+
 struct BX_Iter *
 BX_Iter_New(struct BoolExpr *ex)
 {
@@ -47,22 +129,12 @@ BX_Iter_New(struct BoolExpr *ex)
     if (it == NULL)
         return NULL; // LCOV_EXCL_LINE
 
-    it->_ex = ex;
-    it->done = false;
-
-    if (BX_IS_ATOM(ex)) {
-        it->item = ex;
-        return it;
+    if (!BX_Iter_Init(it, ex)) {
+        BX_Iter_Fini(it); // LCOV_EXCL_LINE
+        free(it);         // LCOV_EXCL_LINE
+        return NULL;      // LCOV_EXCL_LINE
     }
 
-    it->_index = 0;
-    it->_it = BX_Iter_New(ex->data.xs->items[it->_index]);
-    if (it->_it == NULL) {
-        free(it);    // LCOV_EXCL_LINE
-        return NULL; // LCOV_EXCL_LINE
-    }
-    it->item = it->_it->item;
-
     return it;
 }
 
@@ -70,6 +142,7 @@ BX_Iter_New(struct BoolExpr *ex)
 void
 BX_Iter_Del(struct BX_Iter *it)
 {
+    BX_Iter_Fini(it);
     free(it);
 }
 
@@ -80,41 +153,16 @@ BX_Iter_Next(struct BX_Iter *it)
     if (it->done)
         return true;
 
-    if (BX_IS_ATOM(it->_ex)) {
-        it->done = true;
-        return true;
-    }
-
-    if (it->_it) {
-        if (!BX_Iter_Next(it->_it)) {
-            free(it->_it); // LCOV_EXCL_LINE
-            return false;  // LCOV_EXCL_LINE
-        }
-
-        if (!it->_it->done) {
-            it->item = it->_it->item;
-            return true;
-        }
-
-        free(it->_it);
-        it->_index += 1;
+    /* Pop the current item */
+    it->_depth -= 1;
 
-        if (it->_index < it->_ex->data.xs->length) {
-            it->_it = BX_Iter_New(it->_ex->data.xs->items[it->_index]);
-            if (it->_it == NULL)
-                return false; // LCOV_EXCL_LINE
-            it->item = it->_it->item;
-            return true;
-        }
-
-        it->_it = (struct BX_Iter *) NULL;
-        it->item = it->_ex;
+    if (it->_depth == 0) {
+        it->item = (struct BoolExpr *) NULL;
+        it->done = true;
         return true;
     }
 
-    it->item = (struct BoolExpr *) NULL;
-    it->done = true;
-    return true;
+    return _iter_descend(it);
 }
 
 
@@ -145,7 +193,7 @@ _lit_new(struct BX_Vector *lits, long uniqid)
 {
     struct BoolExpr *lit;
 
-    lit = malloc(sizeof(struct BoolExpr));
+    lit = _bx_node_alloc();
     if (lit == NULL)
         return NULL; // LCOV_EXCL_LINE
 
@@ -162,20 +210,16 @@ _lit_new(struct BX_Vector *lits, long uniqid)
 static void
 _lit_del(struct BoolExpr *lit)
 {
-    free(lit);
+    _bx_node_free(lit);
 }
 
 
-struct BoolExpr *
-_bx_op_from(BX_Kind kind, size_t n, struct BoolExpr **xs)
+static struct BoolExpr *
+_op_alloc(BX_Kind kind, size_t n, struct BoolExpr **xs)
 {
     struct BoolExpr *op;
 
-    /* Do not allow degenerate OR/AND/XOR/EQ operators */
-    assert(!(kind == BX_OP_OR || kind == BX_OP_AND ||
-             kind == BX_OP_XOR || kind == BX_OP_EQ) || n >= 2);
-
-    op = malloc(sizeof(struct BoolExpr));
+    op = _bx_node_alloc();
     if (op == NULL)
         return NULL; // LCOV_EXCL_LINE
 
@@ -184,9 +228,38 @@ _bx_op_from(BX_Kind kind, size_t n, struct BoolExpr **xs)
     op->flags = (BX_Flags) 0;
     op->data.xs = _bx_array_from(n, xs);
     if (op->data.xs == NULL) {
-        free(op);    // LCOV_EXCL_LINE
-        return NULL; // LCOV_EXCL_LINE
+        _bx_node_free(op); // LCOV_EXCL_LINE
+        return NULL;       // LCOV_EXCL_LINE
+    }
+
+    return op;
+}
+
+
+struct BoolExpr *
+_bx_op_from(BX_Kind kind, size_t n, struct BoolExpr **xs)
+{
+    struct BoolExpr *op;
+
+    /* Do not allow degenerate OR/AND/XOR/EQ operators */
+    assert(!(kind == BX_OP_OR || kind == BX_OP_AND ||
+             kind == BX_OP_XOR || kind == BX_OP_EQ) || n >= 2);
+
+    if (!BX_UniqueTable_Enabled())
+        return _op_alloc(kind, n, xs);
+
+    /* Share structurally identical operators */
+    _bx_unique_lock();
+    op = _bx_unique_search(kind, n, xs);
+    if (op != NULL) {
+        _bx_items_free(xs, n);
     }
+    else {
+        op = _op_alloc(kind, n, xs);
+        if (op != NULL)
+            _bx_unique_insert(op);
+    }
+    _bx_unique_unlock();
 
     return op;
 }
@@ -196,15 +269,20 @@ struct BoolExpr *
 _bx_op_new(BX_Kind kind, size_t n, struct BoolExpr **xs)
 {
     struct BoolExpr **xs_copy;
+    struct BoolExpr *op;
 
-    xs_copy = malloc(n * sizeof(struct BoolExpr *));
+    xs_copy = _bx_items_alloc(n);
     if (xs_copy == NULL)
         return NULL; // LCOV_EXCL_LINE
 
     for (size_t i = 0; i < n; ++i)
         xs_copy[i] = xs[i];
 
-    return _bx_op_from(kind, n, xs_copy);
+    op = _bx_op_from(kind, n, xs_copy);
+    if (op == NULL)
+        _bx_items_free(xs_copy, n); // LCOV_EXCL_LINE
+
+    return op;
 }
 
 
@@ -234,8 +312,10 @@ _eq_new(size_t n, struct BoolExpr **xs)
 static void
 _op_del(struct BoolExpr *op)
 {
+    if (BX_IS_UNIQUE(op))
+        _bx_unique_remove(op);
     BX_Array_Del(op->data.xs);
-    free(op);
+    _bx_node_free(op);
 }
 
 
@@ -259,14 +339,21 @@ BX_Literal(struct BX_Vector *lits, long uniqid)
     size_t index = _uniqid2index(uniqid);
     struct BoolExpr *lit;
 
+    _bx_lock_acquire(&_lits_lock);
+
     lit = (index >= lits->length) ? (struct BoolExpr *) NULL : lits->items[index];
     if (lit == (struct BoolExpr *) NULL) {
-        CHECK_NULL(lit, _lit_new(lits, uniqid));
-        BX_Vector_Insert(lits, index, lit);
-        return lit;
+        lit = _lit_new(lits, uniqid);
+        if (lit != NULL)
+            BX_Vector_Insert(lits, index, lit);
     }
+    else {
+        BX_IncRef(lit);
+    }
+
+    _bx_lock_release(&_lits_lock);
 
-    return BX_IncRef(lit);
+    return lit;
 }
 
 
@@ -520,9 +607,9 @@ BX_IncRef(struct BoolExpr *ex)
     assert(ex != NULL);
 
     /* Input must have at least one reference already */
-    assert(ex->refcount > 0);
+    assert(_bx_atomic_load(&ex->refcount) > 0);
 
-    ex->refcount += 1;
+    _bx_atomic_inc(&ex->refcount);
 
     return ex;
 }
@@ -556,11 +643,9 @@ BX_DecRef(struct BoolExpr * ex)
     assert(ex != NULL);
 
     /* Input must have at least one reference left */
-    assert(ex->refcount > 0);
+    assert(_bx_atomic_load(&ex->refcount) > 0);
 
-    ex->refcount -= 1;
-
-    if (ex->refcount == 0) {
+    if (_bx_atomic_dec(&ex->refcount) == 0) {
         /* Constant refcount must never reach zero */
         assert(!BX_IS_CONST(ex));
         _boolexpr_del[ex->kind](ex);
@@ -572,36 +657,36 @@ struct BX_Set *
 BX_Support(struct BoolExpr *ex)
 {
     struct BX_Set *s;
-    struct BX_Iter *it;
+    struct BX_Iter it;
 
     s = BX_Set_New();
     if (s == NULL)
         return NULL; // LCOV_EXCL_LINE
 
-    it = BX_Iter_New(ex);
-    if (it == NULL) {
-        BX_Set_Del(s); // LCOV_EXCL_LINE
-        return NULL;   // LCOV_EXCL_LINE
+    if (!BX_Iter_Init(&it, ex)) {
+        BX_Iter_Fini(&it); // LCOV_EXCL_LINE
+        BX_Set_Del(s);     // LCOV_EXCL_LINE
+        return NULL;       // LCOV_EXCL_LINE
     }
 
-    while (!it->done) {
+    while (!it.done) {
         bool status = true;
-        if (BX_IS_VAR(it->item)) {
-            status = BX_Set_Insert(s, it->item);
+        if (BX_IS_VAR(it.item)) {
+            status = BX_Set_Insert(s, it.item);
         }
-        else if (BX_IS_COMP(it->item)) {
-            struct BoolExpr *var = BX_Not(it->item);
+        else if (BX_IS_COMP(it.item)) {
+            struct BoolExpr *var = BX_Not(it.item);
             status = BX_Set_Insert(s, var);
             BX_DecRef(var);
         }
-        if (!status || !BX_Iter_Next(it)) {
-            BX_Set_Del(s);   // LCOV_EXCL_LINE
-            BX_Iter_Del(it); // LCOV_EXCL_LINE
-            return NULL;     // LCOV_EXCL_LINE
+        if (!status || !BX_Iter_Next(&it)) {
+            BX_Set_Del(s);     // LCOV_EXCL_LINE
+            BX_Iter_Fini(&it); // LCOV_EXCL_LINE
+            return NULL;       // LCOV_EXCL_LINE
         }
     }
 
-    BX_Iter_Del(it);
+    BX_Iter_Fini(&it);
 
     return s;
 }
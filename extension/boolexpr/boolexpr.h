@@ -41,11 +41,13 @@ extern "C" {
 /* Flag definitions */
 #define BX_SIMPLE 0x01
 #define BX_NNF    0x02
+#define BX_UNIQUE 0x04
 
 
 /* Flag checks */
 #define BX_IS_SIMPLE(ex) (((ex)->flags) & BX_SIMPLE)
 #define BX_IS_NNF(ex)    (((ex)->flags) & BX_NNF)
+#define BX_IS_UNIQUE(ex) (((ex)->flags) & BX_UNIQUE)
 
 
 /* Expression types */
@@ -96,10 +98,20 @@ struct BoolExpr {
 };
 
 
+/* Number of frames an iterator holds without allocation */
+#define BX_ITER_DEPTH 32
+
+struct BX_IterFrame {
+    struct BoolExpr *ex;
+    size_t index;
+};
+
+
 struct BX_Iter {
-    struct BoolExpr *_ex;
-    size_t _index;
-    struct BX_Iter *_it;
+    size_t _depth;
+    size_t _capacity;
+    struct BX_IterFrame *_frames;
+    struct BX_IterFrame _local[BX_ITER_DEPTH];
 
     struct BoolExpr *item;
     bool done;
@@ -166,6 +178,24 @@ struct BX_SetIter {
 };
 
 
+/* Clauses in DIMACS integer form */
+struct BX_CNF {
+    /* Number of variables, inputs first */
+    int nvars;
+
+    /* Input variables: DIMACS variable i is inputs[i-1] */
+    size_t ninputs;
+    struct BoolExpr **inputs;
+
+    /* Literals of all clauses, each clause terminated by zero */
+    size_t nclauses;
+    size_t length;
+    int *lits;
+
+    size_t _capacity;
+};
+
+
 struct BX_OrAndArgSet {
     BX_Kind kind;
     bool min;
@@ -358,12 +388,62 @@ struct BoolExpr * BX_Compose(struct BoolExpr *, struct BX_Dict *var2ex);
 struct BoolExpr * BX_Restrict(struct BoolExpr *, struct BX_Dict *var2const);
 
 
+/*
+** Return the Tseitin encoding of an expression.
+**
+** The clauses are satisfiable by exactly the input points that satisfy
+** the expression, extended with the values of auxiliary variables.
+**
+** Without polarity, each of those points has exactly one extension.
+** With polarity (Plaisted-Greenbaum), operators only get the clauses for
+** the directions in which they appear, so there are fewer clauses,
+** but a point may have several extensions.
+*/
+struct BX_CNF * BX_Tseitin(struct BoolExpr *, bool polarity);
+
+/* Delete a CNF encoding. */
+void BX_CNF_Del(struct BX_CNF *);
+
+
+/*
+** Enable the unique table of operator nodes.
+**
+** While the table is enabled,
+** structurally identical operators share one node.
+** Return false if the table cannot be allocated.
+*/
+bool BX_UniqueTable_Enable(void);
+
+/*
+** Disable the unique table of operator nodes.
+**
+** Existing operators remain valid, but they are no longer shared.
+*/
+void BX_UniqueTable_Disable(void);
+
+/* Return true if the unique table is enabled. */
+bool BX_UniqueTable_Enabled(void);
+
+/* Return the number of operators in the unique table. */
+size_t BX_UniqueTable_Length(void);
+
+
 /* Return a new Boolean expression iterator. */
 struct BX_Iter * BX_Iter_New(struct BoolExpr *ex);
 
 /* Delete a Boolean expression iterator. */
 void BX_Iter_Del(struct BX_Iter *);
 
+/*
+** Initialize a Boolean expression iterator in place.
+**
+** The iterator must not be copied, and it must be finalized.
+*/
+bool BX_Iter_Init(struct BX_Iter *, struct BoolExpr *ex);
+
+/* Release the frames of an iterator initialized in place. */
+void BX_Iter_Fini(struct BX_Iter *);
+
 /* Return the next Boolean expression in an iteration. */
 bool BX_Iter_Next(struct BX_Iter *);
 
@@ -2,6 +2,10 @@
 ** Filename: bubble.c
 **
 ** Bubbling the NOT operator
+**
+** Two memo tables make sure every shared sub-expression is pushed down
+** once for each polarity:
+** memo maps x => PushDownNot(x), and nmemo maps x => PushDownNot(~x).
 */
 
 
@@ -15,30 +19,28 @@
 #include "util.h"
 
 
+/* bubble.c */
+static struct BoolExpr * _push_down_not(struct BoolExpr *ex, struct BX_Dict *memo, struct BX_Dict *nmemo);
+static struct BoolExpr * _push_down_inv(struct BoolExpr *x, struct BX_Dict *memo, struct BX_Dict *nmemo);
+
+
 /* ~(a | b | ...) = ~a & ~b & ... */
+/* ~(a & b & ...) = ~a | ~b | ... */
 static struct BoolExpr *
-_inv_or(struct BoolExpr *op)
+_inv_orand(struct BoolExpr *op, struct BX_Dict *memo, struct BX_Dict *nmemo)
 {
     size_t length = op->data.xs->length;
     struct BoolExpr **xs;
-    struct BoolExpr *temp;
     struct BoolExpr *y;
 
     xs = malloc(length * sizeof(struct BoolExpr *));
     if (xs == NULL)
         return NULL; // LCOV_EXCL_LINE
 
-    for (size_t i = 0; i < length; ++i) {
-        temp = BX_Not(op->data.xs->items[i]);
-        if (temp == NULL) {
-            free(xs);    // LCOV_EXCL_LINE
-            return NULL; // LCOV_EXCL_LINE
-        }
-        CHECK_NULL_N(xs[i], BX_PushDownNot(temp), i, xs);
-        BX_DecRef(temp);
-    }
+    for (size_t i = 0; i < length; ++i)
+        CHECK_NULL_N(xs[i], _push_down_inv(op->data.xs->items[i], memo, nmemo), i, xs);
 
-    y = BX_And(length, xs);
+    y = BX_IS_OR(op) ? BX_And(length, xs) : BX_Or(length, xs);
 
     _bx_free_exprs(length, xs);
 
@@ -46,54 +48,103 @@ _inv_or(struct BoolExpr *op)
 }
 
 
+/* ~(s ? d1 : d0) = s ? ~d1 : ~d0 */
 static struct BoolExpr *
-_inv_and(struct BoolExpr *op)
+_inv_ite(struct BoolExpr *op, struct BX_Dict *memo, struct BX_Dict *nmemo)
 {
-    size_t length = op->data.xs->length;
-    struct BoolExpr **xs;
-    struct BoolExpr *temp;
+    struct BoolExpr *d1, *d0;
     struct BoolExpr *y;
 
-    xs = malloc(length * sizeof(struct BoolExpr *));
-    if (xs == NULL)
-        return NULL; // LCOV_EXCL_LINE
+    CHECK_NULL(d1, _push_down_inv(op->data.xs->items[1], memo, nmemo));
+    CHECK_NULL_1(d0, _push_down_inv(op->data.xs->items[2], memo, nmemo), d1);
 
-    for (size_t i = 0; i < length; ++i) {
-        temp = BX_Not(op->data.xs->items[i]);
-        if (temp == NULL) {
-            free(xs);    // LCOV_EXCL_LINE
-            return NULL; // LCOV_EXCL_LINE
-        }
-        CHECK_NULL_N(xs[i], BX_PushDownNot(temp), i, xs);
+    CHECK_NULL_2(y, BX_ITE(op->data.xs->items[0], d1, d0), d1, d0);
+    BX_DecRef(d1);
+    BX_DecRef(d0);
+
+    return y;
+}
+
+
+/* Return PushDownNot(~x) */
+static struct BoolExpr *
+_push_down_inv(struct BoolExpr *x, struct BX_Dict *memo, struct BX_Dict *nmemo)
+{
+    struct BoolExpr *temp;
+    struct BoolExpr *y;
+
+    /* ~~x = x, and ~x is an atom */
+    if (BX_IS_ATOM(x) || BX_IS_NOT(x)) {
+        CHECK_NULL(temp, BX_Not(x));
+        CHECK_NULL_1(y, _push_down_not(temp, memo, nmemo), temp);
         BX_DecRef(temp);
+        return y;
     }
 
-    y = BX_Or(length, xs);
+    y = _bx_memo_search(nmemo, x);
+    if (y != NULL)
+        return BX_IncRef(y);
 
-    _bx_free_exprs(length, xs);
+    if (BX_IS_OR(x) || BX_IS_AND(x)) {
+        CHECK_NULL(y, _inv_orand(x, memo, nmemo));
+    }
+    else if (BX_IS_ITE(x)) {
+        CHECK_NULL(y, _inv_ite(x, memo, nmemo));
+    }
+    else {
+        CHECK_NULL(temp, _push_down_not(x, memo, nmemo));
+        CHECK_NULL_1(y, BX_Not(temp), temp);
+        BX_DecRef(temp);
+    }
+
+    if (!_bx_memo_insert(nmemo, x, y)) {
+        BX_DecRef(y); // LCOV_EXCL_LINE
+        return NULL;  // LCOV_EXCL_LINE
+    }
 
     return y;
 }
 
 
 static struct BoolExpr *
-_inv_ite(struct BoolExpr *op)
+_push_down_not(struct BoolExpr *ex, struct BX_Dict *memo, struct BX_Dict *nmemo)
 {
-    struct BoolExpr *d1, *d0;
-    struct BoolExpr *temp;
+    size_t length;
+    struct BoolExpr **xs;
+    unsigned int mod_count = 0;
     struct BoolExpr *y;
 
-    CHECK_NULL(temp, BX_Not(op->data.xs->items[1]));
-    CHECK_NULL_1(d1, BX_PushDownNot(temp), temp);
-    BX_DecRef(temp);
+    if (BX_IS_ATOM(ex))
+        return BX_IncRef(ex);
+
+    if (BX_IS_NOT(ex))
+        return _push_down_inv(ex->data.xs->items[0], memo, nmemo);
 
-    CHECK_NULL_1(temp, BX_Not(op->data.xs->items[2]), d1);
-    CHECK_NULL_2(d0, BX_PushDownNot(temp), d1, temp);
-    BX_DecRef(temp);
+    y = _bx_memo_search(memo, ex);
+    if (y != NULL)
+        return BX_IncRef(y);
 
-    CHECK_NULL_2(y, BX_ITE(op->data.xs->items[0], d1, d0), d1, d0);
-    BX_DecRef(d1);
-    BX_DecRef(d0);
+    length = ex->data.xs->length;
+    xs = malloc(length * sizeof(struct BoolExpr *));
+    if (xs == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    for (size_t i = 0; i < length; ++i) {
+        CHECK_NULL_N(xs[i], _push_down_not(ex->data.xs->items[i], memo, nmemo), i, xs);
+        mod_count += (xs[i] != ex->data.xs->items[i]);
+    }
+
+    if (mod_count)
+        y = _bx_op_new(ex->kind, length, xs);
+    else
+        y = BX_IncRef(ex);
+
+    _bx_free_exprs(length, xs);
+
+    if (y != NULL && !_bx_memo_insert(memo, ex, y)) {
+        BX_DecRef(y); // LCOV_EXCL_LINE
+        return NULL;  // LCOV_EXCL_LINE
+    }
 
     return y;
 }
@@ -102,18 +153,21 @@ _inv_ite(struct BoolExpr *op)
 struct BoolExpr *
 BX_PushDownNot(struct BoolExpr *ex)
 {
+    struct BX_Dict *memo, *nmemo;
+    struct BoolExpr *y;
+
     if (BX_IS_ATOM(ex))
         return BX_IncRef(ex);
 
-    if (BX_IS_NOR(ex))
-        return _inv_or(ex->data.xs->items[0]);
-
-    if (BX_IS_NAND(ex))
-        return _inv_and(ex->data.xs->items[0]);
-
-    if (BX_IS_NOT(ex) && BX_IS_ITE(ex->data.xs->items[0]))
-        return _inv_ite(ex->data.xs->items[0]);
+    CHECK_NULL(memo, BX_Dict_New());
+    nmemo = BX_Dict_New();
+    if (nmemo == NULL) {
+        BX_Dict_Del(memo); // LCOV_EXCL_LINE
+        return NULL;       // LCOV_EXCL_LINE
+    }
+    y = _push_down_not(ex, memo, nmemo);
+    BX_Dict_Del(memo);
+    BX_Dict_Del(nmemo);
 
-    return _bx_op_transform(ex, BX_PushDownNot);
+    return y;
 }
-
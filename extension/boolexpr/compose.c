@@ -2,6 +2,8 @@
 ** Filename: compose.c
 **
 ** Function Composition
+**
+** A memo table makes sure every shared sub-expression is composed once.
 */
 
 
@@ -15,15 +17,19 @@
 #include "util.h"
 
 
+/* compose.c */
+static struct BoolExpr * (*_compose[16])(struct BoolExpr *ex, struct BX_Dict *var2ex, struct BX_Dict *memo);
+
+
 static struct BoolExpr *
-_const_compose(struct BoolExpr *c, struct BX_Dict *var2ex)
+_const_compose(struct BoolExpr *c, struct BX_Dict *var2ex, struct BX_Dict *memo)
 {
     return BX_IncRef(c);
 }
 
 
 static struct BoolExpr *
-_var_compose(struct BoolExpr *var, struct BX_Dict *var2ex)
+_var_compose(struct BoolExpr *var, struct BX_Dict *var2ex, struct BX_Dict *memo)
 {
     struct BoolExpr *ex;
 
@@ -37,7 +43,7 @@ _var_compose(struct BoolExpr *var, struct BX_Dict *var2ex)
 
 
 static struct BoolExpr *
-_comp_compose(struct BoolExpr *comp, struct BX_Dict *var2ex)
+_comp_compose(struct BoolExpr *comp, struct BX_Dict *var2ex, struct BX_Dict *memo)
 {
     struct BoolExpr *var;
     struct BoolExpr *temp;
@@ -45,7 +51,7 @@ _comp_compose(struct BoolExpr *comp, struct BX_Dict *var2ex)
 
     CHECK_NULL(var, BX_Not(comp));
 
-    CHECK_NULL_1(temp, _var_compose(var, var2ex), var);
+    CHECK_NULL_1(temp, _var_compose(var, var2ex, memo), var);
     BX_DecRef(var);
 
     CHECK_NULL_1(y, BX_Not(temp), temp);
@@ -56,19 +62,24 @@ _comp_compose(struct BoolExpr *comp, struct BX_Dict *var2ex)
 
 
 static struct BoolExpr *
-_op_compose(struct BoolExpr *op, struct BX_Dict *var2ex)
+_op_compose(struct BoolExpr *op, struct BX_Dict *var2ex, struct BX_Dict *memo)
 {
     size_t n = op->data.xs->length;
     struct BoolExpr **xs;
     unsigned int mod_count = 0;
     struct BoolExpr *y;
 
+    y = _bx_memo_search(memo, op);
+    if (y != NULL)
+        return BX_IncRef(y);
+
     xs = malloc(n * sizeof(struct BoolExpr *));
     if (xs == NULL)
         return NULL; // LCOV_EXCL_LINE
 
     for (size_t i = 0; i < n; ++i) {
-        CHECK_NULL_N(xs[i], BX_Compose(op->data.xs->items[i], var2ex), i, xs);
+        struct BoolExpr *xi = op->data.xs->items[i];
+        CHECK_NULL_N(xs[i], _compose[xi->kind](xi, var2ex, memo), i, xs);
         mod_count += (xs[i] != op->data.xs->items[i]);
     }
 
@@ -79,12 +90,17 @@ _op_compose(struct BoolExpr *op, struct BX_Dict *var2ex)
 
     _bx_free_exprs(n, xs);
 
+    if (y != NULL && !_bx_memo_insert(memo, op, y)) {
+        BX_DecRef(y); // LCOV_EXCL_LINE
+        return NULL;  // LCOV_EXCL_LINE
+    }
+
     return y;
 }
 
 
 static struct BoolExpr *
-(*_compose[16])(struct BoolExpr *ex, struct BX_Dict *var2ex) = {
+(*_compose[16])(struct BoolExpr *ex, struct BX_Dict *var2ex, struct BX_Dict *memo) = {
     _const_compose,
     _const_compose,
     _const_compose,
@@ -110,7 +126,17 @@ static struct BoolExpr *
 struct BoolExpr *
 BX_Compose(struct BoolExpr *ex, struct BX_Dict *var2ex)
 {
-    return _compose[ex->kind](ex, var2ex);
+    struct BX_Dict *memo;
+    struct BoolExpr *y;
+
+    if (BX_IS_ATOM(ex))
+        return _compose[ex->kind](ex, var2ex, (struct BX_Dict *) NULL);
+
+    CHECK_NULL(memo, BX_Dict_New());
+    y = _op_compose(ex, var2ex, memo);
+    BX_Dict_Del(memo);
+
+    return y;
 }
 
 
@@ -2,6 +2,8 @@
 ** Filename: nnf.c
 **
 ** Negation Normal Form
+**
+** A memo table makes sure every shared sub-expression is converted once.
 */
 
 
@@ -298,8 +300,8 @@ static struct BoolExpr *
 };
 
 
-struct BoolExpr *
-_nnfify(struct BoolExpr *ex)
+static struct BoolExpr *
+_nnfify(struct BoolExpr *ex, struct BX_Dict *memo)
 {
     if (BX_IS_NNF(ex))
         return BX_IncRef(ex);
@@ -307,10 +309,19 @@ _nnfify(struct BoolExpr *ex)
     struct BoolExpr *temp;
     struct BoolExpr *y;
 
-    CHECK_NULL(temp, _bx_op_transform(ex, _nnfify));
-    y = _op_nnfify[temp->kind](temp);
+    y = _bx_memo_search(memo, ex);
+    if (y != NULL)
+        return BX_IncRef(y);
+
+    CHECK_NULL(temp, _bx_op_transform_memo(ex, _nnfify, memo));
+    CHECK_NULL_1(y, _op_nnfify[temp->kind](temp), temp);
     BX_DecRef(temp);
 
+    if (!_bx_memo_insert(memo, ex, y)) {
+        BX_DecRef(y); // LCOV_EXCL_LINE
+        return NULL;  // LCOV_EXCL_LINE
+    }
+
     return y;
 }
 
@@ -318,10 +329,15 @@ _nnfify(struct BoolExpr *ex)
 struct BoolExpr *
 _bx_to_nnf(struct BoolExpr *ex)
 {
+    struct BX_Dict *memo;
     struct BoolExpr *t0, *t1;
     struct BoolExpr *nnf;
 
-    CHECK_NULL(t0, _nnfify(ex));
+    CHECK_NULL(memo, BX_Dict_New());
+    t0 = _nnfify(ex, memo);
+    BX_Dict_Del(memo);
+    if (t0 == NULL)
+        return NULL; // LCOV_EXCL_LINE
 
     CHECK_NULL_1(t1, BX_PushDownNot(t0), t0);
     BX_DecRef(t0);
@@ -19,14 +19,22 @@ _multiply(BX_Kind kind, struct BX_Array *a, struct BX_Array *b)
     struct BoolExpr **exprs;
     struct BX_Array *prod;
 
-    exprs = malloc(length * sizeof(struct BoolExpr *));
+    exprs = _bx_items_alloc(length);
     if (exprs == NULL)
         return NULL; // LCOV_EXCL_LINE
 
     for (size_t i = 0, index = 0; i < a->length; ++i) {
         for (size_t j = 0; j < b->length; ++j, ++index) {
             struct BoolExpr *xs[2] = {a->items[i], b->items[j]};
-            CHECK_NULL_N(exprs[index], _bx_op_new(kind, 2, xs), index, exprs);
+            exprs[index] = _bx_op_new(kind, 2, xs);
+            if (exprs[index] == NULL) {
+                /* LCOV_EXCL_START */
+                for (size_t k = 0; k < index; ++k)
+                    BX_DecRef(exprs[k]);
+                _bx_items_free(exprs, length);
+                return NULL;
+                /* LCOV_EXCL_STOP */
+            }
         }
     }
 
@@ -5,6 +5,14 @@
 */
 
 
+/* alloc.c */
+struct BoolExpr * _bx_node_alloc(void);
+void _bx_node_free(struct BoolExpr *ex);
+struct BX_Array * _bx_array_alloc(void);
+void _bx_array_free(struct BX_Array *array);
+struct BoolExpr ** _bx_items_alloc(size_t n);
+void _bx_items_free(struct BoolExpr **items, size_t n);
+
 /* array.c */
 struct BX_Array * _bx_array_from(size_t length, struct BoolExpr **exprs);
 
@@ -19,6 +27,13 @@ struct BoolExpr * _bx_orandxor_new(BX_Kind kind, size_t n, struct BoolExpr **xs)
 /* nnf.c */
 struct BoolExpr * _bx_to_nnf(struct BoolExpr *ex);
 
+/* unique.c */
+void _bx_unique_lock(void);
+void _bx_unique_unlock(void);
+struct BoolExpr * _bx_unique_search(BX_Kind kind, size_t n, struct BoolExpr **xs);
+void _bx_unique_insert(struct BoolExpr *op);
+void _bx_unique_remove(struct BoolExpr *op);
+
 /* simple.c */
 struct BoolExpr * _bx_simplify(struct BoolExpr *ex);
 
@@ -12,6 +12,8 @@
 ** 1. Simplify all operator arguments
 ** 2. Eliminate constants, and all sub-expressions that can be easily
 **    converted to constants.
+**
+** A memo table makes sure every shared sub-expression is simplified once.
 */
 
 
@@ -556,8 +558,8 @@ _simple_nop(BX_Kind kind, size_t n, struct BoolExpr **xs)
 }
 
 
-struct BoolExpr *
-_bx_simplify(struct BoolExpr *ex)
+static struct BoolExpr *
+_simplify(struct BoolExpr *ex, struct BX_Dict *memo)
 {
     if (BX_IS_SIMPLE(ex))
         return BX_IncRef(ex);
@@ -565,10 +567,36 @@ _bx_simplify(struct BoolExpr *ex)
     struct BoolExpr *temp;
     struct BoolExpr *y;
 
-    CHECK_NULL(temp, _bx_op_transform(ex, _bx_simplify));
-    y = _op_simplify[temp->kind](temp);
+    y = _bx_memo_search(memo, ex);
+    if (y != NULL)
+        return BX_IncRef(y);
+
+    CHECK_NULL(temp, _bx_op_transform_memo(ex, _simplify, memo));
+    CHECK_NULL_1(y, _op_simplify[temp->kind](temp), temp);
     BX_DecRef(temp);
 
+    if (!_bx_memo_insert(memo, ex, y)) {
+        BX_DecRef(y); // LCOV_EXCL_LINE
+        return NULL;  // LCOV_EXCL_LINE
+    }
+
+    return y;
+}
+
+
+struct BoolExpr *
+_bx_simplify(struct BoolExpr *ex)
+{
+    if (BX_IS_SIMPLE(ex))
+        return BX_IncRef(ex);
+
+    struct BX_Dict *memo;
+    struct BoolExpr *y;
+
+    CHECK_NULL(memo, BX_Dict_New());
+    y = _simplify(ex, memo);
+    BX_Dict_Del(memo);
+
     return y;
 }
 
@@ -0,0 +1,94 @@
+/*
+** Filename: test_alloc.cpp
+**
+** Test slab allocation, and iteration over deep expressions.
+*/
+
+
+#include "boolexprtest.hpp"
+
+
+class BX_Alloc_Test: public BoolExpr_Test {
+
+protected:
+
+    static const int M = 100;
+
+    // f[i+1] = f[i] & x[i+1]
+    void MakeChain()
+    {
+        ops[0] = BX_IncRef(xs[0]);
+        for (int i = 0; i < M; ++i)
+            ops[i+1] = BX_AndN(2, ops[i], xs[i+1]);
+    }
+};
+
+
+TEST_F(BX_Alloc_Test, Reuse)
+{
+    ops[0] = BX_OrN(2, xs[0], xs[1]);
+    BoolExpr *node = ops[0];
+    BX_Array *array = ops[0]->data.xs;
+    BX_DecRef(ops[0]); ops[0] = (BoolExpr *) NULL;
+
+    // Freed blocks are reused first
+    ops[1] = BX_AndN(2, xs[2], xs[3]);
+    EXPECT_EQ(ops[1], node);
+    EXPECT_EQ(ops[1]->data.xs, array);
+    EXPECT_EQ(ops[1]->data.xs->items[0], xs[2]);
+    EXPECT_EQ(ops[1]->data.xs->items[1], xs[3]);
+
+    // Long item arrays
+    exps[0] = BX_Or(N, xs);
+    EXPECT_EQ(exps[0]->data.xs->length, (size_t) N);
+    for (int i = 0; i < N; ++i)
+        EXPECT_EQ(exps[0]->data.xs->items[i], xs[i]);
+}
+
+
+TEST_F(BX_Alloc_Test, DeepIterate)
+{
+    MakeChain();
+
+    struct BX_Iter *it = BX_Iter_New(ops[M]);
+
+    // x0, x1, f1, x2, f2, ...
+    EXPECT_EQ(it->item, xs[0]);
+    EXPECT_TRUE(BX_Iter_Next(it));
+    for (int i = 1; i <= M; ++i) {
+        EXPECT_EQ(it->item, xs[i]);
+        EXPECT_TRUE(BX_Iter_Next(it));
+        EXPECT_EQ(it->item, ops[i]);
+        EXPECT_TRUE(BX_Iter_Next(it));
+    }
+    EXPECT_TRUE(it->done);
+    EXPECT_EQ(it->item, (struct BoolExpr *) NULL);
+
+    BX_Iter_Del(it);
+}
+
+
+TEST_F(BX_Alloc_Test, IterInit)
+{
+    MakeChain();
+
+    struct BX_Iter it;
+    size_t count;
+
+    // Shallow expressions use the local frames
+    EXPECT_TRUE(BX_Iter_Init(&it, ops[1]));
+    for (count = 0; !it.done; ++count)
+        BX_Iter_Next(&it);
+    BX_Iter_Fini(&it);
+    EXPECT_EQ(count, 3);
+
+    EXPECT_TRUE(BX_Iter_Init(&it, ops[M]));
+    for (count = 0; !it.done; ++count)
+        BX_Iter_Next(&it);
+    BX_Iter_Fini(&it);
+    EXPECT_EQ(count, 2*M + 1);
+
+    struct BX_Set *s = BX_Support(ops[M]);
+    EXPECT_EQ(s->length, M+1);
+    BX_Set_Del(s);
+}
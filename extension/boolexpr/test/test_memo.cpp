@@ -0,0 +1,100 @@
+/*
+** Filename: test_memo.cpp
+**
+** Test transformations on expressions with shared sub-expressions.
+**
+** Every expression below is a DAG whose tree size is exponential,
+** so these tests only finish if each shared node is transformed once.
+*/
+
+
+#include "boolexprtest.hpp"
+
+
+class BX_Memo_Test: public BoolExpr_Test {
+
+protected:
+
+    static const int M = 60;
+
+    // f[i+1] = (f[i] | x[i+1]) & (f[i] | ~x[i+1])
+    void MakeChain()
+    {
+        ops[0] = BX_IncRef(xs[0]);
+        for (int i = 0; i < M; ++i) {
+            BoolExpr *or0 = BX_OrN(2, ops[i], xs[i+1]);
+            BoolExpr *or1 = BX_OrN(2, ops[i], xns[i+1]);
+            ops[i+1] = BX_AndN(2, or0, or1);
+            BX_DecRef(or0);
+            BX_DecRef(or1);
+        }
+    }
+
+    // g[i+1] = g[i] ^ x[i+1]
+    void MakeXorChain()
+    {
+        ops[0] = BX_IncRef(xs[0]);
+        for (int i = 0; i < M; ++i)
+            ops[i+1] = BX_XorN(2, ops[i], xs[i+1]);
+    }
+};
+
+
+TEST_F(BX_Memo_Test, Simplify)
+{
+    MakeChain();
+
+    exps[0] = BX_Simplify(ops[M]);
+    EXPECT_TRUE(BX_IS_AND(exps[0]));
+    EXPECT_TRUE(BX_IS_SIMPLE(exps[0]));
+}
+
+
+TEST_F(BX_Memo_Test, Restrict)
+{
+    MakeChain();
+
+    struct BX_Dict *var2const = BX_Dict_New();
+
+    // (f | 1) & (f | 0) <=> f
+    for (int i = 1; i <= M; ++i)
+        BX_Dict_Insert(var2const, xs[i], &BX_One);
+    exps[0] = BX_Restrict(ops[M], var2const);
+    EXPECT_EQ(exps[0], xs[0]);
+
+    BX_Dict_Clear(var2const);
+    BX_Dict_Insert(var2const, xs[0], &BX_One);
+    exps[1] = BX_Restrict(ops[M], var2const);
+    EXPECT_EQ(exps[1], &BX_One);
+
+    BX_Dict_Clear(var2const);
+    BX_Dict_Insert(var2const, xs[0], xns[M+1]);
+    exps[2] = BX_Compose(ops[M], var2const);
+    EXPECT_TRUE(BX_IS_AND(exps[2]));
+
+    BX_Dict_Del(var2const);
+}
+
+
+TEST_F(BX_Memo_Test, PushDownNot)
+{
+    MakeChain();
+
+    // ~f <=> (~f' & ~x) | (~f' & x)
+    exps[0] = BX_Not(ops[M]);
+    exps[1] = BX_PushDownNot(exps[0]);
+    EXPECT_TRUE(BX_IS_OR(exps[1]));
+    EXPECT_TRUE(BX_IS_AND(exps[1]->data.xs->items[0]));
+    EXPECT_EQ(exps[1]->data.xs->items[0]->data.xs->items[0],
+              exps[1]->data.xs->items[1]->data.xs->items[0]);
+}
+
+
+TEST_F(BX_Memo_Test, ToNNF)
+{
+    MakeXorChain();
+
+    exps[0] = BX_ToNNF(ops[M]);
+    EXPECT_TRUE(BX_IS_NNF(exps[0]));
+    EXPECT_TRUE(BX_IS_OR(exps[0]) || BX_IS_AND(exps[0]));
+}
@@ -0,0 +1,106 @@
+/*
+** Filename: test_thread.cpp
+**
+** Test transformations running in several threads at once.
+*/
+
+
+#include <thread>
+#include <vector>
+
+#include "boolexprtest.hpp"
+
+
+class BX_Thread_Test: public BoolExpr_Test {
+
+protected:
+
+    static const int T = 8;
+    static const int M = 16;
+
+    // Every thread converts ops[0..M-1], which share all their literals
+    void MakeOps()
+    {
+        for (int i = 0; i < M; ++i) {
+            BoolExpr *xor0 = BX_XorN(2, xs[i], xs[i+1]);
+            BoolExpr *xor1 = BX_XorN(2, xs[i+2], xns[i+3]);
+            ops[i] = BX_OrN(3, xor0, xor1, xns[i+4]);
+            BX_DecRef(xor0);
+            BX_DecRef(xor1);
+            exps[i] = BX_ToCNF(ops[i]);
+        }
+    }
+
+    // Convert every op, and check the results against the serial ones
+    void Run()
+    {
+        std::vector<std::thread> threads;
+        int mismatches[T] = {0};
+
+        for (int t = 0; t < T; ++t) {
+            threads.push_back(std::thread([this, t, &mismatches]() {
+                for (int k = 0; k < 50; ++k) {
+                    for (int i = 0; i < M; ++i) {
+                        BoolExpr *cnf = BX_ToCNF(ops[i]);
+                        BoolExpr *nnf = BX_ToNNF(ops[i]);
+                        // New literals grow the shared vector
+                        BoolExpr *lit = BX_Literal(lits, N + 1 + (k * T + t) * M + i);
+                        mismatches[t] += !Similar(cnf, exps[i]);
+                        BX_DecRef(cnf);
+                        BX_DecRef(nnf);
+                        BX_DecRef(lit);
+                    }
+                }
+            }));
+        }
+        for (auto &thread : threads)
+            thread.join();
+
+        for (int t = 0; t < T; ++t)
+            EXPECT_EQ(mismatches[t], 0);
+
+        // Only the references held by the fixture remain
+        for (int i = 0; i < M; ++i)
+            EXPECT_EQ(ops[i]->refcount, 1);
+    }
+};
+
+
+TEST_F(BX_Thread_Test, Transform)
+{
+    MakeOps();
+    Run();
+}
+
+
+TEST_F(BX_Thread_Test, Unique)
+{
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+
+    MakeOps();
+    size_t length = BX_UniqueTable_Length();
+    Run();
+
+    // Temporary operators have left the table
+    EXPECT_EQ(BX_UniqueTable_Length(), length);
+
+    BX_UniqueTable_Disable();
+}
+
+
+TEST_F(BX_Thread_Test, SharedSlabs)
+{
+    BoolExpr *node = (BoolExpr *) NULL;
+
+    // A node freed by a thread that has exited
+    std::thread thread([this, &node]() {
+        BoolExpr *op = BX_OrN(2, xs[0], xs[1]);
+        node = op;
+        BX_DecRef(op);
+    });
+    thread.join();
+
+    // Is reused by this one
+    ops[0] = BX_AndN(2, xs[2], xs[3]);
+    EXPECT_EQ(ops[0], node);
+}
@@ -0,0 +1,217 @@
+/*
+** Filename: test_tseitin.cpp
+**
+** Test the Tseitin encoding.
+*/
+
+
+#include "boolexprtest.hpp"
+
+
+class BX_Tseitin_Test: public BoolExpr_Test {
+
+protected:
+
+    // Return true if the clauses are satisfied by assignment bits
+    bool Eval(struct BX_CNF *cnf, unsigned long bits)
+    {
+        bool clause = false;
+
+        for (size_t i = 0; i < cnf->length; ++i) {
+            int lit = cnf->lits[i];
+            if (lit == 0) {
+                if (!clause)
+                    return false;
+                clause = false;
+            }
+            else {
+                bool val = (bits >> (abs(lit) - 1)) & 1;
+                clause = clause || (lit > 0 ? val : !val);
+            }
+        }
+
+        return true;
+    }
+
+    // Check that the encoding has a model for exactly the true points of ex.
+    // Without polarity, every true point has exactly one model.
+    void Check(BoolExpr *ex, bool polarity=false)
+    {
+        struct BX_CNF *cnf = BX_Tseitin(ex, polarity);
+        int ninputs = (int) cnf->ninputs;
+
+        ASSERT_LE(cnf->nvars, 20);
+
+        for (unsigned long point = 0; point < (1ul << ninputs); ++point) {
+            struct BX_Dict *var2const = BX_Dict_New();
+            for (int i = 0; i < ninputs; ++i)
+                BX_Dict_Insert(var2const, cnf->inputs[i],
+                               (point >> i) & 1 ? &BX_One : &BX_Zero);
+            BoolExpr *y = BX_Restrict(ex, var2const);
+            BX_Dict_Del(var2const);
+
+            // Count the extensions of point that satisfy the clauses
+            int models = 0;
+            unsigned long naux = 1ul << (cnf->nvars - ninputs);
+            for (unsigned long aux = 0; aux < naux; ++aux)
+                models += Eval(cnf, point | (aux << ninputs));
+
+            if (polarity)
+                EXPECT_EQ(models > 0, BX_IS_ONE(y));
+            else
+                EXPECT_EQ(models, BX_IS_ONE(y) ? 1 : 0);
+            BX_DecRef(y);
+        }
+
+        BX_CNF_Del(cnf);
+    }
+};
+
+
+TEST_F(BX_Tseitin_Test, Atoms)
+{
+    struct BX_CNF *cnf;
+
+    cnf = BX_Tseitin(&BX_Zero, false);
+    EXPECT_EQ(cnf->nclauses, 1);
+    EXPECT_EQ(cnf->length, 1);
+    EXPECT_EQ(cnf->nvars, 0);
+    BX_CNF_Del(cnf);
+
+    cnf = BX_Tseitin(&BX_One, false);
+    EXPECT_EQ(cnf->nclauses, 0);
+    EXPECT_EQ(cnf->length, 0);
+    BX_CNF_Del(cnf);
+
+    cnf = BX_Tseitin(xns[3], false);
+    EXPECT_EQ(cnf->nvars, 1);
+    EXPECT_EQ(cnf->ninputs, 1);
+    EXPECT_EQ(cnf->inputs[0], xs[3]);
+    EXPECT_EQ(cnf->length, 2);
+    EXPECT_EQ(cnf->lits[0], -1);
+    EXPECT_EQ(cnf->lits[1], 0);
+    BX_CNF_Del(cnf);
+
+    // a | ~a <=> 1
+    ops[0] = BX_OrN(2, xs[0], xns[0]);
+    cnf = BX_Tseitin(ops[0], false);
+    EXPECT_EQ(cnf->nclauses, 0);
+    BX_CNF_Del(cnf);
+}
+
+
+TEST_F(BX_Tseitin_Test, Numbering)
+{
+    // Inputs are numbered in uniqid order, whatever their polarity
+    ops[0] = BX_OrN(3, xs[2], xns[5], xns[9]);
+    struct BX_CNF *cnf = BX_Tseitin(ops[0], false);
+    EXPECT_EQ(cnf->ninputs, 3);
+    EXPECT_EQ(cnf->inputs[0], xs[2]);
+    EXPECT_EQ(cnf->inputs[1], xs[5]);
+    EXPECT_EQ(cnf->inputs[2], xs[9]);
+    EXPECT_EQ(cnf->nvars, 4);
+
+    // Arguments are sorted: -4 | -3 | -2 | 1, ~-3 | 4, ~-2 | 4, ~1 | 4, and 4
+    int exp[] = {-4, -3, -2, 1, 0, 4, 3, 0, 4, 2, 0, 4, -1, 0, 4, 0};
+    ASSERT_EQ(cnf->length, sizeof(exp) / sizeof(int));
+    for (size_t i = 0; i < cnf->length; ++i)
+        EXPECT_EQ(cnf->lits[i], exp[i]);
+    EXPECT_EQ(cnf->nclauses, 5);
+    BX_CNF_Del(cnf);
+}
+
+
+TEST_F(BX_Tseitin_Test, Operators)
+{
+    ops[0] = BX_OrN(3, xs[0], xns[1], xs[2]);
+    ops[1] = BX_AndN(3, xns[0], xs[1], xs[3]);
+    ops[2] = BX_XorN(3, xs[0], xs[1], xns[2]);
+    ops[3] = BX_EqualN(3, xs[1], xns[2], xs[3]);
+    ops[4] = BX_Implies(xs[0], xns[3]);
+    ops[5] = BX_ITE(xs[0], xs[1], xns[2]);
+
+    for (int i = 0; i < 6; ++i) {
+        Check(ops[i]);
+        exps[i] = BX_Not(ops[i]);
+        Check(exps[i]);
+    }
+
+    // Operators over operators, which share arguments
+    ops[6] = BX_ITE(ops[2], exps[0], ops[3]);
+    ops[7] = BX_XorN(2, ops[6], exps[2]);
+    ops[8] = BX_EqualN(3, ops[7], ops[4], exps[5]);
+    Check(ops[6]);
+    Check(ops[7]);
+    Check(ops[8]);
+}
+
+
+TEST_F(BX_Tseitin_Test, Polarity)
+{
+    ops[0] = BX_OrN(3, xs[0], xns[1], xs[2]);
+    ops[1] = BX_AndN(3, xns[0], xs[1], xs[3]);
+    ops[2] = BX_XorN(3, xs[0], xs[1], xns[2]);
+    ops[3] = BX_EqualN(3, xs[1], xns[2], xs[3]);
+    ops[4] = BX_Implies(ops[0], ops[1]);
+    ops[5] = BX_ITE(ops[2], ops[4], ops[3]);
+    ops[6] = BX_AndN(2, ops[5], ops[0]);
+
+    for (int i = 0; i < 7; ++i) {
+        Check(ops[i], true);
+        exps[i] = BX_Not(ops[i]);
+        Check(exps[i], true);
+    }
+
+    // y => (a | b) & (c | d) needs no clauses for the other direction
+    ops[7] = BX_OrN(2, xs[0], xs[1]);
+    ops[8] = BX_OrN(2, xs[2], xs[3]);
+    ops[9] = BX_AndN(2, ops[7], ops[8]);
+
+    struct BX_CNF *full = BX_Tseitin(ops[9], false);
+    struct BX_CNF *half = BX_Tseitin(ops[9], true);
+    EXPECT_EQ(full->nvars, half->nvars);
+    EXPECT_EQ(full->nclauses, 3 + 3 + 3 + 1);
+    EXPECT_EQ(half->nclauses, 1 + 1 + 2 + 1);
+    BX_CNF_Del(full);
+    BX_CNF_Del(half);
+}
+
+
+TEST_F(BX_Tseitin_Test, Structural)
+{
+    // Two distinct nodes for a | b, in different argument orders
+    ops[0] = BX_OrN(2, xs[0], xs[1]);
+    ops[1] = BX_OrN(2, xs[1], xs[0]);
+    ops[2] = BX_XorN(3, ops[0], ops[1], xs[2]);
+
+    struct BX_CNF *cnf = BX_Tseitin(ops[2], false);
+    EXPECT_EQ(cnf->ninputs, 3);
+    // One variable for a | b, and two for the XOR chain
+    EXPECT_EQ(cnf->nvars, 3 + 1 + 2);
+    BX_CNF_Del(cnf);
+
+    Check(ops[2]);
+}
+
+
+TEST_F(BX_Tseitin_Test, Shared)
+{
+    static const int M = 500;
+
+    // f[i+1] = (f[i] | x[i+1]) & (f[i] | ~x[i+1])
+    ops[0] = BX_IncRef(xs[0]);
+    for (int i = 0; i < M; ++i) {
+        BoolExpr *or0 = BX_OrN(2, ops[i], xs[i+1]);
+        BoolExpr *or1 = BX_OrN(2, ops[i], xns[i+1]);
+        ops[i+1] = BX_AndN(2, or0, or1);
+        BX_DecRef(or0);
+        BX_DecRef(or1);
+    }
+
+    // Each shared operator is encoded once
+    struct BX_CNF *cnf = BX_Tseitin(ops[M], false);
+    EXPECT_EQ(cnf->ninputs, M+1);
+    EXPECT_EQ(cnf->nvars, (M+1) + 3*M);
+    EXPECT_EQ(cnf->nclauses, 3*M*3 + 1);
+    BX_CNF_Del(cnf);
+}
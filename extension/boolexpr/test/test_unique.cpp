@@ -0,0 +1,125 @@
+/*
+** Filename: test_unique.cpp
+**
+** Test the unique table of operator nodes.
+*/
+
+
+#include "boolexprtest.hpp"
+
+
+class BX_Unique_Test: public BoolExpr_Test {};
+
+
+TEST_F(BX_Unique_Test, Disabled)
+{
+    EXPECT_FALSE(BX_UniqueTable_Enabled());
+
+    ops[0] = BX_OrN(2, xs[0], xs[1]);
+    ops[1] = BX_OrN(2, xs[0], xs[1]);
+    EXPECT_NE(ops[0], ops[1]);
+    EXPECT_FALSE(BX_IS_UNIQUE(ops[0]));
+    EXPECT_EQ(BX_UniqueTable_Length(), 0);
+}
+
+
+TEST_F(BX_Unique_Test, Sharing)
+{
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+    EXPECT_TRUE(BX_UniqueTable_Enabled());
+
+    // a | b
+    ops[0] = BX_OrN(2, xs[0], xs[1]);
+    ops[1] = BX_OrN(2, xs[0], xs[1]);
+    EXPECT_EQ(ops[0], ops[1]);
+    EXPECT_EQ(ops[0]->refcount, 2);
+    EXPECT_TRUE(BX_IS_UNIQUE(ops[0]));
+
+    // Kind and argument order are part of the key
+    ops[2] = BX_AndN(2, xs[0], xs[1]);
+    ops[3] = BX_OrN(2, xs[1], xs[0]);
+    EXPECT_NE(ops[2], ops[0]);
+    EXPECT_NE(ops[3], ops[0]);
+
+    // ~(a | b) & (a | b)
+    ops[4] = BX_Not(ops[0]);
+    ops[5] = BX_Not(ops[1]);
+    EXPECT_EQ(ops[4], ops[5]);
+    ops[6] = BX_AndN(2, ops[4], ops[0]);
+    ops[7] = BX_AndN(2, ops[5], ops[1]);
+    EXPECT_EQ(ops[6], ops[7]);
+    EXPECT_EQ(BX_UniqueTable_Length(), 5);
+
+    // Deleted operators leave the table
+    BX_DecRef(ops[7]); ops[7] = (BoolExpr *) NULL;
+    EXPECT_EQ(BX_UniqueTable_Length(), 5);
+    BX_DecRef(ops[6]); ops[6] = (BoolExpr *) NULL;
+    EXPECT_EQ(BX_UniqueTable_Length(), 4);
+
+    BX_UniqueTable_Disable();
+    EXPECT_FALSE(BX_UniqueTable_Enabled());
+    EXPECT_EQ(BX_UniqueTable_Length(), 0);
+    EXPECT_FALSE(BX_IS_UNIQUE(ops[0]));
+}
+
+
+TEST_F(BX_Unique_Test, NotCanonical)
+{
+    // An operator created while the table is disabled is not unique
+    ops[0] = BX_OrN(2, xs[0], xs[1]);
+
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+
+    ops[1] = BX_OrN(2, xs[0], xs[1]);
+    EXPECT_NE(ops[0], ops[1]);
+
+    // Neither are its parents
+    ops[2] = BX_AndN(2, ops[0], xs[2]);
+    ops[3] = BX_AndN(2, ops[0], xs[2]);
+    EXPECT_NE(ops[2], ops[3]);
+    EXPECT_FALSE(BX_IS_UNIQUE(ops[2]));
+
+    ops[4] = BX_AndN(2, ops[1], xs[2]);
+    ops[5] = BX_AndN(2, ops[1], xs[2]);
+    EXPECT_EQ(ops[4], ops[5]);
+
+    BX_UniqueTable_Disable();
+}
+
+
+TEST_F(BX_Unique_Test, Transformations)
+{
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+
+    // (a ^ b) | (b ^ c) | (c ^ d) | (d ^ e)
+    for (int i = 0; i < 4; ++i) {
+        ops[2*i] = BX_XorN(2, xs[i], xs[i+1]);
+        ops[2*i+1] = BX_XorN(2, xs[i], xs[i+1]);
+        EXPECT_EQ(ops[2*i], ops[2*i+1]);
+    }
+    exps[0] = BX_OrN(4, ops[0], ops[2], ops[4], ops[6]);
+    exps[1] = BX_ToCNF(exps[0]);
+    exps[2] = BX_ToCNF(exps[0]);
+    EXPECT_EQ(exps[1], exps[2]);
+
+    BX_UniqueTable_Disable();
+}
+
+
+TEST_F(BX_Unique_Test, Enlarge)
+{
+    EXPECT_TRUE(BX_UniqueTable_Enable());
+
+    // The table grows past its initial width
+    for (int i = 0; i < N-1; ++i)
+        ops[i] = BX_AndN(2, xs[i], xs[i+1]);
+    EXPECT_EQ(BX_UniqueTable_Length(), N-1);
+
+    for (int i = 0; i < N-1; ++i) {
+        exps[i] = BX_AndN(2, xs[i], xs[i+1]);
+        EXPECT_EQ(exps[i], ops[i]);
+    }
+
+    BX_UniqueTable_Disable();
+}
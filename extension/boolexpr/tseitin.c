@@ -0,0 +1,948 @@
+/*
+** Filename: tseitin.c
+**
+** Tseitin encoding into DIMACS integer clauses
+**
+** Every operator node of the (simplified) expression DAG gets one
+** auxiliary variable, and clauses that make it equal to its operator.
+** NOT nodes never need a variable; they just negate their argument.
+**
+** Input variables are numbered 1..n in ascending uniqid order,
+** and auxiliary variables are numbered n+1.. in postorder.
+**
+** Operators with the same kind and argument literals share one variable,
+** even if they are distinct nodes.
+**
+** With polarity on (Plaisted-Greenbaum), an operator that only appears
+** positively gets the clauses for y => f, one that only appears
+** negatively gets the clauses for f => y, and one that appears both ways
+** gets them all. The result is equisatisfiable, but no longer has exactly
+** one model for every model of the expression.
+*/
+
+
+#include <assert.h>
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <stdlib.h>
+
+#include "boolexpr.h"
+
+
+/* Initial number of ints in the clause buffer */
+#define MIN_LITS 64
+
+/* Initial capacity of a map */
+#define MIN_MAP 64
+
+/* Initial number of frames in the traversal stack */
+#define MIN_FRAMES 32
+
+/* Initial capacity of the inputs array */
+#define MIN_INPUTS 16
+
+
+/* Open addressing hash map from keys to variable numbers */
+struct _Map {
+    size_t capacity;
+    size_t length;
+    uintptr_t *keys;
+    int *vals;
+};
+
+
+struct _Frame {
+    struct BoolExpr *op;
+    size_t index;
+};
+
+
+static size_t
+_map_index(struct _Map *map, uintptr_t key)
+{
+    size_t mask = map->capacity - 1;
+    size_t index = ((size_t) (key >> 3) * 2654435761u) & mask;
+
+    while (map->keys[index] != 0 && map->keys[index] != key)
+        index = (index + 1) & mask;
+
+    return index;
+}
+
+
+static bool
+_map_init(struct _Map *map)
+{
+    map->capacity = MIN_MAP;
+    map->length = 0;
+    map->keys = calloc(map->capacity, sizeof(uintptr_t));
+    map->vals = malloc(map->capacity * sizeof(int));
+
+    return map->keys != NULL && map->vals != NULL;
+}
+
+
+static void
+_map_fini(struct _Map *map)
+{
+    free(map->keys);
+    free(map->vals);
+}
+
+
+/* Return a pointer to the value of key, or NULL */
+static int *
+_map_search(struct _Map *map, uintptr_t key)
+{
+    size_t index = _map_index(map, key);
+
+    return map->keys[index] ? &map->vals[index] : (int *) NULL;
+}
+
+
+static bool
+_map_insert(struct _Map *map, uintptr_t key, int val)
+{
+    size_t index;
+
+    /* Keep the load at most 1/2 */
+    if (2 * (map->length + 1) > map->capacity) {
+        struct _Map old = *map;
+
+        map->capacity *= 2;
+        map->length = 0;
+        map->keys = calloc(map->capacity, sizeof(uintptr_t));
+        map->vals = malloc(map->capacity * sizeof(int));
+        if (map->keys == NULL || map->vals == NULL) {
+            _map_fini(map); // LCOV_EXCL_LINE
+            *map = old;     // LCOV_EXCL_LINE
+            return false;   // LCOV_EXCL_LINE
+        }
+
+        for (size_t i = 0; i < old.capacity; ++i) {
+            if (old.keys[i]) {
+                index = _map_index(map, old.keys[i]);
+                map->keys[index] = old.keys[i];
+                map->vals[index] = old.vals[i];
+                map->length += 1;
+            }
+        }
+
+        _map_fini(&old);
+    }
+
+    index = _map_index(map, key);
+    if (map->keys[index] == 0)
+        map->length += 1;
+    map->keys[index] = key;
+    map->vals[index] = val;
+
+    return true;
+}
+
+
+#define VAR_KEY(ex) ((uintptr_t) labs((ex)->data.lit.uniqid))
+#define OP_KEY(op) ((uintptr_t) (op))
+
+
+/* Skip NOT nodes, which have no variable of their own */
+static struct BoolExpr *
+_strip(struct BoolExpr *ex)
+{
+    while (BX_IS_NOT(ex))
+        ex = ex->data.xs->items[0];
+
+    return ex;
+}
+
+
+/*
+** Visit every distinct operator below ex in postorder,
+** and every occurrence of an atom.
+**
+** The ops map records visited operators, each with value zero.
+*/
+static bool
+_walk(struct BoolExpr *ex, struct _Map *ops,
+      bool (*visit)(struct BoolExpr *op, void *data), void *data)
+{
+    size_t depth = 0;
+    size_t capacity = MIN_FRAMES;
+    struct _Frame *frames;
+    bool ok = true;
+
+    ex = _strip(ex);
+    if (BX_IS_ATOM(ex))
+        return visit(ex, data);
+
+    frames = malloc(capacity * sizeof(struct _Frame));
+    if (frames == NULL)
+        return false; // LCOV_EXCL_LINE
+
+    frames[depth].op = ex;
+    frames[depth].index = 0;
+    depth += 1;
+
+    while (ok && depth > 0) {
+        struct _Frame *top = &frames[depth-1];
+
+        if (top->index < top->op->data.xs->length) {
+            struct BoolExpr *x = _strip(top->op->data.xs->items[top->index++]);
+
+            if (BX_IS_ATOM(x)) {
+                ok = visit(x, data);
+            }
+            else if (_map_search(ops, OP_KEY(x)) == NULL) {
+                if (depth == capacity) {
+                    struct _Frame *temp;
+                    capacity *= 2;
+                    temp = realloc(frames, capacity * sizeof(struct _Frame));
+                    if (temp == NULL) {
+                        ok = false; // LCOV_EXCL_LINE
+                        break;      // LCOV_EXCL_LINE
+                    }
+                    frames = temp;
+                }
+                frames[depth].op = x;
+                frames[depth].index = 0;
+                depth += 1;
+            }
+        }
+        else {
+            ok = _map_insert(ops, OP_KEY(top->op), 0) && visit(top->op, data);
+            depth -= 1;
+        }
+    }
+
+    free(frames);
+
+    return ok;
+}
+
+
+/* Directions of a definition y <=> f */
+#define POS  0x1 /* y => f */
+#define NEG  0x2 /* f => y */
+#define BOTH (POS | NEG)
+
+#define FLIP(p) ((((p) & POS) << 1) | (((p) & NEG) >> 1))
+
+
+/* One definition: var <=> kind(xs), or the directions given so far */
+struct _Def {
+    size_t hash;
+    BX_Kind kind;
+    size_t n;
+    size_t offset;
+    int var;
+    unsigned char dirs;
+};
+
+
+/*
+** Table of definitions by structure.
+**
+** Argument lists live in one pool, and slots hold index+1 of a definition.
+*/
+struct _Defs {
+    size_t capacity;
+    size_t *slots;
+
+    size_t length;
+    size_t _dcap;
+    struct _Def *defs;
+
+    size_t npool;
+    size_t _pcap;
+    int *pool;
+};
+
+
+struct _Encoder {
+    struct BX_CNF *cnf;
+
+    /* abs(uniqid) => DIMACS variable */
+    struct _Map vars;
+
+    /* operator => postorder index */
+    struct _Map ops;
+
+    /* Capacity of the inputs array */
+    size_t ninputs;
+
+    /* Operators in postorder, with their polarities and literals */
+    size_t nops;
+    size_t _opcap;
+    struct BoolExpr **opv;
+    unsigned char *polar;
+    int *lits;
+
+    struct _Defs defs;
+
+    /* Scratch space for the literals of one operator */
+    size_t nargs;
+    int *args;
+};
+
+
+static bool
+_defs_init(struct _Defs *defs)
+{
+    defs->capacity = MIN_MAP;
+    defs->slots = calloc(defs->capacity, sizeof(size_t));
+    defs->length = 0;
+    defs->_dcap = MIN_MAP;
+    defs->defs = malloc(defs->_dcap * sizeof(struct _Def));
+    defs->npool = 0;
+    defs->_pcap = MIN_LITS;
+    defs->pool = malloc(defs->_pcap * sizeof(int));
+
+    return defs->slots != NULL && defs->defs != NULL && defs->pool != NULL;
+}
+
+
+static void
+_defs_fini(struct _Defs *defs)
+{
+    free(defs->slots);
+    free(defs->defs);
+    free(defs->pool);
+}
+
+
+static size_t
+_defs_hash(BX_Kind kind, size_t n, int *xs)
+{
+    size_t hash = (size_t) kind;
+
+    for (size_t i = 0; i < n; ++i)
+        hash = hash * 1000003 ^ (size_t) (unsigned int) xs[i];
+
+    return hash;
+}
+
+
+/* Return the slot of a definition, or the empty slot where it belongs */
+static size_t
+_defs_slot(struct _Defs *defs, size_t hash, BX_Kind kind, size_t n, int *xs)
+{
+    size_t mask = defs->capacity - 1;
+    size_t index = hash & mask;
+
+    for (; defs->slots[index]; index = (index + 1) & mask) {
+        struct _Def *def = &defs->defs[defs->slots[index] - 1];
+        if (def->hash == hash && def->kind == kind && def->n == n) {
+            size_t i;
+            for (i = 0; i < n && defs->pool[def->offset + i] == xs[i]; ++i)
+                ;
+            if (i == n)
+                break;
+        }
+    }
+
+    return index;
+}
+
+
+static bool
+_defs_enlarge(struct _Defs *defs)
+{
+    size_t capacity = 2 * defs->capacity;
+    size_t *slots;
+
+    slots = calloc(capacity, sizeof(size_t));
+    if (slots == NULL)
+        return false; // LCOV_EXCL_LINE
+
+    for (size_t i = 0; i < defs->length; ++i) {
+        size_t index = defs->defs[i].hash & (capacity - 1);
+        while (slots[index])
+            index = (index + 1) & (capacity - 1);
+        slots[index] = i + 1;
+    }
+
+    free(defs->slots);
+    defs->slots = slots;
+    defs->capacity = capacity;
+
+    return true;
+}
+
+
+/*
+** Return the definition of kind(xs), adding it with var zero if it is new.
+**
+** Return NULL if memory runs out.
+*/
+static struct _Def *
+_defs_get(struct _Defs *defs, BX_Kind kind, size_t n, int *xs)
+{
+    size_t hash = _defs_hash(kind, n, xs);
+    size_t index = _defs_slot(defs, hash, kind, n, xs);
+    struct _Def *def;
+
+    if (defs->slots[index])
+        return &defs->defs[defs->slots[index] - 1];
+
+    if (defs->length == defs->_dcap) {
+        def = realloc(defs->defs, 2 * defs->_dcap * sizeof(struct _Def));
+        if (def == NULL)
+            return NULL; // LCOV_EXCL_LINE
+        defs->defs = def;
+        defs->_dcap *= 2;
+    }
+
+    while (defs->npool + n > defs->_pcap) {
+        int *pool = realloc(defs->pool, 2 * defs->_pcap * sizeof(int));
+        if (pool == NULL)
+            return NULL; // LCOV_EXCL_LINE
+        defs->pool = pool;
+        defs->_pcap *= 2;
+    }
+
+    def = &defs->defs[defs->length];
+    def->hash = hash;
+    def->kind = kind;
+    def->n = n;
+    def->offset = defs->npool;
+    def->var = 0;
+    def->dirs = 0;
+
+    for (size_t i = 0; i < n; ++i)
+        defs->pool[defs->npool++] = xs[i];
+
+    defs->slots[index] = ++defs->length;
+
+    /* Keep the load at most 1/2 */
+    if (2 * defs->length > defs->capacity && !_defs_enlarge(defs))
+        return NULL; // LCOV_EXCL_LINE
+
+    return def;
+}
+
+
+/* First pass: collect input variables, and operators in postorder */
+static bool
+_collect(struct BoolExpr *ex, void *data)
+{
+    struct _Encoder *enc = data;
+    struct BX_CNF *cnf = enc->cnf;
+
+    if (BX_IS_OP(ex)) {
+        if (enc->nops == enc->_opcap) {
+            struct BoolExpr **opv;
+            enc->_opcap = enc->_opcap ? 2 * enc->_opcap : MIN_MAP;
+            opv = realloc(enc->opv, enc->_opcap * sizeof(struct BoolExpr *));
+            if (opv == NULL)
+                return false; // LCOV_EXCL_LINE
+            enc->opv = opv;
+        }
+        *_map_search(&enc->ops, OP_KEY(ex)) = (int) enc->nops;
+        enc->opv[enc->nops++] = ex;
+        return true;
+    }
+
+    if (!BX_IS_LIT(ex) || _map_search(&enc->vars, VAR_KEY(ex)) != NULL)
+        return true;
+
+    if (!_map_insert(&enc->vars, VAR_KEY(ex), 0))
+        return false; // LCOV_EXCL_LINE
+
+    if (cnf->ninputs == enc->ninputs) {
+        struct BoolExpr **inputs;
+        enc->ninputs = enc->ninputs ? 2 * enc->ninputs : MIN_INPUTS;
+        inputs = realloc(cnf->inputs, enc->ninputs * sizeof(struct BoolExpr *));
+        if (inputs == NULL)
+            return false; // LCOV_EXCL_LINE
+        cnf->inputs = inputs;
+    }
+
+    /* Keep the variable, even if ex is its complement */
+    cnf->inputs[cnf->ninputs++] = BX_IS_VAR(ex) ? BX_IncRef(ex) : BX_Not(ex);
+
+    return cnf->inputs[cnf->ninputs-1] != NULL;
+}
+
+
+static int
+_cmp_uniqid(const void *p1, const void *p2)
+{
+    long a = (*(struct BoolExpr * const *) p1)->data.lit.uniqid;
+    long b = (*(struct BoolExpr * const *) p2)->data.lit.uniqid;
+
+    return (a > b) - (a < b);
+}
+
+
+static int
+_cmp_int(const void *p1, const void *p2)
+{
+    int a = *(const int *) p1;
+    int b = *(const int *) p2;
+
+    return (a > b) - (a < b);
+}
+
+
+/* Skip NOT nodes, and set sign to -1 if there is an odd number of them */
+static struct BoolExpr *
+_strip_sign(struct BoolExpr *ex, int *sign)
+{
+    *sign = 1;
+    while (BX_IS_NOT(ex)) {
+        *sign = -*sign;
+        ex = ex->data.xs->items[0];
+    }
+
+    return ex;
+}
+
+
+/* Return the DIMACS literal of an argument */
+static int
+_lit(struct _Encoder *enc, struct BoolExpr *ex)
+{
+    int sign;
+
+    ex = _strip_sign(ex, &sign);
+
+    if (BX_IS_LIT(ex)) {
+        int var = *_map_search(&enc->vars, VAR_KEY(ex));
+        return BX_IS_COMP(ex) ? -sign * var : sign * var;
+    }
+
+    return sign * enc->lits[*_map_search(&enc->ops, OP_KEY(ex))];
+}
+
+
+/*
+** Second pass: find the polarity of every operator.
+**
+** Reverse postorder visits every parent before its children.
+*/
+static void
+_polarize(struct _Encoder *enc, struct BoolExpr *root)
+{
+    int sign;
+
+    root = _strip_sign(root, &sign);
+    if (BX_IS_OP(root))
+        enc->polar[*_map_search(&enc->ops, OP_KEY(root))] = sign > 0 ? POS : NEG;
+
+    for (size_t i = enc->nops; i-- > 0; ) {
+        struct BoolExpr *op = enc->opv[i];
+        unsigned char p = enc->polar[i];
+
+        for (size_t j = 0; j < op->data.xs->length; ++j) {
+            struct BoolExpr *x = _strip_sign(op->data.xs->items[j], &sign);
+            unsigned char q;
+
+            if (!BX_IS_OP(x))
+                continue;
+
+            switch (op->kind) {
+                case BX_OP_OR:
+                case BX_OP_AND:
+                    q = p;
+                    break;
+                case BX_OP_IMPL:
+                    q = j == 0 ? FLIP(p) : p;
+                    break;
+                case BX_OP_ITE:
+                    q = j == 0 ? BOTH : p;
+                    break;
+                default:
+                    q = BOTH;
+                    break;
+            }
+
+            enc->polar[*_map_search(&enc->ops, OP_KEY(x))] |= sign > 0 ? q : FLIP(q);
+        }
+    }
+}
+
+
+static bool
+_push(struct BX_CNF *cnf, int lit)
+{
+    if (cnf->length == cnf->_capacity) {
+        size_t capacity = 2 * cnf->_capacity;
+        int *lits = realloc(cnf->lits, capacity * sizeof(int));
+        if (lits == NULL)
+            return false; // LCOV_EXCL_LINE
+        cnf->lits = lits;
+        cnf->_capacity = capacity;
+    }
+
+    cnf->lits[cnf->length++] = lit;
+    if (lit == 0)
+        cnf->nclauses += 1;
+
+    return true;
+}
+
+
+#define PUSH(lit) \
+do { \
+    if (!_push(cnf, (lit))) \
+        return false; \
+} while (0)
+
+
+/* y = x0 | x1 | ... */
+static bool
+_encode_or(struct BX_CNF *cnf, int y, size_t n, int *xs, int dirs)
+{
+    if (dirs & POS) {
+        PUSH(-y);
+        for (size_t i = 0; i < n; ++i)
+            PUSH(xs[i]);
+        PUSH(0);
+    }
+
+    if (dirs & NEG) {
+        for (size_t i = 0; i < n; ++i) {
+            PUSH(y); PUSH(-xs[i]); PUSH(0);
+        }
+    }
+
+    return true;
+}
+
+
+/* y = x0 & x1 & ... */
+static bool
+_encode_and(struct BX_CNF *cnf, int y, size_t n, int *xs, int dirs)
+{
+    if (dirs & POS) {
+        for (size_t i = 0; i < n; ++i) {
+            PUSH(-y); PUSH(xs[i]); PUSH(0);
+        }
+    }
+
+    if (dirs & NEG) {
+        PUSH(y);
+        for (size_t i = 0; i < n; ++i)
+            PUSH(-xs[i]);
+        PUSH(0);
+    }
+
+    return true;
+}
+
+
+/* y = a ^ b */
+static bool
+_encode_xor(struct BX_CNF *cnf, int y, int *xs, int dirs)
+{
+    int a = xs[0], b = xs[1];
+
+    if (dirs & POS) {
+        PUSH(-y); PUSH( a); PUSH( b); PUSH(0);
+        PUSH(-y); PUSH(-a); PUSH(-b); PUSH(0);
+    }
+
+    if (dirs & NEG) {
+        PUSH( y); PUSH(-a); PUSH( b); PUSH(0);
+        PUSH( y); PUSH( a); PUSH(-b); PUSH(0);
+    }
+
+    return true;
+}
+
+
+/* y = (x0 = x1 = ...) */
+static bool
+_encode_eq(struct BX_CNF *cnf, int y, size_t n, int *xs, int dirs)
+{
+    /* y => xi = xi+1 */
+    if (dirs & POS) {
+        for (size_t i = 0; i + 1 < n; ++i) {
+            PUSH(-y); PUSH(-xs[i]); PUSH( xs[i+1]); PUSH(0);
+            PUSH(-y); PUSH( xs[i]); PUSH(-xs[i+1]); PUSH(0);
+        }
+    }
+
+    /* all ones => y, and all zeros => y */
+    if (dirs & NEG) {
+        PUSH(y);
+        for (size_t i = 0; i < n; ++i)
+            PUSH(-xs[i]);
+        PUSH(0);
+        PUSH(y);
+        for (size_t i = 0; i < n; ++i)
+            PUSH(xs[i]);
+        PUSH(0);
+    }
+
+    return true;
+}
+
+
+/* y = p => q */
+static bool
+_encode_impl(struct BX_CNF *cnf, int y, int *xs, int dirs)
+{
+    int p = xs[0], q = xs[1];
+
+    if (dirs & POS) {
+        PUSH(-y); PUSH(-p); PUSH(q); PUSH(0);
+    }
+
+    if (dirs & NEG) {
+        PUSH( y); PUSH( p); PUSH(0);
+        PUSH( y); PUSH(-q); PUSH(0);
+    }
+
+    return true;
+}
+
+
+/* y = s ? d1 : d0 */
+static bool
+_encode_ite(struct BX_CNF *cnf, int y, int *xs, int dirs)
+{
+    int s = xs[0], d1 = xs[1], d0 = xs[2];
+
+    if (dirs & POS) {
+        PUSH(-y); PUSH(-s); PUSH( d1); PUSH(0);
+        PUSH(-y); PUSH( s); PUSH( d0); PUSH(0);
+    }
+
+    if (dirs & NEG) {
+        PUSH( y); PUSH(-s); PUSH(-d1); PUSH(0);
+        PUSH( y); PUSH( s); PUSH(-d0); PUSH(0);
+    }
+
+    return true;
+}
+
+
+/*
+** Return the variable defined as kind(xs) in directions dirs.
+**
+** Structurally identical definitions share one variable,
+** and only the directions it does not have yet add clauses.
+** Return zero if memory runs out.
+*/
+static int
+_define(struct _Encoder *enc, BX_Kind kind, size_t n, int *xs, int dirs)
+{
+    struct BX_CNF *cnf = enc->cnf;
+    struct _Def *def;
+    int todo;
+    bool ok = true;
+
+    def = _defs_get(&enc->defs, kind, n, xs);
+    if (def == NULL)
+        return 0; // LCOV_EXCL_LINE
+
+    if (def->var == 0)
+        def->var = ++cnf->nvars;
+
+    todo = dirs & ~def->dirs;
+    def->dirs |= todo;
+
+    if (todo) {
+        switch (kind) {
+            case BX_OP_OR:
+                ok = _encode_or(cnf, def->var, n, xs, todo);
+                break;
+            case BX_OP_AND:
+                ok = _encode_and(cnf, def->var, n, xs, todo);
+                break;
+            case BX_OP_XOR:
+                ok = _encode_xor(cnf, def->var, xs, todo);
+                break;
+            case BX_OP_EQ:
+                ok = _encode_eq(cnf, def->var, n, xs, todo);
+                break;
+            case BX_OP_IMPL:
+                ok = _encode_impl(cnf, def->var, xs, todo);
+                break;
+            case BX_OP_ITE:
+                ok = _encode_ite(cnf, def->var, xs, todo);
+                break;
+            default:
+                assert(0); // LCOV_EXCL_LINE
+        }
+    }
+
+    return ok ? def->var : 0;
+}
+
+
+/* Third pass: define every operator, in postorder */
+static bool
+_encode(struct _Encoder *enc, size_t index)
+{
+    struct BoolExpr *op = enc->opv[index];
+    int dirs = enc->polar[index];
+    size_t n = op->data.xs->length;
+    int *xs;
+    int y;
+
+    if (n > enc->nargs) {
+        xs = realloc(enc->args, n * sizeof(int));
+        if (xs == NULL)
+            return false; // LCOV_EXCL_LINE
+        enc->args = xs;
+        enc->nargs = n;
+    }
+    xs = enc->args;
+
+    for (size_t i = 0; i < n; ++i)
+        xs[i] = _lit(enc, op->data.xs->items[i]);
+
+    /* Put the arguments of symmetric operators in canonical order */
+    if (op->kind == BX_OP_OR || op->kind == BX_OP_AND ||
+        op->kind == BX_OP_XOR || op->kind == BX_OP_EQ)
+        qsort(xs, n, sizeof(int), _cmp_int);
+
+    if (op->kind == BX_OP_XOR) {
+        /* Chain binary XORs, the last of which is y */
+        y = xs[0];
+        for (size_t i = 1; i < n && y != 0; ++i) {
+            int pair[2] = {y, xs[i]};
+            qsort(pair, 2, sizeof(int), _cmp_int);
+            y = _define(enc, BX_OP_XOR, 2, pair, i + 1 < n ? BOTH : dirs);
+        }
+    }
+    else {
+        y = _define(enc, op->kind, n, xs, dirs);
+    }
+
+    enc->lits[index] = y;
+
+    return y != 0;
+}
+
+
+static struct BX_CNF *
+_cnf_new(void)
+{
+    struct BX_CNF *cnf;
+
+    cnf = malloc(sizeof(struct BX_CNF));
+    if (cnf == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    cnf->nvars = 0;
+    cnf->ninputs = 0;
+    cnf->inputs = (struct BoolExpr **) NULL;
+    cnf->nclauses = 0;
+    cnf->length = 0;
+    cnf->_capacity = MIN_LITS;
+    cnf->lits = malloc(cnf->_capacity * sizeof(int));
+    if (cnf->lits == NULL) {
+        free(cnf);   // LCOV_EXCL_LINE
+        return NULL; // LCOV_EXCL_LINE
+    }
+
+    return cnf;
+}
+
+
+void
+BX_CNF_Del(struct BX_CNF *cnf)
+{
+    for (size_t i = 0; i < cnf->ninputs; ++i)
+        BX_DecRef(cnf->inputs[i]);
+    free(cnf->inputs);
+    free(cnf->lits);
+    free(cnf);
+}
+
+
+static bool
+_tseitin(struct BX_CNF *cnf, struct BoolExpr *ex, bool polarity)
+{
+    struct _Encoder enc;
+    bool ok;
+
+    enc.cnf = cnf;
+    enc.ninputs = 0;
+    enc.nops = 0;
+    enc._opcap = 0;
+    enc.opv = (struct BoolExpr **) NULL;
+    enc.polar = (unsigned char *) NULL;
+    enc.lits = (int *) NULL;
+    enc.nargs = 0;
+    enc.args = (int *) NULL;
+
+    ok = _map_init(&enc.vars);
+    ok = _map_init(&enc.ops) && ok;
+    ok = _defs_init(&enc.defs) && ok;
+
+    ok = ok && _walk(ex, &enc.ops, _collect, &enc);
+
+    if (ok) {
+        /* Number the inputs in uniqid order */
+        qsort(cnf->inputs, cnf->ninputs, sizeof(struct BoolExpr *), _cmp_uniqid);
+        for (size_t i = 0; i < cnf->ninputs; ++i)
+            *_map_search(&enc.vars, VAR_KEY(cnf->inputs[i])) = (int) i + 1;
+        cnf->nvars = (int) cnf->ninputs;
+
+        enc.polar = malloc(enc.nops + 1);
+        enc.lits = malloc((enc.nops + 1) * sizeof(int));
+        ok = enc.polar != NULL && enc.lits != NULL;
+    }
+
+    if (ok) {
+        for (size_t i = 0; i < enc.nops; ++i)
+            enc.polar[i] = polarity ? 0 : BOTH;
+        if (polarity)
+            _polarize(&enc, ex);
+
+        for (size_t i = 0; ok && i < enc.nops; ++i)
+            ok = _encode(&enc, i);
+    }
+
+    /* The expression itself must be true */
+    ok = ok && _push(cnf, _lit(&enc, ex)) && _push(cnf, 0);
+
+    _map_fini(&enc.vars);
+    _map_fini(&enc.ops);
+    _defs_fini(&enc.defs);
+    free(enc.opv);
+    free(enc.polar);
+    free(enc.lits);
+    free(enc.args);
+
+    return ok;
+}
+
+
+struct BX_CNF *
+BX_Tseitin(struct BoolExpr *ex, bool polarity)
+{
+    struct BoolExpr *simple;
+    struct BX_CNF *cnf;
+    bool ok = true;
+
+    cnf = _cnf_new();
+    if (cnf == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    simple = BX_Simplify(ex);
+    if (simple == NULL) {
+        BX_CNF_Del(cnf); // LCOV_EXCL_LINE
+        return NULL;     // LCOV_EXCL_LINE
+    }
+
+    /* One has no clauses, and Zero has an empty clause */
+    if (BX_IS_ZERO(simple))
+        ok = _push(cnf, 0);
+    else if (!BX_IS_ONE(simple))
+        ok = _tseitin(cnf, simple, polarity);
+
+    BX_DecRef(simple);
+
+    if (!ok) {
+        BX_CNF_Del(cnf); // LCOV_EXCL_LINE
+        return NULL;     // LCOV_EXCL_LINE
+    }
+
+    return cnf;
+}
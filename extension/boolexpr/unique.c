@@ -0,0 +1,322 @@
+/*
+** Filename: unique.c
+**
+** Unique table of operator nodes
+**
+** When the table is enabled, every new operator whose arguments are all
+** atoms or unique operators is looked up by (kind, arguments) first.
+** Structurally identical expressions therefore share one node,
+** and pointer equality implies structural equality.
+**
+** The table does not own references to its nodes.
+** A unique operator removes itself from the table when it is deleted.
+**
+** The table is guarded by a lock, and _bx_op_from holds it from search
+** to insert, so two threads never create the same operator twice.
+*/
+
+
+#include <stdbool.h>
+#include <stddef.h>
+#include <stdlib.h>
+
+#include "atomic.h"
+#include "boolexpr.h"
+#include "share.h"
+
+
+/* Maximum load allowed before enlargement */
+#define MAX_LOAD 1.5
+
+/* Min/Max indices in the primes table */
+#define MIN_IDX 4
+#define MAX_IDX 30
+
+/* Atoms and unique operators may be arguments of unique operators */
+#define CANONICAL(ex) (BX_IS_ATOM(ex) || BX_IS_UNIQUE(ex))
+
+
+/* Define static size_t _primes[] */
+#include "primes-inl.c"
+
+
+struct _UniqueItem {
+    size_t hash;
+    struct BoolExpr *op;
+    struct _UniqueItem *tail;
+};
+
+
+static size_t _pridx;
+static size_t _length;
+
+/* NULL when the table is disabled */
+static struct _UniqueItem **_items = NULL;
+
+/* Read without the lock by BX_UniqueTable_Enabled */
+static int _enabled = 0;
+
+static _bx_lock_t _lock = 0;
+
+
+static size_t
+_hash(BX_Kind kind, size_t n, struct BoolExpr **xs)
+{
+    size_t hash = (size_t) kind;
+
+    for (size_t i = 0; i < n; ++i)
+        hash = hash * 1000003 ^ ((size_t) xs[i] >> 4);
+
+    return hash;
+}
+
+
+static bool
+_canonical(size_t n, struct BoolExpr **xs)
+{
+    for (size_t i = 0; i < n; ++i) {
+        if (!CANONICAL(xs[i]))
+            return false;
+    }
+
+    return true;
+}
+
+
+/*
+** Return a new reference to op, unless it is being deleted.
+**
+** A node whose count has dropped to zero stays in the table until
+** _op_del removes it, and it must not be revived.
+*/
+static bool
+_incref_live(struct BoolExpr *op)
+{
+    int refcount = _bx_atomic_load(&op->refcount);
+
+    while (refcount > 0) {
+        if (_bx_atomic_cas(&op->refcount, refcount, refcount + 1))
+            return true;
+        refcount = _bx_atomic_load(&op->refcount);
+    }
+
+    return false;
+}
+
+
+static bool
+_eq(struct BoolExpr *op, BX_Kind kind, size_t n, struct BoolExpr **xs)
+{
+    if (op->kind != kind || op->data.xs->length != n)
+        return false;
+
+    for (size_t i = 0; i < n; ++i) {
+        if (op->data.xs->items[i] != xs[i])
+            return false;
+    }
+
+    return true;
+}
+
+
+static bool
+_enlarge(void)
+{
+    struct _UniqueItem *item, *tail;
+
+    size_t old_width = _primes[_pridx];
+    size_t new_width = _primes[_pridx + 1];
+    struct _UniqueItem **items;
+
+    items = malloc(new_width * sizeof(struct _UniqueItem *));
+    if (items == NULL)
+        return false; // LCOV_EXCL_LINE
+
+    for (size_t i = 0; i < new_width; ++i)
+        items[i] = (struct _UniqueItem *) NULL;
+
+    /* Move the items, so enlargement never fails halfway */
+    for (size_t i = 0; i < old_width; ++i) {
+        for (item = _items[i]; item; item = tail) {
+            size_t index = item->hash % new_width;
+            tail = item->tail;
+            item->tail = items[index];
+            items[index] = item;
+        }
+    }
+
+    free(_items);
+    _pridx += 1;
+    _items = items;
+
+    return true;
+}
+
+
+bool
+BX_UniqueTable_Enable(void)
+{
+    size_t width = _primes[MIN_IDX];
+    struct _UniqueItem **items;
+
+    if (_items != NULL)
+        return true;
+
+    items = malloc(width * sizeof(struct _UniqueItem *));
+    if (items == NULL)
+        return false; // LCOV_EXCL_LINE
+
+    /* Initialize items to NULL */
+    for (size_t i = 0; i < width; ++i)
+        items[i] = (struct _UniqueItem *) NULL;
+
+    _bx_lock_acquire(&_lock);
+    if (_items == NULL) {
+        _pridx = MIN_IDX;
+        _length = 0;
+        _items = items;
+        items = (struct _UniqueItem **) NULL;
+        _bx_atomic_store(&_enabled, 1);
+    }
+    _bx_lock_release(&_lock);
+
+    /* Another thread enabled the table first */
+    free(items);
+
+    return true;
+}
+
+
+void
+BX_UniqueTable_Disable(void)
+{
+    struct _UniqueItem *item, *tail;
+
+    _bx_lock_acquire(&_lock);
+
+    if (_items != NULL) {
+        /* The nodes live on, but they are no longer unique */
+        for (size_t i = 0; i < _primes[_pridx]; ++i) {
+            for (item = _items[i]; item; item = tail) {
+                tail = item->tail;
+                _bx_atomic_and(&item->op->flags, (BX_Flags) ~BX_UNIQUE);
+                free(item);
+            }
+        }
+
+        free(_items);
+        _items = (struct _UniqueItem **) NULL;
+        _length = 0;
+        _bx_atomic_store(&_enabled, 0);
+    }
+
+    _bx_lock_release(&_lock);
+}
+
+
+bool
+BX_UniqueTable_Enabled(void)
+{
+    return _bx_atomic_load(&_enabled) != 0;
+}
+
+
+size_t
+BX_UniqueTable_Length(void)
+{
+    return _length;
+}
+
+
+void
+_bx_unique_lock(void)
+{
+    _bx_lock_acquire(&_lock);
+}
+
+
+void
+_bx_unique_unlock(void)
+{
+    _bx_lock_release(&_lock);
+}
+
+
+/* Return a new reference to an existing operator. Requires the lock. */
+struct BoolExpr *
+_bx_unique_search(BX_Kind kind, size_t n, struct BoolExpr **xs)
+{
+    struct _UniqueItem *item;
+    size_t hash;
+
+    if (_items == NULL || !_canonical(n, xs))
+        return (struct BoolExpr *) NULL;
+
+    hash = _hash(kind, n, xs);
+    for (item = _items[hash % _primes[_pridx]]; item; item = item->tail) {
+        if (item->hash == hash && _eq(item->op, kind, n, xs) && _incref_live(item->op))
+            return item->op;
+    }
+
+    return (struct BoolExpr *) NULL;
+}
+
+
+/* Requires the lock */
+void
+_bx_unique_insert(struct BoolExpr *op)
+{
+    struct _UniqueItem *item;
+    size_t n = op->data.xs->length;
+    struct BoolExpr **xs = op->data.xs->items;
+    size_t index;
+    double load;
+
+    if (_items == NULL || !_canonical(n, xs))
+        return;
+
+    /* If this fails, the operator is valid, but it will not be shared */
+    item = malloc(sizeof(struct _UniqueItem));
+    if (item == NULL)
+        return; // LCOV_EXCL_LINE
+
+    item->hash = _hash(op->kind, n, xs);
+    item->op = op;
+    index = item->hash % _primes[_pridx];
+    item->tail = _items[index];
+    _items[index] = item;
+    _length += 1;
+
+    op->flags |= BX_UNIQUE;
+
+    load = (double) _length / (double) _primes[_pridx];
+    if (_pridx < MAX_IDX && load > MAX_LOAD)
+        _enlarge();
+}
+
+
+void
+_bx_unique_remove(struct BoolExpr *op)
+{
+    struct _UniqueItem *item;
+    struct _UniqueItem **tail;
+    size_t hash = _hash(op->kind, op->data.xs->length, op->data.xs->items);
+
+    _bx_lock_acquire(&_lock);
+
+    /* The table may have been disabled in the meantime */
+    if (_items != NULL) {
+        tail = &_items[hash % _primes[_pridx]];
+        for (item = *tail; item; item = item->tail) {
+            if (item->op == op) {
+                *tail = item->tail;
+                free(item);
+                _length -= 1;
+                break;
+            }
+            tail = &item->tail;
+        }
+    }
+
+    _bx_lock_release(&_lock);
+}
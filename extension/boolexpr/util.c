@@ -8,6 +8,7 @@
 #include <stddef.h>
 #include <stdlib.h>
 
+#include "atomic.h"
 #include "boolexpr.h"
 #include "memcheck.h"
 #include "share.h"
@@ -51,13 +52,76 @@ _bx_op_transform(struct BoolExpr *op, struct BoolExpr * (*fn)(struct BoolExpr *)
 }
 
 
+/* Like _bx_op_transform, but pass a memo table through to fn */
+struct BoolExpr *
+_bx_op_transform_memo(struct BoolExpr *op,
+                      struct BoolExpr * (*fn)(struct BoolExpr *, struct BX_Dict *),
+                      struct BX_Dict *memo)
+{
+    size_t length = op->data.xs->length;
+    struct BoolExpr **xs;
+    unsigned int mod_count = 0;
+    struct BoolExpr *y;
+
+    xs = malloc(length * sizeof(struct BoolExpr *));
+    if (xs == NULL)
+        return NULL; // LCOV_EXCL_LINE
+
+    for (size_t i = 0; i < length; ++i) {
+        CHECK_NULL_N(xs[i], fn(op->data.xs->items[i], memo), i, xs);
+        mod_count += (xs[i] != op->data.xs->items[i]);
+    }
+
+    if (mod_count)
+        y = _bx_op_new(op->kind, length, xs);
+    else
+        y = BX_IncRef(op);
+
+    _bx_free_exprs(length, xs);
+
+    return y;
+}
+
+
+/*
+** Memo tables map the nodes of an expression DAG to the result of a
+** transformation, so every shared node is transformed only once.
+**
+** A node with only one reference has only one parent,
+** so it cannot be reached twice, and it is not worth memoizing.
+*/
+#define SHARED(ex) (_bx_atomic_load(&(ex)->refcount) > 1)
+
+
+/* If the memo contains the node, return its result. */
+struct BoolExpr *
+_bx_memo_search(struct BX_Dict *memo, struct BoolExpr *ex)
+{
+    if (!SHARED(ex))
+        return (struct BoolExpr *) NULL;
+
+    return BX_Dict_Search(memo, ex);
+}
+
+
+/* Insert the result of a node into the memo. */
+bool
+_bx_memo_insert(struct BX_Dict *memo, struct BoolExpr *ex, struct BoolExpr *y)
+{
+    if (!SHARED(ex))
+        return true;
+
+    return BX_Dict_Insert(memo, ex, y);
+}
+
+
 void
 _bx_mark_flags(struct BoolExpr *ex, BX_Flags f)
 {
-    if ((ex->flags & f) != f) {
+    if ((_bx_atomic_load(&ex->flags) & f) != f) {
         for (size_t i = 0; i < ex->data.xs->length; ++i)
             _bx_mark_flags(ex->data.xs->items[i], f);
-        ex->flags |= f;
+        _bx_atomic_or(&ex->flags, f);
     }
 }
 
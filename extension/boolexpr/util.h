@@ -8,6 +8,14 @@ void _bx_free_exprs(int length, struct BoolExpr **exprs);
 struct BoolExpr * _bx_op_transform(struct BoolExpr *op,
                                    struct BoolExpr * (*fn)(struct BoolExpr *));
 
+struct BoolExpr * _bx_op_transform_memo(struct BoolExpr *op,
+                                        struct BoolExpr * (*fn)(struct BoolExpr *, struct BX_Dict *),
+                                        struct BX_Dict *memo);
+
+struct BoolExpr * _bx_memo_search(struct BX_Dict *memo, struct BoolExpr *ex);
+
+bool _bx_memo_insert(struct BX_Dict *memo, struct BoolExpr *ex, struct BoolExpr *y);
+
 void _bx_mark_flags(struct BoolExpr *ex, BX_Flags f);
 
 bool _bx_is_clause(struct BoolExpr *op);
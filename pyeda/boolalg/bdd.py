@@ -9,30 +9,162 @@ Interface Functions:
 * :func:`bdd2expr` --- Convert a binary decision diagram into an expression
 * :func:`upoint2bddpoint` --- Convert an untyped point into a BDD point
 * :func:`ite` --- BDD if-then-else operator
+* :func:`and_exists` --- BDD relational product operator
+* :func:`constrain` --- BDD generalized cofactor operator
+* :func:`simplify_with_dont_cares` --- Simplify a BDD using a care set
+
+Serialization Functions:
+
+* :func:`dump` --- Write BDDs to a binary file
+* :func:`load` --- Read BDDs from a binary file
+
+Computed Table Functions:
+
+* :func:`cache_info` --- Return computed table statistics
+* :func:`cache_clear` --- Clear the computed table
+* :func:`set_cache_size` --- Set the computed table capacity
+
+Statistics Functions:
+
+* :func:`stats` --- Return node store and operation statistics
+* :func:`stats_clear` --- Reset the peak node count and operation statistics
+* :func:`add_node_callback` --- Call a function when the node count grows
+  past a threshold
+* :func:`remove_node_callback` --- Remove a node count callback
+
+Variable Reordering Functions:
+
+* :func:`reorder` --- Reorder the variables to reduce the number of nodes
+* :func:`set_reorder_threshold` --- Enable/disable automatic reordering
+* :func:`var_order` --- Return the current variable order
 
 Interface Classes:
 
+* :class:`BDDManager`
 * :class:`BDDNode`
 * :class:`BinaryDecisionDiagram`
 
   * :class:`BDDConstant`
   * :class:`BDDVariable`
+
+Node Stores:
+
+BDD nodes are kept in a *node store*,
+which owns the unique table, the computed table, and the variable order.
+The ``PYEDA_BDD_NODE_STORE`` environment variable selects the store
+of the default manager, and of any :class:`BDDManager` created without
+an explicit *store*:
+
+``object`` (default)
+   Every node is a :class:`BDDNode` instance.
+   Unreachable nodes are freed as soon as their last reference goes away.
+
+``array``
+   Nodes are packed into integer columns,
+   and the unique table is an open-addressing hash table.
+   This uses a small fraction of the memory,
+   at the cost of some speed.
+   Unreachable nodes are reclaimed by mark-sweep garbage collection.
 """
 
+import array
+import bisect
 import collections
+import functools
+import os
 import random
+import struct
+import sys
+import time
 import weakref
 from functools import cached_property
 
 from pyeda.boolalg import boolfunc
-from pyeda.boolalg.expr import And, Or, exprvar
+from pyeda.boolalg.expr import And, Or, exprnode, exprvar
+
+# default computed table capacity
+_CACHE_SIZE = 2**18
+
+# initial number of array store unique table slots
+_TABLE_SIZE = 2**10
 
-# existing BDDVariable references
-_VARS = {}
+# minimum number of array store nodes that triggers garbage collection
+_GC_THRESHOLD = 2**16
 
-# node/bdd cache
-_NODES = weakref.WeakValueDictionary()
-_BDDS = weakref.WeakValueDictionary()
+# terminal nodes are below all variables
+_TERMINAL_LEVEL = sys.maxsize
+
+# sifting stops moving a variable when the size grows past this factor
+_MAX_GROWTH = 1.2
+
+# serialization file format
+_MAGIC = b"PYEDABDD"
+_VERSION = 1
+_UINT = struct.Struct("<I")
+_NODE = struct.Struct("<III")
+
+# number of nodes read from a file at a time
+_LOAD_CHUNK = 2**12
+
+CacheInfo = collections.namedtuple("CacheInfo",
+                                   ["hits", "misses", "maxsize", "currsize"])
+
+Stats = collections.namedtuple("Stats", ["nodes", "peak_nodes", "load_factor",
+                                         "cache", "ops"])
+
+OpStats = collections.namedtuple("OpStats", ["calls", "time"])
+
+
+class _ComputedTable:
+    """Bounded operation cache with least-recently-used (LRU) eviction
+
+    Keys are tuples that start with an operation tag,
+    followed by the operand nodes.
+    Values are result nodes.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = collections.OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return the cached result for *key*, or None."""
+        try:
+            val = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return val
+
+    def put(self, key, val):
+        """Insert a result, and evict the least recently used entry."""
+        data = self._data
+        data[key] = val
+        if len(data) > self.maxsize:
+            data.popitem(last=False)
+
+    def resize(self, maxsize):
+        """Change the capacity, evicting entries if necessary."""
+        self.maxsize = maxsize
+        data = self._data
+        while len(data) > maxsize:
+            data.popitem(last=False)
+
+    def flush(self):
+        """Remove all entries, but keep the statistics."""
+        self._data.clear()
+
+    def clear(self):
+        """Remove all entries, and reset the statistics."""
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
 
 
 class BDDNode:
@@ -51,6 +183,13 @@ class BDDNode:
     and the ``root`` of the one node is -2.
     Both zero/one nodes have ``lo=None`` and ``hi=None``.
 
+    The unique table only stores *regular* nodes,
+    whose ``hi`` child is also regular.
+    The inverse of a regular node is a *complemented* node,
+    which refers to the regular node, and complements its children on access.
+    Therefore negation takes constant time,
+    and a function and its inverse share all nodes.
+
     Do **NOT** create BDD nodes using the ``BDDNode`` constructor.
     BDD node instances are managed internally.
     """
@@ -58,10 +197,807 @@ class BDDNode:
         self.root = root
         self.lo = lo
         self.hi = hi
+        # Regular nodes: weak reference to the complemented node
+        self._negref = None
+        # Complemented nodes: the regular node
+        self._regular = None
+
+
+class _BDDComplementNode(BDDNode):
+    """Complemented binary decision diagram node
+
+    The ``lo`` and ``hi`` children are computed on access,
+    by complementing the children of the regular node.
+    """
+    # pylint: disable=super-init-not-called
+    def __init__(self, node):
+        self.root = node.root
+        self._negref = None
+        self._regular = node
+
+    @property
+    def lo(self):
+        lo = self._regular.lo
+        return None if lo is None else _neg(lo)
+
+    @property
+    def hi(self):
+        hi = self._regular.hi
+        return None if hi is None else _neg(hi)
+
+
+class _ArrayNode(BDDNode):
+    """Binary decision diagram node view of an array store edge
+
+    The ``root``, ``lo``, and ``hi`` attributes are computed on access.
+    A view keeps its node alive.
+    """
+    # pylint: disable=super-init-not-called
+    def __init__(self, store, edge):
+        self._store = store
+        self._edge = edge
+
+    @property
+    def root(self):
+        return self._store.root(self._edge)
 
+    @property
+    def lo(self):
+        lo, _ = self._store.children(self._edge)
+        return None if lo is None else self._store.view(lo)
 
-BDDNODEZERO = _NODES[(-1, None, None)] = BDDNode(-1, None, None)
-BDDNODEONE = _NODES[(-2, None, None)] = BDDNode(-2, None, None)
+    @property
+    def hi(self):
+        _, hi = self._store.children(self._edge)
+        return None if hi is None else self._store.view(hi)
+
+
+def _neg(node):
+    """Return the inverse of *node* in constant time."""
+    if node._regular is not None:
+        return node._regular
+    comp = None if node._negref is None else node._negref()
+    if comp is None:
+        comp = _BDDComplementNode(node)
+        node._negref = weakref.ref(comp)
+    return comp
+
+
+BDDNODEONE = BDDNode(-2, None, None)
+BDDNODEZERO = _BDDComplementNode(BDDNODEONE)
+BDDNODEZERO.root = -1
+BDDNODEONE._negref = weakref.ref(BDDNODEZERO)
+
+
+class _NodeStore:
+    """Base class for node stores
+
+    A node store owns the unique table, the computed table,
+    and the variable order.
+    The ``order`` list maps levels to variable uniqids,
+    and the ``levels`` dict maps variable uniqids to levels.
+    Level zero is the top of the order,
+    and the terminal nodes are below all variables.
+    """
+    def __init__(self):
+        self.cache = _ComputedTable(_CACHE_SIZE)
+        self.order = []
+        self.levels = {-1: _TERMINAL_LEVEL, -2: _TERMINAL_LEVEL}
+        self.reordered = False
+        self.reorder_threshold = None
+        self.next_reorder = None
+        self.peak = 0
+        # name => [calls, time]
+        self.ops = collections.defaultdict(lambda: [0, 0.0])
+        # [threshold, callback, armed]
+        self.callbacks = []
+
+    def add_var(self, root):
+        """Add a variable to the order.
+
+        Until the order is changed by reordering,
+        variables are ordered by uniqid.
+        Afterwards, new variables are added to the bottom.
+        """
+        order, levels = self.order, self.levels
+        if self.reordered or not order or order[-1] < root:
+            levels[root] = len(order)
+            order.append(root)
+        else:
+            level = bisect.bisect(order, root)
+            order.insert(level, root)
+            for i in range(level, len(order)):
+                levels[order[i]] = i
+
+    def record(self, name, elapsed):
+        """Count one call of operation *name*, and check the node count."""
+        op = self.ops[name]
+        op[0] += 1
+        op[1] += elapsed
+        self.check_nodes()
+
+    def check_nodes(self):
+        """Update the peak node count, and fire node count callbacks.
+
+        A callback fires once when the count grows past its threshold,
+        and fires again only after the count has dropped back to it.
+        """
+        nodes = len(self)
+        if nodes > self.peak:
+            self.peak = nodes
+        for entry in list(self.callbacks):
+            threshold, callback, armed = entry
+            if nodes > threshold:
+                if armed:
+                    entry[2] = False
+                    callback(nodes)
+            else:
+                entry[2] = True
+
+    def swap_levels(self, i, j):
+        """Exchange the variables at levels *i* and *j*."""
+        order, levels = self.order, self.levels
+        x, y = order[i], order[j]
+        order[i], order[j] = y, x
+        levels[x], levels[y] = j, i
+        self.reordered = True
+
+
+class _ObjectNodeStore(_NodeStore):
+    """Node store that represents every node as a BDDNode instance
+
+    Edges are BDDNode instances.
+    The unique table is keyed by ``(root, lo, hi)``,
+    and only holds weak references,
+    so a node is freed as soon as it is no longer referenced by a parent node,
+    a BDD, or the computed table.
+    """
+    zero = BDDNODEZERO
+    one = BDDNODEONE
+
+    def __init__(self):
+        super().__init__()
+        self._table = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._table)
+
+    @staticmethod
+    def load_factor():
+        """Return None, because the unique table is resized by Python."""
+        return None
+
+    def mk(self, root, lo, hi):
+        """Return a unique node.
+
+        The ``hi`` child of a node in the unique table is always regular.
+        If *hi* is complemented, return the inverse of ``(root, ~lo, ~hi)``.
+        """
+        if lo is hi:
+            return lo
+        if hi._regular is not None:
+            return _neg(self.mk(root, _neg(lo), hi._regular))
+        table = self._table
+        key = (root, lo, hi)
+        try:
+            node = table[key]
+        except KeyError:
+            if root not in self.levels:
+                self.add_var(root)
+            node = table[key] = BDDNode(root, lo, hi)
+        return node
+
+    def iter_nodes(self):
+        """Iterate through all regular non-terminal nodes."""
+        yield from list(self._table.values())
+
+    def unlink(self, node):
+        """Remove a regular node from the unique table."""
+        del self._table[node.root, node.lo, node.hi]
+
+    # Nodes are freed by reference counting
+    free = unlink
+
+    def relink(self, node, root, lo, hi):
+        """Rewrite an unlinked regular node in place, and insert it into the
+        unique table.
+        """
+        node.root, node.lo, node.hi = root, lo, hi
+        comp = None if node._negref is None else node._negref()
+        if comp is not None:
+            comp.root = root
+        self._table[root, lo, hi] = node
+
+    @staticmethod
+    def pinned():
+        """Return the edges that are kept alive outside of BDDs."""
+        return ()
+
+    neg = staticmethod(_neg)
+
+    @staticmethod
+    def is_comp(node):
+        """Return whether *node* is complemented."""
+        return node._regular is not None
+
+    @staticmethod
+    def regular(node):
+        """Return the regular node of *node*."""
+        return node if node._regular is None else node._regular
+
+    @staticmethod
+    def root(node):
+        """Return the root variable uniqid of *node*."""
+        return node.root
+
+    @staticmethod
+    def children(node):
+        """Return the (lo, hi) children of *node*."""
+        return node.lo, node.hi
+
+    @staticmethod
+    def cofactors(node, root):
+        """Return the (zero, one) cofactors of *node* w.r.t. *root*."""
+        if node.root == root:
+            return node.lo, node.hi
+        else:
+            return node, node
+
+    @staticmethod
+    def view(node):
+        """Return the BDDNode of *node*."""
+        return node
+
+    def collect(self, roots):
+        """Reclaim unreachable nodes.
+
+        Nodes are freed by reference counting, so there is nothing to do.
+        """
+
+    def maybe_collect(self, roots):
+        """Reclaim unreachable nodes if the store has grown too large."""
+
+
+class _ArrayNodeStore(_NodeStore):
+    """Node store that packs nodes into integer arrays
+
+    Nodes are numbered by index,
+    and an edge is the integer ``index << 1 | complement``.
+    Node zero is the one terminal,
+    so edge zero is the one node, and edge one is the zero node.
+
+    The var, lo, and hi columns are ``array.array`` instances.
+    The unique table is an open-addressing, linear probing hash table of
+    node indices.
+    It only stores regular nodes, whose ``hi`` edge is also regular.
+    Removed entries are marked by tombstones until the next rehash.
+
+    Nodes that are not reachable from the roots passed to :meth:`collect`
+    are reclaimed by mark-sweep garbage collection.
+    """
+    zero = 1
+    one = 0
+
+    def __init__(self):
+        super().__init__()
+        # A zero var marks a free node
+        self._var = array.array("i", [-2])
+        self._lo = array.array("i", [0])
+        self._hi = array.array("i", [0])
+        self._free = array.array("i")
+        # Empty slots are -1, and tombstones are -2
+        self._table = array.array("i", [-1]) * _TABLE_SIZE
+        self._count = 0
+        self._tombs = 0
+        self._views = weakref.WeakValueDictionary()
+        self._gc_threshold = _GC_THRESHOLD
+
+    def __len__(self):
+        return self._count
+
+    def mk(self, root, lo, hi):
+        """Return a unique node.
+
+        The ``hi`` child of a node in the unique table is always regular.
+        If *hi* is complemented, return the inverse of ``(root, ~lo, ~hi)``.
+        """
+        if lo == hi:
+            return lo
+        if hi & 1:
+            return self.mk(root, lo ^ 1, hi ^ 1) ^ 1
+        var, lo_, hi_ = self._var, self._lo, self._hi
+        table = self._table
+        mask = len(table) - 1
+        slot = hash((root, lo, hi)) & mask
+        idx = table[slot]
+        while idx != -1:
+            if (idx >= 0 and var[idx] == root
+                    and lo_[idx] == lo and hi_[idx] == hi):
+                return idx << 1
+            slot = (slot + 1) & mask
+            idx = table[slot]
+        if root not in self.levels:
+            self.add_var(root)
+        if self._free:
+            idx = self._free.pop()
+            var[idx] = root
+            lo_[idx] = lo
+            hi_[idx] = hi
+        else:
+            idx = len(var)
+            var.append(root)
+            lo_.append(lo)
+            hi_.append(hi)
+        table[slot] = idx
+        self._count += 1
+        self._check_load()
+        return idx << 1
+
+    def load_factor(self):
+        """Return the fraction of unique table slots in use,
+        including tombstones.
+        """
+        return (self._count + self._tombs) / len(self._table)
+
+    def _check_load(self):
+        """Keep the load factor, including tombstones, below 3/4."""
+        size = len(self._table)
+        if 4 * (self._count + self._tombs) > 3 * size:
+            self._rehash(2 * size if 2 * self._count > size else size)
+
+    def _slot(self, idx):
+        """Return the unique table slot that holds node *idx*."""
+        table = self._table
+        mask = len(table) - 1
+        slot = hash((self._var[idx], self._lo[idx], self._hi[idx])) & mask
+        while table[slot] != idx:
+            slot = (slot + 1) & mask
+        return slot
+
+    def _rehash(self, size):
+        """Rebuild the unique table with *size* slots."""
+        var, lo, hi = self._var, self._lo, self._hi
+        table = array.array("i", [-1]) * size
+        mask = size - 1
+        for idx in range(1, len(var)):
+            root = var[idx]
+            if root:
+                slot = hash((root, lo[idx], hi[idx])) & mask
+                while table[slot] >= 0:
+                    slot = (slot + 1) & mask
+                table[slot] = idx
+        self._table = table
+        self._tombs = 0
+
+    @staticmethod
+    def neg(edge):
+        """Return the inverse of *edge* in constant time."""
+        return edge ^ 1
+
+    @staticmethod
+    def is_comp(edge):
+        """Return whether *edge* is complemented."""
+        return edge & 1 == 1
+
+    @staticmethod
+    def regular(edge):
+        """Return the regular edge of *edge*."""
+        return edge & -2
+
+    def root(self, edge):
+        """Return the root variable uniqid of *edge*."""
+        idx = edge >> 1
+        return self._var[idx] if idx else edge - 2
+
+    def children(self, edge):
+        """Return the (lo, hi) children of *edge*."""
+        idx = edge >> 1
+        if idx:
+            comp = edge & 1
+            return self._lo[idx] ^ comp, self._hi[idx] ^ comp
+        else:
+            return None, None
+
+    def cofactors(self, edge, root):
+        """Return the (zero, one) cofactors of *edge* w.r.t. *root*."""
+        idx = edge >> 1
+        if idx and self._var[idx] == root:
+            comp = edge & 1
+            return self._lo[idx] ^ comp, self._hi[idx] ^ comp
+        else:
+            return edge, edge
+
+    def iter_nodes(self):
+        """Iterate through all regular non-terminal nodes."""
+        var = self._var
+        for idx in range(1, len(var)):
+            if var[idx]:
+                yield idx << 1
+
+    def unlink(self, edge):
+        """Remove a regular node from the unique table."""
+        self._table[self._slot(edge >> 1)] = -2
+        self._tombs += 1
+        self._count -= 1
+
+    def free(self, edge):
+        """Remove a regular node from the unique table, and reclaim it."""
+        self.unlink(edge)
+        idx = edge >> 1
+        self._var[idx] = 0
+        self._free.append(idx)
+
+    def relink(self, edge, root, lo, hi):
+        """Rewrite an unlinked regular node in place, and insert it into the
+        unique table.
+        """
+        idx = edge >> 1
+        self._var[idx] = root
+        self._lo[idx] = lo
+        self._hi[idx] = hi
+        table = self._table
+        mask = len(table) - 1
+        slot = hash((root, lo, hi)) & mask
+        while table[slot] != -1:
+            slot = (slot + 1) & mask
+        table[slot] = idx
+        self._count += 1
+        self._check_load()
+
+    def pinned(self):
+        """Return the edges that are kept alive by BDDNode views."""
+        return list(self._views.keys())
+
+    def view(self, edge):
+        """Return a BDDNode view of *edge*."""
+        try:
+            node = self._views[edge]
+        except KeyError:
+            node = self._views[edge] = _ArrayNode(self, edge)
+        return node
+
+    def collect(self, roots):
+        """Reclaim all nodes that are not reachable from *roots*.
+
+        Nodes referenced by live BDDNode views are also kept.
+        The computed table is flushed,
+        because it may refer to reclaimed nodes.
+        """
+        var, lo, hi = self._var, self._lo, self._hi
+        marked = bytearray(len(var))
+        marked[0] = 1
+        stack = [edge >> 1 for edge in roots]
+        stack.extend(edge >> 1 for edge in self.pinned())
+        while stack:
+            idx = stack.pop()
+            if not marked[idx]:
+                marked[idx] = 1
+                stack.append(lo[idx] >> 1)
+                stack.append(hi[idx] >> 1)
+        free = array.array("i")
+        for idx in range(len(var) - 1, 0, -1):
+            if not marked[idx]:
+                var[idx] = 0
+                free.append(idx)
+        self._free = free
+        self._count = len(var) - 1 - len(free)
+        self._rehash(len(self._table))
+        self.cache.flush()
+        self._gc_threshold = max(_GC_THRESHOLD, 2 * self._count)
+
+    def maybe_collect(self, roots):
+        """Reclaim unreachable nodes if the store has grown too large."""
+        if self._count > self._gc_threshold:
+            self.collect(roots)
+
+
+_STORES = {
+    "object": _ObjectNodeStore,
+    "array": _ArrayNodeStore,
+}
+
+
+def _timed(name):
+    """Return a decorator that records the calls and time of an operation.
+
+    The operation is recorded by the manager of its first BDD argument.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            ret = func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            _find_manager(args).store.record(name, elapsed)
+            return ret
+        return wrapper
+    return decorate
+
+
+def _find_manager(args):
+    """Return the manager of the first BDD or manager in *args*,
+    or the default manager.
+    """
+    for arg in args:
+        if isinstance(arg, (list, tuple)) and arg:
+            arg = arg[0]
+        if isinstance(arg, BDDManager):
+            return arg
+        if isinstance(arg, BinaryDecisionDiagram):
+            return arg.manager
+    return _MANAGER
+
+
+def _manager(*fs):
+    """Return the common manager of a sequence of BDDs.
+
+    Every manager has its own constants,
+    so if there are only constants, return the manager of the first one.
+    Constants of other managers, and non-BDD objects,
+    are boxed by the manager of the other BDDs.
+    If there are no BDDs, return the default manager.
+    """
+    mgr = None
+    const_mgr = None
+    for f in fs:
+        if isinstance(f, BDDConstant):
+            if const_mgr is None:
+                const_mgr = f.manager
+        elif isinstance(f, BinaryDecisionDiagram):
+            if mgr is None:
+                mgr = f.manager
+            elif f.manager is not mgr:
+                raise ValueError("expected BDDs of the same manager")
+    if mgr is None:
+        mgr = _MANAGER if const_mgr is None else const_mgr
+    return mgr
+
+
+class BDDManager:
+    """Binary decision diagram manager
+
+    A manager owns a node store, with its unique table, computed table,
+    and variable order, as well as its variables and BDDs.
+    BDDs of different managers do not share any nodes,
+    and may not be combined.
+
+    The module-level functions, such as :func:`bddvar` and :func:`reorder`,
+    use a default manager.
+    Create a new manager to give an unrelated job its own node space:
+
+    >>> with BDDManager() as mgr:
+    ...     a, b = map(mgr.bddvar, "ab")
+    ...     f = a & ~b
+    ...     f.satisfy_count()
+    1
+
+    The *store* argument selects the node store, ``"object"`` or ``"array"``.
+    By default, it is the ``PYEDA_BDD_NODE_STORE`` environment variable.
+
+    When a manager is closed,
+    it drops all of its nodes, variables, and caches,
+    and all further operations on its BDDs raise :class:`RuntimeError`.
+    The default manager cannot be closed.
+    """
+    def __init__(self, store=None):
+        if store is None:
+            store = os.getenv("PYEDA_BDD_NODE_STORE", "object")
+        try:
+            self._store = _STORES[store]()
+        except KeyError as exc:
+            fstr = "expected store in {}, got {!r}"
+            raise ValueError(fstr.format(tuple(_STORES), store)) from exc
+        # existing BDDVariable references
+        self.vars = {}
+        # bdd cache
+        self.bdds = weakref.WeakValueDictionary()
+        st = self._store
+        self.zero = self.bdds[st.zero] = BDDConstant(self, st.zero, 0)
+        self.one = self.bdds[st.one] = BDDConstant(self, st.one, 1)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def store(self):
+        """The node store of this manager."""
+        if self._store is None:
+            raise RuntimeError("BDD manager is closed")
+        return self._store
+
+    @property
+    def closed(self):
+        """Whether this manager is closed."""
+        return self._store is None
+
+    def close(self):
+        """Free all nodes, variables, and caches of this manager.
+
+        Closing a closed manager has no effect.
+        """
+        if self is _MANAGER:
+            raise RuntimeError("cannot close the default BDD manager")
+        if self._store is not None:
+            self._store.cache.clear()
+            self._store = None
+            self.vars.clear()
+            self.bdds.clear()
+
+    def box(self, obj):
+        """Convert primitive types to a BDD of this manager.
+
+        Constants of other managers are converted by value.
+        """
+        if isinstance(obj, BinaryDecisionDiagram):
+            if obj.manager is self:
+                return obj
+            elif isinstance(obj, BDDConstant):
+                return self.one if obj.value else self.zero
+            else:
+                raise ValueError("expected BDDs of the same manager")
+        elif obj in (0, "0"):
+            return self.zero
+        elif obj in (1, "1"):
+            return self.one
+        else:
+            return self.one if bool(obj) else self.zero
+
+    def bddvar(self, name, index=None):
+        """Return a unique BDD variable of this manager.
+
+        See :func:`bddvar`.
+        """
+        bvar = boolfunc.var(name, index)
+        try:
+            var = self.vars[bvar.uniqid]
+        except KeyError:
+            var = self.vars[bvar.uniqid] = BDDVariable(self, bvar)
+            self.bdds[var.node] = var
+        return var
+
+    @_timed("expr2bdd")
+    def expr2bdd(self, expr):
+        """Convert an expression into a BDD of this manager.
+
+        See :func:`expr2bdd`.
+        """
+        return self._bdd(_expr2bddnode(self, expr))
+
+    def upoint2bddpoint(self, upoint):
+        """Convert an untyped point into a BDD point of this manager.
+
+        See :func:`upoint2bddpoint`.
+        """
+        point = {}
+        for uniqid in upoint[0]:
+            point[self.vars[uniqid]] = 0
+        for uniqid in upoint[1]:
+            point[self.vars[uniqid]] = 1
+        return point
+
+    @_timed("load")
+    def load(self, file):
+        """Read a list of BDDs of this manager from a binary file.
+
+        See :func:`load`.
+        """
+        return _load(self, file)
+
+    def cache_info(self):
+        """Return computed table statistics. See :func:`cache_info`."""
+        cache = self.store.cache
+        return CacheInfo(cache.hits, cache.misses, cache.maxsize, len(cache))
+
+    def cache_clear(self):
+        """Clear the computed table. See :func:`cache_clear`."""
+        self.store.cache.clear()
+
+    def set_cache_size(self, maxsize):
+        """Set the computed table capacity. See :func:`set_cache_size`."""
+        if not isinstance(maxsize, int):
+            fstr = "expected maxsize to be an int, got {0.__name__}"
+            raise TypeError(fstr.format(type(maxsize)))
+        if maxsize < 0:
+            fstr = "expected maxsize to be >= 0, got {}"
+            raise ValueError(fstr.format(maxsize))
+        self.store.cache.resize(maxsize)
+
+    def stats(self):
+        """Return node store and operation statistics. See :func:`stats`."""
+        st = self.store
+        st.check_nodes()
+        ops = {name: OpStats(*op) for name, op in st.ops.items()}
+        return Stats(len(st), st.peak, st.load_factor(), self.cache_info(),
+                     ops)
+
+    def stats_clear(self):
+        """Reset the peak node count, and the operation statistics.
+        See :func:`stats_clear`.
+        """
+        st = self.store
+        st.peak = len(st)
+        st.ops.clear()
+
+    def add_node_callback(self, threshold, callback):
+        """Call a function when the number of nodes grows past a threshold.
+        See :func:`add_node_callback`.
+        """
+        if not isinstance(threshold, int):
+            fstr = "expected threshold to be an int, got {0.__name__}"
+            raise TypeError(fstr.format(type(threshold)))
+        if threshold < 0:
+            fstr = "expected threshold to be >= 0, got {}"
+            raise ValueError(fstr.format(threshold))
+        self.store.callbacks.append([threshold, callback, True])
+
+    def remove_node_callback(self, callback):
+        """Remove all node count callbacks of a function.
+        See :func:`remove_node_callback`.
+        """
+        callbacks = self.store.callbacks
+        callbacks[:] = [entry for entry in callbacks if entry[1] != callback]
+
+    @_timed("reorder")
+    def reorder(self, method="sift"):
+        """Reorder the variables of this manager. See :func:`reorder`."""
+        if method not in _REORDER_METHODS:
+            fstr = "expected method in {}, got {!r}"
+            raise ValueError(fstr.format(_REORDER_METHODS, method))
+        _reorder(self, method)
+
+    def set_reorder_threshold(self, threshold):
+        """Enable/disable automatic variable reordering.
+        See :func:`set_reorder_threshold`.
+        """
+        if threshold is not None:
+            if not isinstance(threshold, int):
+                fstr = ("expected threshold to be an int or None, "
+                        "got {0.__name__}")
+                raise TypeError(fstr.format(type(threshold)))
+            if threshold < 0:
+                fstr = "expected threshold to be >= 0, got {}"
+                raise ValueError(fstr.format(threshold))
+        self.store.reorder_threshold = threshold
+        self.store.next_reorder = threshold
+
+    def var_order(self):
+        """Return a tuple of all variables of this manager,
+        from the top level to the bottom.
+        """
+        return tuple(self.vars[root] for root in self.store.order)
+
+    def _bdd(self, node):
+        """Return a unique BDD."""
+        try:
+            bdd = self.bdds[node]
+        except KeyError:
+            bdd, = self._bdds([node])
+        return bdd
+
+    def _bdds(self, nodes):
+        """Return a list of unique BDDs.
+
+        Nodes are only collected or reordered after every node has a BDD,
+        because until then nothing keeps the remaining nodes alive.
+        """
+        bdds = []
+        created = False
+        for node in nodes:
+            try:
+                bdd = self.bdds[node]
+            except KeyError:
+                bdd = self.bdds[node] = BinaryDecisionDiagram(self, node)
+                created = True
+            bdds.append(bdd)
+        if created:
+            st = self.store
+            st.maybe_collect(self.bdds.keys())
+            if st.reorder_threshold is not None:
+                _maybe_reorder(self)
+        return bdds
 
 
 def bddvar(name, index=None):
@@ -103,61 +1039,146 @@ def bddvar(name, index=None):
        For creating arrays of variables with incremental indices,
        use the :func:`pyeda.boolalg.bfarray.bddvars` function.
     """
-    bvar = boolfunc.var(name, index)
-    try:
-        var = _VARS[bvar.uniqid]
-    except KeyError:
-        var = _VARS[bvar.uniqid] = BDDVariable(bvar)
-        _BDDS[var.node] = var
-    return var
+    return _MANAGER.bddvar(name, index)
 
 
-def _expr2bddnode(expr):
-    """Convert an expression into a BDD node."""
-    if expr.is_zero():
-        return BDDNODEZERO
-    elif expr.is_one():
-        return BDDNODEONE
-    else:
-        top = expr.top
+def _expr2bddnode(mgr, expr):
+    """Convert an expression into a BDD node.
+
+    The expression DAG is compiled bottom-up,
+    by applying BDD operators to the results of the operator arguments.
+    Results are memoized by expression node id,
+    so every shared sub-expression is compiled only once.
+    """
+    st = mgr.store
+    # Register the variables in uniqid order
+    for v in expr.inputs:
+        _ = mgr.bddvar(v.names, v.indices)
+
+    results = {}
+    stack = [(expr.node, False)]
+    while stack:
+        node, expanded = stack.pop()
+        nid = node.id()
+        if nid in results:
+            continue
+        kind = node.kind()
+        if kind == exprnode.ZERO:
+            results[nid] = st.zero
+        elif kind == exprnode.ONE:
+            results[nid] = st.one
+        elif kind == exprnode.VAR:
+            results[nid] = mgr.vars[node.data()].node
+        elif kind == exprnode.COMP:
+            results[nid] = st.neg(mgr.vars[-node.data()].node)
+        elif expanded:
+            xs = [results[x.id()] for x in node.data()]
+            results[nid] = _EXPROP2BDDNODE[kind](st, xs)
+        else:
+            stack.append((node, True))
+            stack.extend((x, False) for x in node.data())
+    return results[expr.node.id()]
+
+
+def _fold(st, op, xs, init):
+    """Fold a binary operator over a sequence of nodes.
+
+    Operands are applied from the bottom of the variable order to the top,
+    so every operand is usually above the result so far,
+    and each ITE only needs to visit the top of the result.
+    """
+    levels = st.levels
+    xs = sorted(xs, key=lambda x: levels[st.root(x)], reverse=True)
+    return functools.reduce(op, xs, init)
+
+
+def _and(st, xs):
+    """Return the conjunction of a sequence of nodes."""
+    return _fold(st, lambda f, g: _ite(st, g, f, st.zero), xs, st.one)
+
+
+def _or(st, xs):
+    """Return the disjunction of a sequence of nodes."""
+    return _fold(st, lambda f, g: _ite(st, g, st.one, f), xs, st.zero)
+
+
+def _xor(st, xs):
+    """Return the exclusive OR of a sequence of nodes."""
+    return _fold(st, lambda f, g: _ite(st, g, st.neg(f), f), xs, st.zero)
+
 
-        # Register this variable
-        _ = bddvar(top.names, top.indices)
+_EXPROP2BDDNODE = {
+    exprnode.OP_OR: _or,
+    exprnode.OP_AND: _and,
+    exprnode.OP_XOR: _xor,
+    exprnode.OP_EQ: lambda st, xs: _ite(
+        st, _and(st, xs), st.one, _and(st, [st.neg(x) for x in xs])),
 
-        root = top.uniqid
-        lo = _expr2bddnode(expr.restrict({top: 0}))
-        hi = _expr2bddnode(expr.restrict({top: 1}))
-        return _bddnode(root, lo, hi)
+    exprnode.OP_NOT: lambda st, xs: st.neg(xs[0]),
+    exprnode.OP_IMPL: lambda st, xs: _ite(st, xs[0], xs[1], st.one),
+    exprnode.OP_ITE: lambda st, xs: _ite(st, *xs),
+}
 
 
 def expr2bdd(expr):
     """Convert an expression into a binary decision diagram."""
-    return _bdd(_expr2bddnode(expr))
+    return _MANAGER.expr2bdd(expr)
 
 
-def bdd2expr(bdd, conj=False):
+@_timed("bdd2expr")
+def bdd2expr(bdd, conj=False, isop=False):
     """Convert a binary decision diagram into an expression.
 
     This function will always return an expression in two-level form.
     If *conj* is ``False``, return a sum of products (SOP).
     Otherwise, return a product of sums (POS).
 
+    By default, there is one term for every path to the one (SOP),
+    or zero (POS) node.
+    If *isop* is ``True``,
+    return an irredundant cover computed by the Minato-Morreale algorithm,
+    which is usually much smaller.
+    No term of an irredundant SOP implies another,
+    and no literal can be removed from a term.
+
     For example::
 
        >>> a, b = map(bddvar, "ab")
        >>> bdd2expr(~a | b)
        Or(~a, And(a, b))
+       >>> bdd2expr(~a | b, isop=True)
+       Or(~a, b)
     """
+    mgr = bdd.manager
+    st = mgr.store
+    if isop:
+        # The POS of f is the complement of the SOP of f'
+        node = st.neg(bdd.node) if conj else bdd.node
+        cover, _ = _isop(st, node, node)
+        exprvars = {}
+        terms = []
+        for cube in cover:
+            lits = []
+            for root, val in cube:
+                try:
+                    x = exprvars[root]
+                except KeyError:
+                    v = mgr.vars[root]
+                    x = exprvars[root] = exprvar(v.names, v.indices)
+                lits.append(x if val != conj else ~x)
+            terms.append(lits)
+        outer, inner = (And, Or) if conj else (Or, And)
+        return outer(*[inner(*lits) for lits in terms])
     if conj:
         outer, inner = (And, Or)
-        paths = _iter_all_paths(bdd.node, BDDNODEZERO)
+        paths = _iter_all_paths(st, bdd.node, st.zero)
     else:
         outer, inner = (Or, And)
-        paths = _iter_all_paths(bdd.node, BDDNODEONE)
+        paths = _iter_all_paths(st, bdd.node, st.one)
     terms = []
     for path in paths:
         expr_point = {exprvar(v.names, v.indices): val
-                      for v, val in _path2point(path).items()}
+                      for v, val in _path2point(mgr, path).items()}
         terms.append(boolfunc.point2term(expr_point, conj))
     return outer(*[inner(*term) for term in terms])
 
@@ -169,14 +1190,10 @@ def upoint2bddpoint(upoint):
        For definitions of points and untyped points,
        see the :mod:`pyeda.boolalg.boolfunc` module.
     """
-    point = {}
-    for uniqid in upoint[0]:
-        point[_VARS[uniqid]] = 0
-    for uniqid in upoint[1]:
-        point[_VARS[uniqid]] = 1
-    return point
+    return _MANAGER.upoint2bddpoint(upoint)
 
 
+@_timed("ite")
 def ite(f, g, h):
     r"""BDD if-then-else (ITE) operator
 
@@ -190,35 +1207,378 @@ def ite(f, g, h):
     * DNF form: ``f & g | ~f & h``
     * CNF form: ``(~f | g) & (f | h)``
     """
-    f, g, h = map(BinaryDecisionDiagram.box, (f, g, h))
-    return _bdd(_ite(f.node, g.node, h.node))
+    mgr = _manager(f, g, h)
+    f, g, h = map(mgr.box, (f, g, h))
+    return mgr._bdd(_ite(mgr.store, f.node, g.node, h.node))
+
+
+@_timed("and_exists")
+def and_exists(f, g, vs):
+    r"""BDD relational product operator
+
+    The *f* and *g* arguments are BDDs,
+    and *vs* is a sequence of variables.
 
+    Return :math:`\exists \{x_1, x_2, \dots\} \: f \cdot g`,
+    without constructing the conjunction :math:`f \cdot g`.
 
-def _bddnode(root, lo, hi):
-    """Return a unique BDD node."""
-    if lo is hi:
-        node = lo
+    For example::
+
+       >>> a, b, c = map(bddvar, "abc")
+       >>> and_exists(a | b, ~a | c, [a]) is b | c
+       True
+    """
+    # pylint: disable=protected-access
+    vs = boolfunc.Function._expect_vars(vs)
+    # The variables only choose the manager if f and g do not
+    if any(isinstance(arg, BinaryDecisionDiagram) for arg in (f, g)):
+        mgr = _manager(f, g)
     else:
-        key = (root, lo, hi)
+        mgr = _manager(*vs)
+    f, g = map(mgr.box, (f, g))
+    vset = _uniqids(mgr, vs)
+    return mgr._bdd(_and_exists(mgr.store, f.node, g.node, vset))
+
+
+@_timed("constrain")
+def constrain(f, c):
+    r"""BDD generalized cofactor operator
+
+    The *f* and *c* arguments are BDDs.
+
+    Return the Coudert-Madre generalized cofactor of *f* w.r.t. *c*,
+    a function that is equal to *f* wherever *c* is one.
+    It maps every point where *c* is zero to the nearest point where *c* is
+    one, so :math:`constrain(f, c) \cdot c = f \cdot c`,
+    and the result does not depend on variables where *c* is a cube
+    of literals.
+
+    For example::
+
+       >>> a, b, c = map(bddvar, "abc")
+       >>> constrain(a & b | c, a) is b | c
+       True
+    """
+    mgr = _manager(f, c)
+    f, c = map(mgr.box, (f, c))
+    return mgr._bdd(_constrain(mgr.store, f.node, c.node))
+
+
+@_timed("simplify")
+def simplify_with_dont_cares(f, care):
+    """Simplify a BDD using a care set.
+
+    The *f* and *care* arguments are BDDs.
+
+    Return a function that is equal to *f* wherever *care* is one,
+    and is usually smaller than *f*.
+    This is the Coudert-Madre *restrict* operator.
+    Unlike :func:`constrain`,
+    the result never depends on a variable that *f* does not depend on.
+
+    For example::
+
+       >>> a, b, c = map(bddvar, "abc")
+       >>> f = a & b | ~a & c
+       >>> simplify_with_dont_cares(f, b & c)
+       1
+       >>> simplify_with_dont_cares(f, a & b | ~a & ~c) is a
+       True
+    """
+    mgr = _manager(f, care)
+    f, care = map(mgr.box, (f, care))
+    return mgr._bdd(_simplify(mgr.store, f.node, care.node))
+
+
+@_timed("dump")
+def dump(bdds, file):
+    """Write a sequence of BDDs to a binary file.
+
+    The *file* argument is a file object opened in binary mode.
+
+    All BDDs are stored together,
+    so nodes that are shared by several BDDs are written only once.
+    The file format is (all integers are unsigned 32-bit, little-endian):
+
+    * The magic bytes ``PYEDABDD``, and the format version.
+    * The number of variables, and for each variable,
+      its names and indices, from the top of the order to the bottom.
+      Names are UTF-8 strings, prefixed by their length.
+    * The number of nodes, and for each node,
+      its variable number, ``lo`` edge, and ``hi`` edge.
+      Nodes are numbered from one, and children precede their parents.
+      Edge ``2 * n`` refers to node *n*,
+      and edge ``2 * n + 1`` refers to its inverse.
+      Edges zero and one refer to the one and zero terminals.
+    * The number of BDDs, and the edge of each BDD.
+
+    Use :func:`load` to read the BDDs.
+    """
+    bdds = list(bdds)
+    mgr = _manager(*bdds)
+    st = mgr.store
+    bdds = [mgr.box(bdd) for bdd in bdds]
+    visited = set()
+    nodes = []
+    ids = {st.one: 0}
+    for bdd in bdds:
+        for edge in _dfs_postorder(st, st.regular(bdd.node), visited):
+            node = st.regular(edge)
+            if node not in ids:
+                ids[node] = len(nodes) + 1
+                nodes.append(node)
+
+    def encode(edge):
+        return ids[st.regular(edge)] << 1 | st.is_comp(edge)
+
+    levels = st.levels
+    roots = sorted({st.root(node) for node in nodes}, key=levels.get)
+    vnums = {root: i for i, root in enumerate(roots)}
+
+    file.write(_MAGIC)
+    file.write(_UINT.pack(_VERSION))
+    file.write(_UINT.pack(len(roots)))
+    for root in roots:
+        v = mgr.vars[root]
+        file.write(_UINT.pack(len(v.names)))
+        for name in v.names:
+            data = name.encode("utf-8")
+            file.write(_UINT.pack(len(data)))
+            file.write(data)
+        file.write(_UINT.pack(len(v.indices)))
+        for index in v.indices:
+            file.write(_UINT.pack(index))
+    file.write(_UINT.pack(len(nodes)))
+    for node in nodes:
+        lo, hi = st.children(node)
+        file.write(_NODE.pack(vnums[st.root(node)], encode(lo), encode(hi)))
+    file.write(_UINT.pack(len(bdds)))
+    for bdd in bdds:
+        file.write(_UINT.pack(encode(bdd.node)))
+
+
+def load(file):
+    """Read a list of BDDs from a binary file written by :func:`dump`.
+
+    The *file* argument is a file object opened in binary mode.
+
+    Nodes are read in chunks, and inserted into the unique table in one pass.
+    If the variable order of the file does not agree with the current
+    variable order, nodes are rebuilt with ITE instead.
+    """
+    return _MANAGER.load(file)
+
+
+def _load(mgr, file):
+    """Read a list of BDDs of manager *mgr* from a binary file."""
+    st = mgr.store
+    if _read(file, len(_MAGIC)) != _MAGIC:
+        raise ValueError("expected a BDD file")
+    version = _read_uint(file)
+    if version != _VERSION:
+        fstr = "expected BDD file format version {}, got {}"
+        raise ValueError(fstr.format(_VERSION, version))
+
+    roots = []
+    for _ in range(_read_uint(file)):
+        names = tuple(_read(file, _read_uint(file)).decode("utf-8")
+                      for _ in range(_read_uint(file)))
+        indices = tuple(_read_uint(file) for _ in range(_read_uint(file)))
+        roots.append(mgr.bddvar(names, indices).uniqid)
+    levels = [st.levels[root] for root in roots]
+    ordered = all(levels[i] < levels[i+1] for i in range(len(levels) - 1))
+
+    nodes = [st.one]
+
+    def decode(edge):
         try:
-            node = _NODES[key]
-        except KeyError:
-            node = _NODES[key] = BDDNode(*key)
-    return node
+            node = nodes[edge >> 1]
+        except IndexError as exc:
+            fstr = "expected child nodes to precede their parents"
+            raise ValueError(fstr) from exc
+        return st.neg(node) if edge & 1 else node
+
+    num = _read_uint(file)
+    while num:
+        size = min(num, _LOAD_CHUNK)
+        for vnum, lo, hi in _NODE.iter_unpack(_read(file, size * _NODE.size)):
+            try:
+                root = roots[vnum]
+            except IndexError as exc:
+                fstr = "expected variable number < {}, got {}"
+                raise ValueError(fstr.format(len(roots), vnum)) from exc
+            lo, hi = decode(lo), decode(hi)
+            if ordered:
+                nodes.append(st.mk(root, lo, hi))
+            else:
+                vnode = st.mk(root, st.zero, st.one)
+                nodes.append(_ite(st, vnode, hi, lo))
+        num -= size
 
+    # Decode every root before any of them can trigger a collection
+    edges = [decode(_read_uint(file)) for _ in range(_read_uint(file))]
+    return mgr._bdds(edges)
+
+
+def _read(file, size):
+    """Read exactly *size* bytes from a file."""
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("unexpected end of BDD file")
+    return data
+
+
+def _read_uint(file):
+    """Read an unsigned 32-bit integer from a file."""
+    return _UINT.unpack(_read(file, _UINT.size))[0]
+
+
+def cache_info():
+    """Return computed table statistics.
+
+    The return value is a named tuple with fields
+    ``hits``, ``misses``, ``maxsize``, and ``currsize``.
+
+    The computed table memoizes the results of ITE, restrict, compose,
+    and quantification operations across calls.
+    """
+    return _MANAGER.cache_info()
 
-def _bdd(node):
-    """Return a unique BDD."""
-    try:
-        bdd = _BDDS[node]
-    except KeyError:
-        bdd = _BDDS[node] = BinaryDecisionDiagram(node)
-    return bdd
 
+def cache_clear():
+    """Clear the computed table, and reset its statistics."""
+    _MANAGER.cache_clear()
 
-def _path2point(path):
+
+def set_cache_size(maxsize):
+    """Set the maximum number of entries in the computed table.
+
+    When the table is full, the least recently used entry is evicted.
+    """
+    _MANAGER.set_cache_size(maxsize)
+
+
+def stats():
+    """Return node store and operation statistics.
+
+    The return value is a named tuple with fields:
+
+    ``nodes``
+       The number of live nodes in the unique table.
+
+    ``peak_nodes``
+       The largest number of live nodes seen after an operation.
+
+    ``load_factor``
+       The fraction of unique table slots in use by the array store,
+       or None for the object store.
+
+    ``cache``
+       The computed table statistics returned by :func:`cache_info`.
+
+    ``ops``
+       A dict that maps operation names, such as ``"and"`` or ``"ite"``,
+       to named tuples with fields ``calls`` and ``time``.
+       The time is the cumulative wall clock time in seconds,
+       including the time of nested operations.
+    """
+    return _MANAGER.stats()
+
+
+def stats_clear():
+    """Reset the peak node count, and the operation statistics.
+
+    Use :func:`cache_clear` to reset the computed table statistics.
+    """
+    _MANAGER.stats_clear()
+
+
+def add_node_callback(threshold, callback):
+    """Call a function when the number of nodes grows past a threshold.
+
+    The node count is checked after every operation.
+    When it is greater than *threshold*,
+    *callback* is called with the node count as its only argument.
+    It is not called again until the count has dropped to *threshold*.
+
+    For example, to abort runaway jobs:
+
+    >>> def abort(nodes):
+    ...     raise MemoryError(f"too many BDD nodes: {nodes}")
+    >>> add_node_callback(10_000_000, abort)
+    >>> remove_node_callback(abort)
+    """
+    _MANAGER.add_node_callback(threshold, callback)
+
+
+def remove_node_callback(callback):
+    """Remove all node count callbacks of a function."""
+    _MANAGER.remove_node_callback(callback)
+
+
+def reorder(method="sift"):
+    """Reorder the BDD variables to reduce the total number of nodes.
+
+    The *method* argument is one of:
+
+    ``"sift"`` (default)
+       Rudell's sifting algorithm.
+       Each variable, starting with the one that labels the most nodes,
+       is moved through every level,
+       and left at the level where the total number of nodes is smallest.
+
+    ``"window2"``, ``"window3"``
+       Window permutation.
+       For each window of two or three adjacent levels,
+       try all permutations, and keep the best one.
+
+    Variables are moved by swapping adjacent levels in place,
+    so existing BDDs remain valid.
+    However, BDD nodes of the old order,
+    such as those returned by :meth:`BinaryDecisionDiagram.dfs_preorder`,
+    are not valid anymore.
+    Do not reorder while iterating through the nodes, points,
+    or paths of a BDD.
+    """
+    _MANAGER.reorder(method)
+
+
+def set_reorder_threshold(threshold):
+    """Enable/disable automatic variable reordering.
+
+    If *threshold* is an int,
+    sift the variables whenever the number of nodes grows past it.
+    After every automatic reordering,
+    the next one is postponed until the number of nodes doubles.
+    If *threshold* is None (default), disable automatic reordering.
+    """
+    _MANAGER.set_reorder_threshold(threshold)
+
+
+def var_order():
+    """Return a tuple of all BDD variables, from the top level to the bottom.
+    """
+    return _MANAGER.var_order()
+
+
+def _uniqids(mgr, vs):
+    """Return the frozenset of uniqids of a sequence of variables.
+
+    BDD variables must belong to manager *mgr*.
+    """
+    uniqids = set()
+    # pylint: disable=protected-access
+    for v in boolfunc.Function._expect_vars(vs):
+        if isinstance(v, BinaryDecisionDiagram) and v.manager is not mgr:
+            raise ValueError("expected BDDs of the same manager")
+        uniqids.add(v.uniqid)
+    return frozenset(uniqids)
+
+
+def _path2point(mgr, path):
     """Convert a BDD path to a BDD point."""
-    return {_VARS[node.root]: int(node.hi is path[i+1])
+    st = mgr.store
+    return {mgr.vars[st.root(node)]: int(st.children(node)[1] == path[i+1])
             for i, node in enumerate(path[:-1])}
 
 
@@ -228,8 +1588,9 @@ class BinaryDecisionDiagram(boolfunc.Function):
     .. seealso::
        This is a subclass of :class:`pyeda.boolalg.boolfunc.Function`
 
-    BDDs have a single attribute, ``node``,
-    that points to a node in the managed unique table.
+    BDDs have two attributes:
+    ``manager`` is the :class:`BDDManager` that owns the BDD,
+    and ``node`` points to a node in the manager's unique table.
 
     There are two ways to construct a BDD:
 
@@ -252,37 +1613,56 @@ class BinaryDecisionDiagram(boolfunc.Function):
     and you will not be able to use the Python ``is`` operator to establish
     formal equivalence with manually constructed BDDs.
     """
-    def __init__(self, node):
+    def __init__(self, manager, node):
+        self.manager = manager
         self.node = node
 
     # Operators
     def __invert__(self):
-        return _bdd(_neg(self.node))
+        mgr = self.manager
+        st = mgr.store
+        return mgr._bdd(st.neg(self.node))
 
+    @_timed("or")
     def __or__(self, other):
-        other_node = self.box(other).node
+        mgr = self.manager
+        st = mgr.store
+        other_node = mgr.box(other).node
         # f | g <=> ITE(f, 1, g)
-        return _bdd(_ite(self.node, BDDNODEONE, other_node))
+        return mgr._bdd(_ite(st, self.node, st.one, other_node))
 
+    @_timed("and")
     def __and__(self, other):
-        other_node = self.box(other).node
+        mgr = self.manager
+        st = mgr.store
+        other_node = mgr.box(other).node
         # f & g <=> ITE(f, g, 0)
-        return _bdd(_ite(self.node, other_node, BDDNODEZERO))
+        return mgr._bdd(_ite(st, self.node, other_node, st.zero))
 
+    @_timed("xor")
     def __xor__(self, other):
-        other_node = self.box(other).node
+        mgr = self.manager
+        st = mgr.store
+        other_node = mgr.box(other).node
         # f ^ g <=> ITE(f, g', g)
-        return _bdd(_ite(self.node, _neg(other_node), other_node))
+        return mgr._bdd(_ite(st, self.node, st.neg(other_node),
+                             other_node))
 
+    @_timed("implies")
     def __rshift__(self, other):
-        other_node = self.box(other).node
+        mgr = self.manager
+        st = mgr.store
+        other_node = mgr.box(other).node
         # f => g <=> ITE(f', 1, g)
-        return _bdd(_ite(_neg(self.node), BDDNODEONE, other_node))
+        return mgr._bdd(_ite(st, st.neg(self.node), st.one, other_node))
 
+    @_timed("implies")
     def __rrshift__(self, other):
-        other_node = self.box(other).node
+        mgr = self.manager
+        st = mgr.store
+        other_node = mgr.box(other).node
         # f => g <=> ITE(f', 1, g)
-        return _bdd(_ite(_neg(other_node), BDDNODEONE, self.node))
+        return mgr._bdd(_ite(st, st.neg(other_node), st.one, self.node))
 
     # From Function
     @cached_property
@@ -291,65 +1671,219 @@ class BinaryDecisionDiagram(boolfunc.Function):
 
     @cached_property
     def inputs(self):
+        mgr = self.manager
+        st = mgr.store
         inputs_ = []
-        for node in self.dfs_postorder():
-            if node.root > 0:
-                v = _VARS[node.root]
+        for node in _dfs_postorder(st, self.node, set()):
+            root = st.root(node)
+            if root > 0:
+                v = mgr.vars[root]
                 if v not in inputs_:
                     inputs_.append(v)
         return tuple(reversed(inputs_))
 
+    @_timed("restrict")
     def restrict(self, point):
-        npoint = {v.node.root: self.box(val).node for v, val in point.items()}
-        return _bdd(_restrict(self.node, npoint))
+        mgr = self.manager
+        st = mgr.store
+        npoint = {v.uniqid: mgr.box(val).node for v, val in point.items()}
+        return mgr._bdd(_restrict(st, self.node, npoint,
+                                  frozenset(npoint.items())))
 
+    @_timed("compose")
     def compose(self, mapping):
-        node = self.node
-        for v, g in mapping.items():
-            fv0, fv1 = _bdd(node).cofactors(v)
-            node = _ite(g.node, fv1.node, fv0.node)
-        return _bdd(node)
+        """Substitute all variables in *mapping* simultaneously.
+
+        The result is computed in one memoized pass over the BDD,
+        regardless of the number of substituted variables.
+        """
+        mgr = self.manager
+        st = mgr.store
+        nmap = {v.uniqid: mgr.box(g).node for v, g in mapping.items()}
+        return mgr._bdd(_compose(st, self.node, nmap))
 
     def satisfy_one(self):
-        path = _find_path(self.node, BDDNODEONE)
+        mgr = self.manager
+        st = mgr.store
+        path = _find_path(st, self.node, st.one)
         if path is None:
             return None
         else:
-            return _path2point(path)
+            return _path2point(mgr, path)
 
     def satisfy_all(self):
-        for path in _iter_all_paths(self.node, BDDNODEONE):
-            yield _path2point(path)
+        """Iterate through all satisfying input points.
+
+        Unlike other function types, a BDD yields one partial point per path
+        to the one node, and leaves out the variables that path skips.
+        See :meth:`satisfy_cubes`.
+        """
+        mgr = self.manager
+        st = mgr.store
+        for path in _iter_all_paths(st, self.node, st.one):
+            yield _path2point(mgr, path)
+
+    def satisfy_cubes(self):
+        """Iterate through all satisfying cubes.
+
+        A cube is a partial point,
+        and every variable that is not in the cube is a don't-care.
+        There is one cube for every path to the one node,
+        so the cubes are disjoint, and they are never expanded into points.
+        This is what :meth:`satisfy_all` already yields,
+        under a name that says so.
+
+        For example::
+
+           >>> a, b, c = map(bddvar, "abc")
+           >>> list((a | b & c).satisfy_cubes())
+           [{a: 0, b: 1, c: 1}, {a: 1}]
+        """
+        return self.satisfy_all()
+
+    def satisfy_random(self, rng=None):
+        """Iterate through satisfying input points, chosen uniformly at
+        random.
+
+        The *rng* argument is a :class:`random.Random` instance.
+        By default, use the functions of the :mod:`random` module.
+
+        The number of satisfying points below every node is computed once,
+        and then every point takes time linear in the number of support
+        variables.
+        The iterator is infinite, unless the function is zero.
+        Use :func:`itertools.islice` to take a number of points:
+
+        >>> import itertools
+        >>> a, b = map(bddvar, "ab")
+        >>> points = list(itertools.islice((a | b).satisfy_random(), 4))
+        >>> all((a | b).restrict(point) is BDDONE for point in points)
+        True
+        """
+        st = self.manager.store
+        return _iter_random_points(st, self.node, self._level_inputs(),
+                                   random if rng is None else rng)
+
+    @_timed("satisfy_count")
+    def satisfy_count(self):
+        """Return the cardinality of the set of all satisfying input points.
+
+        The count is computed in one bottom-up pass over the nodes,
+        so it takes time linear in the size of the BDD,
+        instead of the number of points.
+        """
+        st = self.manager.store
+        vs = self._level_inputs()
+        ranks = {v.uniqid: i for i, v in enumerate(vs)}
+        return _satisfy_count(st, self.node, ranks, len(vs))
+
+    @_timed("weighted_count")
+    def weighted_count(self, weights):
+        """Return the weighted count of all satisfying input points.
+
+        The weight of a point is the product of the weights of its variable
+        assignments,
+        and the weighted count is the sum of the weights of all satisfying
+        points.
+
+        The *weights* argument maps support variables to either a
+        ``(w0, w1)`` pair of weights for the values zero and one,
+        or a single number ``p``, which means ``(1 - p, p)``.
+        Variables that are not in *weights* have weights ``(1, 1)``.
+
+        If every variable is mapped to the probability that it is one,
+        the result is the probability that the function is one:
+
+        >>> a, b, c = map(bddvar, "abc")
+        >>> (a & b | c).weighted_count({a: 0.5, b: 0.5, c: 0.5})
+        0.625
+        """
+        st = self.manager.store
+        vs = self._level_inputs()
+        ranks = {v.uniqid: i for i, v in enumerate(vs)}
+        pairs = []
+        for v in vs:
+            w = weights.get(v, (1, 1))
+            pairs.append(w if isinstance(w, tuple) else (1 - w, w))
+        return _weighted_count(st, self.node, ranks, pairs)
+
+    def smoothing(self, vs=None):
+        return self.exists(vs)
+
+    def consensus(self, vs=None):
+        return self.forall(vs)
 
     def is_zero(self):
-        return self.node is BDDNODEZERO
+        st = self.manager.store
+        return self.node == st.zero
 
     def is_one(self):
-        return self.node is BDDNODEONE
+        st = self.manager.store
+        return self.node == st.one
 
     @staticmethod
     def box(obj):
         if isinstance(obj, BinaryDecisionDiagram):
             return obj
-        elif obj in (0, "0"):
-            return BDDZERO
-        elif obj in (1, "1"):
-            return BDDONE
         else:
-            return BDDONE if bool(obj) else BDDZERO
+            return _MANAGER.box(obj)
 
     # Specific to BinaryDecisionDiagram
+    @_timed("exists")
+    def exists(self, vs):
+        r"""Return the existential quantification of this function over
+        a sequence of variables.
+
+        :math:`\exists \{x_1, x_2, \dots\} \: f`
+
+        This is the same as :meth:`smoothing`,
+        but it is computed in one pass over the BDD,
+        instead of enumerating all cofactors.
+        """
+        mgr = self.manager
+        st = mgr.store
+        return mgr._bdd(_exists(st, self.node, _uniqids(mgr, vs)))
+
+    @_timed("forall")
+    def forall(self, vs):
+        r"""Return the universal quantification of this function over
+        a sequence of variables.
+
+        :math:`\forall \{x_1, x_2, \dots\} \: f`
+
+        This is the same as :meth:`consensus`,
+        but it is computed in one pass over the BDD,
+        instead of enumerating all cofactors.
+        """
+        mgr = self.manager
+        st = mgr.store
+        # forall x. f = (exists x. f')'
+        node = _exists(st, st.neg(self.node), _uniqids(mgr, vs))
+        return mgr._bdd(st.neg(node))
+
+    def _level_inputs(self):
+        """Return the support variables, from the top level to the bottom."""
+        st = self.manager.store
+        levels = st.levels
+        return sorted(self.support, key=lambda v: levels[v.uniqid])
+
     def dfs_preorder(self):
         """Iterate through nodes in depth first search (DFS) pre-order."""
-        yield from _dfs_preorder(self.node, set())
+        st = self.manager.store
+        for node in _dfs_preorder(st, self.node, set()):
+            yield st.view(node)
 
     def dfs_postorder(self):
         """Iterate through nodes in depth first search (DFS) post-order."""
-        yield from _dfs_postorder(self.node, set())
+        st = self.manager.store
+        for node in _dfs_postorder(st, self.node, set()):
+            yield st.view(node)
 
     def bfs(self):
         """Iterate through nodes in breadth first search (BFS) order."""
-        yield from _bfs(self.node, set())
+        st = self.manager.store
+        for node in _bfs(st, self.node, set()):
+            yield st.view(node)
 
     def equivalent(self, other):
         """Return whether this BDD is equivalent to *other*.
@@ -364,8 +1898,9 @@ class BinaryDecisionDiagram(boolfunc.Function):
            >>> f1 is f2
            True
         """
-        other = self.box(other)
-        return self.node is other.node
+        mgr = self.manager
+        other = mgr.box(other)
+        return self.node == other.node
 
     def to_dot(self, name="BDD"):  # pragma: no cover
         """Convert to DOT language representation.
@@ -374,18 +1909,20 @@ class BinaryDecisionDiagram(boolfunc.Function):
         `DOT language reference <http://www.graphviz.org/content/dot-language>`_
         for details.
         """
+        mgr = self.manager
+        nodes = list(self.dfs_postorder())
         parts = ["graph", name, "{"]
-        for node in self.dfs_postorder():
-            if node is BDDNODEZERO:
+        for node in nodes:
+            if node.root == -1:
                 parts += ["n" + str(id(node)), "[label=0,shape=box];"]
-            elif node is BDDNODEONE:
+            elif node.root == -2:
                 parts += ["n" + str(id(node)), "[label=1,shape=box];"]
             else:
-                v = _VARS[node.root]
+                v = mgr.vars[node.root]
                 parts.append("n" + str(id(node)))
                 parts.append(f"[label=\"{v}\",shape=circle];")
-        for node in self.dfs_postorder():
-            if node is not BDDNODEZERO and node is not BDDNODEONE:
+        for node in nodes:
+            if node.root > 0:
                 parts += ["n" + str(id(node)), "--",
                           "n" + str(id(node.lo)),
                           "[label=0,style=dashed];"]
@@ -406,8 +1943,8 @@ class BDDConstant(BinaryDecisionDiagram):
     BDD instances are managed internally,
     and the BDD zero/one instances are singletons.
     """
-    def __init__(self, node, value):
-        super().__init__(node)
+    def __init__(self, manager, node, value):
+        super().__init__(manager, node)
         self.value = value
 
     def __bool__(self):
@@ -423,10 +1960,6 @@ class BDDConstant(BinaryDecisionDiagram):
         return str(self.value)
 
 
-BDDZERO = _BDDS[BDDNODEZERO] = BDDConstant(BDDNODEZERO, 0)
-BDDONE = _BDDS[BDDNODEONE] = BDDConstant(BDDNODEONE, 1)
-
-
 class BDDVariable(boolfunc.Variable, BinaryDecisionDiagram):
     """Binary decision diagram variable
 
@@ -436,136 +1969,854 @@ class BDDVariable(boolfunc.Variable, BinaryDecisionDiagram):
     Do **NOT** create a BDD using the ``BDDVariable`` constructor.
     Use the :func:`bddvar` function instead.
     """
-    def __init__(self, bvar):
+    def __init__(self, manager, bvar):
         boolfunc.Variable.__init__(self, bvar.names, bvar.indices)
-        node = _bddnode(bvar.uniqid, BDDNODEZERO, BDDNODEONE)
-        BinaryDecisionDiagram.__init__(self, node)
+        st = manager.store
+        node = st.mk(bvar.uniqid, st.zero, st.one)
+        BinaryDecisionDiagram.__init__(self, manager, node)
 
 
-def _neg(node):
-    """Return the inverse of *node*."""
-    if node is BDDNODEZERO:
-        return BDDNODEONE
-    elif node is BDDNODEONE:
-        return BDDNODEZERO
-    else:
-        return _bddnode(node.root, _neg(node.lo), _neg(node.hi))
+_MANAGER = BDDManager()
+
+# default manager node store
+_STORE = _MANAGER.store
+
+BDDZERO = _MANAGER.zero
+BDDONE = _MANAGER.one
+
+
+class _Split:
+    """One recursive step of a BDD operation
+
+    A step splits a problem into zero/one cofactor sub-problems
+    w.r.t. the variable ``root``.
+    The ``lo`` and ``hi`` attributes are the operand tuples of the
+    sub-problems.
+    If ``hi`` is None, the result of the ``lo`` sub-problem is forwarded.
+
+    If ``key`` is not None, the result is stored in the computed table.
+    If ``neg`` is True, the result is complemented.
+    """
+    __slots__ = ("key", "neg", "root", "lo", "hi")
+
+    def __init__(self, key, neg, root, lo, hi):
+        self.key = key
+        self.neg = neg
+        self.root = root
+        self.lo = lo
+        self.hi = hi
 
 
-def _ite(f, g, h):
+def _apply(st, step, combine, args):
+    """Apply a recursive BDD operation using an explicit stack.
+
+    The *step* function takes the node store *st*, and the operands in *args*,
+    and returns either a result, or a :class:`_Split`.
+    The *combine* function takes a ``root``,
+    and the ``lo`` and ``hi`` results of a split,
+    and returns its result.
+    """
+    cache = st.cache
+    results = []
+    stack = [args]
+    while stack:
+        frame = stack.pop()
+        if type(frame) is _Split:
+            if frame.hi is None:
+                ret = results.pop()
+            else:
+                hi = results.pop()
+                lo = results.pop()
+                ret = combine(frame.root, lo, hi)
+            if frame.key is not None:
+                cache.put(frame.key, ret)
+            results.append(st.neg(ret) if frame.neg else ret)
+        else:
+            ret = step(st, *frame)
+            if type(ret) is _Split:
+                stack.append(ret)
+                if ret.hi is not None:
+                    stack.append(ret.hi)
+                stack.append(ret.lo)
+            else:
+                results.append(ret)
+    return results.pop()
+
+
+def _ite(st, f, g, h):
     """Return node that results from recursively applying ITE(f, g, h)."""
+    return _apply(st, _ite_step, st.mk, (f, g, h))
+
+
+def _ite_step(st, f, g, h):
+    """Return the result of ITE(f, g, h), or split it on the top variable."""
+    zero, one = st.zero, st.one
     # ITE(f, 1, 0) = f
-    if g is BDDNODEONE and h is BDDNODEZERO:
+    if g == one and h == zero:
         return f
     # ITE(f, 0, 1) = f'
-    elif g is BDDNODEZERO and h is BDDNODEONE:
-        return _neg(f)
+    elif g == zero and h == one:
+        return st.neg(f)
     # ITE(1, g, h) = g
-    elif f is BDDNODEONE:
+    elif f == one:
         return g
     # ITE(0, g, h) = h
-    elif f is BDDNODEZERO:
+    elif f == zero:
         return h
     # ITE(f, g, g) = g
-    elif g is h:
+    elif g == h:
         return g
-    else:
-        # ITE(f, g, h) = ITE(x, ITE(fx', gx', hx'), ITE(fx, gx, hx))
-        root = min(node.root for node in (f, g, h) if node.root > 0)
-        npoint0 = {root: BDDNODEZERO}
-        npoint1 = {root: BDDNODEONE}
-        fv0, gv0, hv0 = [_restrict(node, npoint0) for node in (f, g, h)]
-        fv1, gv1, hv1 = [_restrict(node, npoint1) for node in (f, g, h)]
-        return _bddnode(root, _ite(fv0, gv0, hv0), _ite(fv1, gv1, hv1))
-
-
-def _restrict(node, npoint, cache=None):
-    """Restrict a subset of support variables to {0, 1}."""
-    if node is BDDNODEZERO or node is BDDNODEONE:
-        return node
 
-    if cache is None:
-        cache = {}
+    # ITE(f', g, h) = ITE(f, h, g)
+    if st.is_comp(f):
+        f, g, h = st.neg(f), h, g
+    # ITE(f, f, h) = ITE(f, 1, h), ITE(f, f', h) = ITE(f, 0, h)
+    nf = st.neg(f)
+    if g == f:
+        g = one
+    elif g == nf:
+        g = zero
+    # ITE(f, g, f) = ITE(f, g, 0), ITE(f, g, f') = ITE(f, g, 1)
+    if h == f:
+        h = zero
+    elif h == nf:
+        h = one
+    if g == h:
+        return g
+    elif g == one and h == zero:
+        return f
+    elif g == zero and h == one:
+        return nf
+
+    # ITE(f, g', h) = ITE(f, g, h')'
+    neg = st.is_comp(g)
+    if neg:
+        g, h = st.neg(g), st.neg(h)
+
+    key = ("ite", f, g, h)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return st.neg(ret) if neg else ret
+
+    # ITE(f, g, h) = ITE(x, ITE(fx', gx', hx'), ITE(fx, gx, hx))
+    levels = st.levels
+    root = st.order[min(levels[st.root(f)], levels[st.root(g)],
+                        levels[st.root(h)])]
+    fv0, fv1 = st.cofactors(f, root)
+    gv0, gv1 = st.cofactors(g, root)
+    hv0, hv1 = st.cofactors(h, root)
+    return _Split(key, neg, root, (fv0, gv0, hv0), (fv1, gv1, hv1))
+
+
+def _restrict(st, node, npoint, pkey):
+    """Restrict a subset of support variables to {0, 1}.
+
+    The *pkey* argument is a hashable version of *npoint*,
+    used to memoize results in the computed table.
+    """
+    return _apply(st, _restrict_step, st.mk, (node, npoint, pkey))
+
 
+def _restrict_step(st, node, npoint, pkey):
+    """Return the restriction of *node*, or split it on its root variable."""
+    if node == st.zero or node == st.one:
+        return node
+    # f'|x = (f|x)'
+    neg = st.is_comp(node)
+    if neg:
+        node = st.neg(node)
+
+    key = ("restrict", node, pkey)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return st.neg(ret) if neg else ret
+
+    root = st.root(node)
+    lo, hi = st.children(node)
     try:
-        ret = cache[node]
+        val = npoint[root]
     except KeyError:
+        return _Split(key, neg, root, (lo, npoint, pkey), (hi, npoint, pkey))
+    else:
+        child = hi if val == st.one else lo
+        return _Split(key, neg, None, (child, npoint, pkey), None)
+
+
+def _compose(st, node, nmap):
+    """Return the composition of *node* with the substitutions in *nmap*,
+    a dict of uniqid => node.
+    """
+    if not nmap:
+        return node
+    mkey = frozenset(nmap.items())
+    last = max(st.levels[uniqid] for uniqid in nmap)
+
+    def combine(root, lo, hi):
         try:
-            val = npoint[node.root]
+            g = nmap[root]
         except KeyError:
-            lo = _restrict(node.lo, npoint, cache)
-            hi = _restrict(node.hi, npoint, cache)
-            ret = _bddnode(node.root, lo, hi)
+            g = st.mk(root, st.zero, st.one)
+        return _ite(st, g, hi, lo)
+
+    return _apply(st, _compose_step, combine, (node, mkey, last))
+
+
+def _compose_step(st, node, mkey, last):
+    """Return the composition of *node*, or split it on its root variable.
+
+    Nodes below level *last* do not depend on the substituted variables.
+    """
+    root = st.root(node)
+    if st.levels[root] > last:
+        return node
+    # f'|x=g = (f|x=g)'
+    neg = st.is_comp(node)
+    if neg:
+        node = st.neg(node)
+
+    key = ("compose", node, mkey)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return st.neg(ret) if neg else ret
+
+    lo, hi = st.children(node)
+    return _Split(key, neg, root, (lo, mkey, last), (hi, mkey, last))
+
+
+def _exists(st, node, vset):
+    """Return the existential quantification of *node* over the variables
+    with uniqids in *vset*.
+    """
+    if not vset:
+        return node
+    last = max(st.levels[uniqid] for uniqid in vset)
+
+    def combine(root, lo, hi):
+        if root in vset:
+            return _ite(st, lo, st.one, hi)
         else:
-            child = {BDDNODEZERO: node.lo, BDDNODEONE: node.hi}[val]
-            ret = _restrict(child, npoint, cache)
-        cache[node] = ret
-    return ret
+            return st.mk(root, lo, hi)
 
+    return _apply(st, _exists_step, combine, (node, vset, last))
 
-def _find_path(start, end, path=tuple()):
-    """Return the path from start to end.
 
-    If no path exists, return None.
+def _exists_step(st, node, vset, last):
+    """Return the quantification of *node*, or split it on its root variable.
+
+    Nodes below level *last* do not depend on the quantified variables.
+    """
+    root = st.root(node)
+    if st.levels[root] > last:
+        return node
+
+    key = ("exists", node, vset)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return ret
+
+    lo, hi = st.children(node)
+    return _Split(key, False, root, (lo, vset, last), (hi, vset, last))
+
+
+def _and_exists(st, f, g, vset):
+    """Return the existential quantification of f & g over the variables
+    with uniqids in *vset*.
+    """
+    if not vset:
+        return _ite(st, f, g, st.zero)
+    last = max(st.levels[uniqid] for uniqid in vset)
+
+    def combine(root, lo, hi):
+        if root in vset:
+            return _ite(st, lo, st.one, hi)
+        else:
+            return st.mk(root, lo, hi)
+
+    return _apply(st, _and_exists_step, combine, (f, g, vset, last))
+
+
+def _and_exists_step(st, f, g, vset, last):
+    """Return the relational product of *f* and *g*,
+    or split it on the top variable.
+    """
+    zero, one = st.zero, st.one
+    if f == zero or g == zero or f == st.neg(g):
+        return zero
+    elif f == one or f == g:
+        return _exists(st, g, vset)
+    elif g == one:
+        return _exists(st, f, vset)
+
+    levels = st.levels
+    level = min(levels[st.root(f)], levels[st.root(g)])
+    if level > last:
+        return _ite(st, f, g, zero)
+
+    # f & g = g & f
+    if hash(f) > hash(g):
+        f, g = g, f
+    key = ("and_exists", f, g, vset)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return ret
+
+    root = st.order[level]
+    fv0, fv1 = st.cofactors(f, root)
+    gv0, gv1 = st.cofactors(g, root)
+    return _Split(key, False, root, (fv0, gv0, vset, last),
+                  (fv1, gv1, vset, last))
+
+
+def _constrain(st, f, c):
+    """Return the generalized cofactor of *f* w.r.t. *c*."""
+    return _apply(st, _constrain_step, st.mk, (f, c))
+
+
+def _constrain_step(st, f, c):
+    """Return the generalized cofactor of *f* w.r.t. *c*,
+    or split it on the top variable.
+    """
+    zero, one = st.zero, st.one
+    if c == zero:
+        return zero
+    elif c == one or f == zero or f == one:
+        return f
+    elif f == c:
+        return one
+    elif f == st.neg(c):
+        return zero
+
+    # constrain(f', c) = constrain(f, c)'
+    neg = st.is_comp(f)
+    if neg:
+        f = st.neg(f)
+
+    key = ("constrain", f, c)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return st.neg(ret) if neg else ret
+
+    levels = st.levels
+    root = st.order[min(levels[st.root(f)], levels[st.root(c)])]
+    fv0, fv1 = st.cofactors(f, root)
+    cv0, cv1 = st.cofactors(c, root)
+    if cv0 == zero:
+        return _Split(key, neg, None, (fv1, cv1), None)
+    elif cv1 == zero:
+        return _Split(key, neg, None, (fv0, cv0), None)
+    else:
+        return _Split(key, neg, root, (fv0, cv0), (fv1, cv1))
+
+
+def _simplify(st, f, care):
+    """Return the Coudert-Madre restrict of *f* w.r.t. *care*."""
+    return _apply(st, _simplify_step, st.mk, (f, care))
+
+
+def _simplify_step(st, f, care):
+    """Return the restrict of *f* w.r.t. *care*,
+    or split it on the top variable of *f*.
     """
-    path = path + (start, )
-    if start is end:
-        return path
+    zero, one = st.zero, st.one
+    if care == zero:
+        return zero
+    elif care == one or f == zero or f == one:
+        return f
+    elif f == care:
+        return one
+    elif f == st.neg(care):
+        return zero
+
+    # restrict(f', c) = restrict(f, c)'
+    neg = st.is_comp(f)
+    if neg:
+        f = st.neg(f)
+
+    key = ("simplify", f, care)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return st.neg(ret) if neg else ret
+
+    levels = st.levels
+    root = st.root(f)
+    # Quantify the care set variables above f
+    if levels[st.root(care)] < levels[root]:
+        cv0, cv1 = st.children(care)
+        care = _ite(st, cv0, one, cv1)
+        return _Split(key, neg, None, (f, care), None)
+    fv0, fv1 = st.children(f)
+    cv0, cv1 = st.cofactors(care, root)
+    if cv0 == zero:
+        return _Split(key, neg, None, (fv1, cv1), None)
+    elif cv1 == zero:
+        return _Split(key, neg, None, (fv0, cv0), None)
     else:
-        ret = None
-        if start.lo is not None:
-            ret = _find_path(start.lo, end, path)
-        if ret is None and start.hi is not None:
-            ret = _find_path(start.hi, end, path)
+        return _Split(key, neg, root, (fv0, cv0), (fv1, cv1))
+
+
+def _isop(st, lower, upper):
+    """Return an irredundant sum-of-products cover of an interval.
+
+    The *lower* and *upper* nodes bound an incompletely specified function.
+    Return a ``(cover, node)`` pair,
+    where *cover* is a tuple of cubes,
+    every cube is a tuple of ``(uniqid, value)`` literals,
+    and *node* is the function of the cover,
+    which is between *lower* and *upper*.
+
+    Results are memoized by ``(lower, upper)`` node pair.
+    Sub-problems are generators,
+    which yield ``(lower, upper)`` sub-problems,
+    and receive their results.
+    """
+    zero, one = st.zero, st.one
+    memo = {}
+
+    def and_(f, g):
+        return _ite(st, f, g, zero)
+
+    def or_(f, g):
+        return _ite(st, f, one, g)
+
+    def solve(lower, upper):
+        levels = st.levels
+        level = min(levels[st.root(lower)], levels[st.root(upper)])
+        root = st.order[level]
+        l0, l1 = st.cofactors(lower, root)
+        u0, u1 = st.cofactors(upper, root)
+        # Cubes that must contain x' or x
+        c0, r0 = yield (and_(l0, st.neg(u1)), u0)
+        c1, r1 = yield (and_(l1, st.neg(u0)), u1)
+        # Cubes that do not contain x
+        lower_d = or_(and_(l0, st.neg(r0)), and_(l1, st.neg(r1)))
+        cd, rd = yield (lower_d, and_(u0, u1))
+        cover = (tuple(((root, 0), ) + cube for cube in c0)
+                 + tuple(((root, 1), ) + cube for cube in c1) + cd)
+        node = or_(_ite(st, st.mk(root, zero, one), r1, r0), rd)
+        memo[lower, upper] = (cover, node)
+        return cover, node
+
+    def terminal(lower, upper):
+        """Return the result of a terminal case, or a memoized result."""
+        if lower == zero:
+            return (), zero
+        elif upper == one:
+            return ((), ), one
+        else:
+            return memo.get((lower, upper))
+
+    ret = terminal(lower, upper)
+    if ret is not None:
         return ret
+    stack = [solve(lower, upper)]
+    ret = None
+    while stack:
+        try:
+            args = stack[-1].send(ret)
+        except StopIteration as stop:
+            stack.pop()
+            ret = stop.value
+        else:
+            ret = terminal(*args)
+            if ret is None:
+                stack.append(solve(*args))
+    return ret
+
+
+def _satisfy_count(st, node, ranks, n):
+    """Return the number of satisfying points of *node*.
+
+    The *ranks* dict maps the uniqid of every support variable to its
+    position in the variable order, and *n* is the number of variables.
+    """
+    counts = _edge_counts(st, node, ranks, n)
+    root = st.root(node)
+    return counts[node] << (n if root < 0 else ranks[root])
+
+
+def _edge_counts(st, node, ranks, n):
+    """Return a dict that maps every edge of *node* to its number of
+    satisfying points.
+
+    The count of an edge is over the variables at or below its rank,
+    so it doubles for every variable that is skipped by a child edge.
+    """
+    counts = {}
+    for edge in _dfs_postorder(st, node, set()):
+        root = st.root(edge)
+        if root < 0:
+            counts[edge] = int(edge == st.one)
+        else:
+            rank = ranks[root]
+            count = 0
+            for child in st.children(edge):
+                croot = st.root(child)
+                crank = n if croot < 0 else ranks[croot]
+                count += counts[child] << (crank - rank - 1)
+            counts[edge] = count
+    return counts
+
+
+def _iter_random_points(st, node, vs, rng):
+    """Iterate through satisfying points of *node*,
+    chosen uniformly at random.
+
+    The *vs* list holds the support variables, in level order.
+    Every step down the BDD chooses a child with probability proportional
+    to its number of satisfying points,
+    and variables that are skipped by an edge are chosen by a coin flip.
+    """
+    if node == st.zero:
+        return
+    ranks = {v.uniqid: i for i, v in enumerate(vs)}
+    n = len(vs)
+    counts = _edge_counts(st, node, ranks, n)
+
+    def rank(edge):
+        root = st.root(edge)
+        return n if root < 0 else ranks[root]
+
+    # edge => (rank, lo weight, total weight, lo, hi)
+    choices = {}
+    for edge in counts:
+        if st.root(edge) > 0:
+            r = rank(edge)
+            lo, hi = st.children(edge)
+            w0 = counts[lo] << (rank(lo) - r - 1)
+            w1 = counts[hi] << (rank(hi) - r - 1)
+            choices[edge] = (r, w0, w0 + w1, lo, hi)
+
+    while True:
+        point = {}
+        i = 0
+        edge = node
+        while edge in choices:
+            r, w0, total, lo, hi = choices[edge]
+            for v in vs[i:r]:
+                point[v] = rng.getrandbits(1)
+            val = int(rng.randrange(total) >= w0)
+            point[vs[r]] = val
+            edge = hi if val else lo
+            i = r + 1
+        for v in vs[i:]:
+            point[v] = rng.getrandbits(1)
+        yield point
+
+
+def _weighted_count(st, node, ranks, weights):
+    """Return the weighted count of the satisfying points of *node*.
+
+    The *weights* list holds one ``(w0, w1)`` pair for every rank.
+    A variable that is skipped by a child edge contributes ``w0 + w1``.
+    """
+    n = len(weights)
+    gaps = {}
+
+    def gap(start, stop):
+        """Return the product of all w0 + w1 in [start, stop)."""
+        try:
+            return gaps[start, stop]
+        except KeyError:
+            prod = 1
+            for w0, w1 in weights[start:stop]:
+                prod *= w0 + w1
+            gaps[start, stop] = prod
+            return prod
+
+    counts = {}
+    for edge in _dfs_postorder(st, node, set()):
+        root = st.root(edge)
+        if root < 0:
+            counts[edge] = int(edge == st.one)
+        else:
+            rank = ranks[root]
+            count = 0
+            for child, w in zip(st.children(edge), weights[rank]):
+                croot = st.root(child)
+                crank = n if croot < 0 else ranks[croot]
+                count += w * gap(rank + 1, crank) * counts[child]
+            counts[edge] = count
+    root = st.root(node)
+    return gap(0, n if root < 0 else ranks[root]) * counts[node]
 
 
-def _iter_all_paths(start, end, rand=False, path=tuple()):
+def _find_path(st, start, end):
+    """Return the first path from start to end, in DFS order.
+
+    If no path exists, return None.
+    """
+    # Every non-terminal node is non-constant,
+    # so it has paths to both terminal nodes.
+    other = st.neg(end)
+    if start == other:
+        return None
+    path = [start]
+    node = start
+    while node != end:
+        lo, hi = st.children(node)
+        node = hi if lo == other else lo
+        path.append(node)
+    return tuple(path)
+
+
+def _iter_all_paths(st, start, end, rand=False):
     """Iterate through all paths from start to end."""
-    path = path + (start, )
-    if start is end:
-        yield path
-    else:
-        nodes = [start.lo, start.hi]
-        if rand:  # pragma: no cover
-            random.shuffle(nodes)
-        for node in nodes:
-            if node is not None:
-                yield from _iter_all_paths(node, end, rand, path)
+    path = []
+    stack = [(start, 0)]
+    while stack:
+        node, depth = stack.pop()
+        del path[depth:]
+        path.append(node)
+        if node == end:
+            yield tuple(path)
+        else:
+            nodes = st.children(node)
+            if nodes[0] is not None:
+                if rand:  # pragma: no cover
+                    nodes = random.sample(nodes, 2)
+                for child in reversed(nodes):
+                    stack.append((child, depth + 1))
 
 
-def _dfs_preorder(node, visited):
+def _dfs_preorder(st, node, visited):
     """Iterate through nodes in DFS pre-order."""
-    if node not in visited:
-        visited.add(node)
-        yield node
-    if node.lo is not None:
-        yield from _dfs_preorder(node.lo, visited)
-    if node.hi is not None:
-        yield from _dfs_preorder(node.hi, visited)
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node not in visited:
+            visited.add(node)
+            yield node
+            lo, hi = st.children(node)
+            if hi is not None:
+                stack.append(hi)
+            if lo is not None:
+                stack.append(lo)
 
 
-def _dfs_postorder(node, visited):
+def _dfs_postorder(st, node, visited):
     """Iterate through nodes in DFS post-order."""
-    if node.lo is not None:
-        yield from _dfs_postorder(node.lo, visited)
-    if node.hi is not None:
-        yield from _dfs_postorder(node.hi, visited)
-    if node not in visited:
-        visited.add(node)
-        yield node
+    stack = [(node, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if node not in visited:
+            if expanded:
+                visited.add(node)
+                yield node
+            else:
+                stack.append((node, True))
+                lo, hi = st.children(node)
+                if hi is not None:
+                    stack.append((hi, False))
+                if lo is not None:
+                    stack.append((lo, False))
 
 
-def _bfs(node, visited):
+def _bfs(st, node, visited):
     """Iterate through nodes in BFS order."""
     queue = collections.deque()
     queue.appendleft(node)
     while queue:
         node = queue.pop()
         if node not in visited:
-            if node.lo is not None:
-                queue.appendleft(node.lo)
-            if node.hi is not None:
-                queue.appendleft(node.hi)
+            lo, hi = st.children(node)
+            if lo is not None:
+                queue.appendleft(lo)
+            if hi is not None:
+                queue.appendleft(hi)
             visited.add(node)
             yield node
+
+
+_REORDER_METHODS = ("sift", "window2", "window3")
+
+
+def _reorder(mgr, method):
+    """Reorder the variables of manager *mgr*."""
+    st = mgr.store
+    # The computed table may keep dead nodes alive
+    st.cache.flush()
+    roots = list(mgr.bdds.keys())
+    roots.extend(st.pinned())
+    reorderer = _Reorderer(st, roots)
+    if method == "sift":
+        reorderer.sift()
+    else:
+        reorderer.window(int(method[-1]))
+
+
+def _maybe_reorder(mgr):
+    """Sift the variables if the store has grown past the threshold."""
+    st = mgr.store
+    if len(st) > st.next_reorder:
+        _reorder(mgr, "sift")
+        st.next_reorder = max(st.reorder_threshold, 2 * len(st))
+
+
+class _Reorderer:
+    """Dynamic variable reordering by swapping adjacent levels in place
+
+    For the duration of the reordering,
+    nodes are grouped by variable,
+    and every node has a reference count.
+    Nodes are freed as soon as their count drops to zero,
+    so ``size`` is always the number of live nodes.
+
+    Only *active* variables are moved.
+    A variable is active if one of its nodes has a non-terminal child,
+    or is the child of another node.
+    Moving an inactive variable never changes the size,
+    so inactive variables keep their levels,
+    and the ``slots`` list holds the levels of the active variables.
+    Two active variables in adjacent slots are swapped directly.
+    """
+    def __init__(self, st, roots):
+        self.st = st
+        self.groups = {root: set() for root in st.order}
+        self.refs = {}
+        for node in st.iter_nodes():
+            self.groups[st.root(node)].add(node)
+            self.refs[node] = 0
+        for group in self.groups.values():
+            for node in group:
+                for child in st.children(node):
+                    self._ref(child)
+        for edge in roots:
+            self._ref(edge)
+        self.size = len(self.refs)
+        for node in [node for node, cnt in self.refs.items() if cnt == 0]:
+            self.refs[node] = 1
+            self._deref(node)
+        self.active = set()
+        for node in self.refs:
+            for child in st.children(node):
+                root = st.root(child)
+                if root > 0:
+                    self.active.add(st.root(node))
+                    self.active.add(root)
+        self.slots = sorted(st.levels[root] for root in self.active)
+
+    def _ref(self, edge):
+        """Increment the reference count of *edge*."""
+        node = self.st.regular(edge)
+        if self.st.root(node) > 0:
+            self.refs[node] += 1
+
+    def _deref(self, edge):
+        """Decrement the reference count of *edge*, and free dead nodes."""
+        st, refs = self.st, self.refs
+        stack = [edge]
+        while stack:
+            node = st.regular(stack.pop())
+            root = st.root(node)
+            if root > 0:
+                refs[node] -= 1
+                if refs[node] == 0:
+                    del refs[node]
+                    self.groups[root].discard(node)
+                    stack.extend(st.children(node))
+                    st.free(node)
+                    self.size -= 1
+
+    def _mk(self, root, lo, hi):
+        """Return a unique node, and count the references of a new node."""
+        st = self.st
+        edge = st.mk(root, lo, hi)
+        node = st.regular(edge)
+        if st.root(node) > 0 and node not in self.refs:
+            self.refs[node] = 0
+            self.groups[root].add(node)
+            self._ref(lo)
+            self._ref(hi)
+            self.size += 1
+        return edge
+
+    def swap(self, slot):
+        """Swap the variables in *slot* and ``slot + 1``.
+
+        Nodes of the upper variable *x* that do not depend on the lower
+        variable *y* are unchanged.
+        Every other *x* node is rewritten in place into a *y* node,
+        whose children are *x* nodes:
+        f = ITE(x, ITE(y, f11, f10), ITE(y, f01, f00))
+          = ITE(y, ITE(x, f11, f01), ITE(x, f10, f00))
+        """
+        st = self.st
+        i, j = self.slots[slot], self.slots[slot+1]
+        x, y = st.order[i], st.order[j]
+        xs, ys = self.groups[x], self.groups[y]
+        moved = [node for node in xs
+                 if any(st.root(child) == y for child in st.children(node))]
+        for node in moved:
+            xs.discard(node)
+            st.unlink(node)
+        for node in moved:
+            f0, f1 = st.children(node)
+            f00, f01 = st.cofactors(f0, y)
+            f10, f11 = st.cofactors(f1, y)
+            lo = self._mk(x, f00, f10)
+            hi = self._mk(x, f01, f11)
+            self._ref(lo)
+            self._ref(hi)
+            st.relink(node, y, lo, hi)
+            ys.add(node)
+            self._deref(f0)
+            self._deref(f1)
+        st.swap_levels(i, j)
+
+    def sift(self, max_growth=_MAX_GROWTH):
+        """Sift every active variable to its best level."""
+        groups = self.groups
+        for root in sorted(self.active, key=lambda r: len(groups[r]),
+                           reverse=True):
+            self._sift_var(root, max_growth)
+
+    def _sift_var(self, root, max_growth):
+        """Move one variable through all slots, and leave it at the best one.
+
+        Move toward the nearest end first.
+        Stop moving in one direction when the size grows past *max_growth*
+        times the best size.
+        """
+        last = len(self.slots) - 1
+        slot = self.slots.index(self.st.levels[root])
+        best_size, best_slot = self.size, slot
+        ends = (0, last) if slot < last - slot else (last, 0)
+        for end in ends:
+            while slot != end:
+                if slot < end:
+                    self.swap(slot)
+                    slot += 1
+                else:
+                    self.swap(slot - 1)
+                    slot -= 1
+                if self.size < best_size:
+                    best_size, best_slot = self.size, slot
+                elif self.size > max_growth * best_size:
+                    break
+        while slot < best_slot:
+            self.swap(slot)
+            slot += 1
+        while slot > best_slot:
+            self.swap(slot - 1)
+            slot -= 1
+
+    # Adjacent swaps, relative to the top of a window,
+    # that visit all permutations
+    _WINDOW_SWAPS = {
+        2: (0, ),
+        3: (0, 1, 0, 1, 0),
+    }
+
+    def window(self, size):
+        """Try all permutations of every window of *size* adjacent slots,
+        and keep the best one.
+        """
+        swaps = self._WINDOW_SWAPS[size]
+        for top in range(len(self.slots) - size + 1):
+            best_size, best = self.size, 0
+            for i, offset in enumerate(swaps, 1):
+                self.swap(top + offset)
+                if self.size < best_size:
+                    best_size, best = self.size, i
+            for offset in reversed(swaps[best:]):
+                self.swap(top + offset)
@@ -31,6 +31,7 @@ Interface Functions:
 * :func:`ast2expr` --- Convert an abstract syntax tree to an Expression
 * :func:`expr2dimacscnf` --- Convert an expression into an equivalent DIMACS CNF
 * :func:`upoint2exprpoint` --- Convert an untyped point into an Expression point
+* :func:`set_unique_table` --- Share structurally identical expression nodes
 
 * :func:`Not` --- Expression negation operator
 * :func:`Or` --- Expression disjunction (sum, OR) operator
@@ -121,6 +122,9 @@ _LITS = {}
 # satisfy_one literal assumptions
 _ASSUMPTIONS = set()
 
+# satisfy_one/satisfy_all solvers for non-CNF expressions
+_SOLVERS = ("backtrack", "picosat")
+
 
 def _assume2point():
     """Convert global assumptions to a point."""
@@ -241,8 +245,17 @@ def ast2expr(ast):
 
 
 def expr2dimacscnf(ex):
-    """Convert an expression into an equivalent DIMACS CNF."""
-    litmap, nvars, clauses = ex.encode_cnf()
+    """Convert an expression into an equivalent DIMACS CNF.
+
+    An expression that is not already a CNF gets the polarity-aware
+    Tseitin encoding, which is only equisatisfiable:
+    ``litmap`` maps the inputs, and higher variables are auxiliary.
+    """
+    if ex.is_cnf():
+        litmap, nvars, clauses = ex.encode_cnf()
+    else:
+        litmap, nvars, lits = ex.encode_tseitin(polarity=True)
+        clauses = _split_clauses(lits)
     return litmap, DimacsCNF(nvars, clauses)
 
 
@@ -306,6 +319,23 @@ def upoint2exprpoint(upoint):
     return point
 
 
+def set_unique_table(enabled):
+    """Enable/disable sharing structurally identical expression nodes.
+
+    While the unique table is enabled,
+    an operator is looked up by its kind and arguments before it is created,
+    so all structurally identical operators share one node.
+    Expressions with a lot of redundancy, like Tseitin-encoded netlists,
+    use much less memory,
+    and node equality becomes a pointer comparison.
+
+    Only operators whose arguments were also created while the table
+    was enabled are shared.
+    Disabling the table does not change existing expressions.
+    """
+    exprnode.set_unique(enabled)
+
+
 # primitive functions
 def Not(x, simplify=True):
     """Expression negation operator
@@ -731,16 +761,24 @@ class Expression(boolfunc.Function):
             d[key.node] = self.box(val).node
         return _expr(self.node.compose(d))
 
-    def satisfy_one(self):
+    def satisfy_one(self, solver="picosat"):
+        """
+        If this function is satisfiable, return a satisfying input point.
+        A contradiction returns None.
+
+        A CNF always goes to PicoSAT.
+        For any other expression, *solver* is either "picosat",
+        to solve its polarity-aware Tseitin encoding,
+        or "backtrack", to split on one variable at a time.
+        Auxiliary variables never appear in the point.
+        """
         if self.is_cnf():
             litmap, cnf = expr2dimacscnf(self)
-            assumptions = [litmap[lit] for lit in _ASSUMPTIONS]
-            soln = cnf.satisfy_one(assumptions)
-            if soln is None:
-                return None
-            else:
-                return cnf.soln2point(soln, litmap)
-        else:
+            nvars, clauses = cnf.nvars, cnf.clauses
+        elif solver == "picosat":
+            # PicoSAT reads the packed clauses directly
+            litmap, nvars, clauses = self.encode_tseitin(polarity=True)
+        elif solver == "backtrack":
             if _ASSUMPTIONS:
                 aupnt = _assume2point()
                 soln = _backtrack(self.restrict(aupnt))
@@ -749,14 +787,44 @@ class Expression(boolfunc.Function):
                 return soln
             else:
                 return _backtrack(self)
-
-    def satisfy_all(self):
+        else:
+            raise ValueError(f"expected solver in {_SOLVERS}, got {solver!r}")
+
+        assumptions = [litmap[lit] for lit in _ASSUMPTIONS if lit in litmap]
+        # Assumptions outside the support constrain nothing
+        aupnt = {v: val for v, val in _assume2point().items()
+                 if v not in litmap}
+        soln = picosat.satisfy_one(nvars, clauses, assumptions)
+        if soln is None:
+            return None
+        else:
+            point = ConjNormalForm.soln2point(soln, litmap)
+            point.update(aupnt)
+            return point
+
+    def satisfy_all(self, solver="picosat"):
+        """Iterate through all satisfying input points.
+
+        A CNF always goes to PicoSAT.
+        For any other expression, *solver* is either "picosat",
+        to solve its Tseitin encoding,
+        or "backtrack", to split on one variable at a time.
+        That encoding has no polarity,
+        so every point has exactly one model,
+        and auxiliary variables never appear in the points.
+        """
         if self.is_cnf():
             litmap, cnf = expr2dimacscnf(self)
             for soln in cnf.satisfy_all():
                 yield cnf.soln2point(soln, litmap)
-        else:
+        elif solver == "picosat":
+            litmap, nvars, clauses = self.encode_tseitin()
+            for soln in picosat.satisfy_all(nvars, clauses):
+                yield ConjNormalForm.soln2point(soln, litmap)
+        elif solver == "backtrack":
             yield from _iter_backtrack(self)
+        else:
+            raise ValueError(f"expected solver in {_SOLVERS}, got {solver!r}")
 
     def is_zero(self):
         return False
@@ -940,6 +1008,38 @@ class Expression(boolfunc.Function):
         else:
             raise ValueError("expected a CNF expression")
 
+    def encode_tseitin(self, polarity=False):
+        """Encode with Tseitin's transformation as DIMACS integer clauses.
+
+        Return a ``(litmap, nvars, clauses)`` tuple.
+        The inputs are numbered first, as in ``encode_inputs``,
+        and ``litmap`` maps only them.
+        Auxiliary variables get the numbers above ``len(self.inputs)``.
+        ``clauses`` is a flat ``memoryview`` of ints,
+        with each clause terminated by zero.
+
+        The encoding is done in one pass in C,
+        so no auxiliary variable is ever created as an expression.
+        Sub-expressions with the same operator and arguments share
+        one auxiliary variable.
+
+        If ``polarity`` is True, use the Plaisted-Greenbaum encoding:
+        a sub-expression that only appears positively (negatively)
+        only gets the clauses that make its variable imply
+        (be implied by) it.
+        There are fewer clauses,
+        but an input point may have several models.
+        """
+        nvars, inputs, clauses = self.node.tseitin(polarity)
+        litmap = {}
+        for i, node in enumerate(inputs, start=1):
+            v = _expr(node)
+            litmap[v] = i
+            litmap[~v] = -i
+            litmap[i] = v
+            litmap[-i] = ~v
+        return litmap, nvars, memoryview(clauses).cast("i")
+
     def tseitin(self, auxvarname="aux"):
         """Convert the expression to Tseitin's encoding."""
         if self.is_cnf():
@@ -1386,6 +1486,22 @@ class ConjNormalForm(NormalForm):
                                    verbosity, default_phase, propagation_limit,
                                    decision_limit, seed)
 
+    def solver(self, **params):
+        """Return an incremental PicoSAT solver loaded with the clauses.
+
+        Clauses learned by one call to its ``solve`` method
+        are kept for the next one.
+        """
+        verbosity = params.get("verbosity", 0)
+        default_phase = params.get("default_phase", 2)
+        propagation_limit = params.get("propagation_limit", -1)
+        decision_limit = params.get("decision_limit", -1)
+        seed = params.get("seed", 1)
+        solver = picosat.Solver(self.nvars, verbosity, default_phase,
+                                propagation_limit, decision_limit, seed)
+        solver.add_clauses(self.clauses)
+        return solver
+
     def satisfy_all(self, **params):
         """Iterate through all satisfying input points."""
         verbosity = params.get("verbosity", 0)
@@ -1401,7 +1517,7 @@ class ConjNormalForm(NormalForm):
     def soln2point(soln, litmap):
         """Convert a solution vector to a point."""
         return {litmap[i]: int(val > 0)
-                for i, val in enumerate(soln, start=1)}
+                for i, val in enumerate(soln, start=1) if i in litmap}
 
 
 class DimacsCNF(ConjNormalForm):
@@ -1412,6 +1528,19 @@ class DimacsCNF(ConjNormalForm):
         return f"p cnf {self.nvars} {self.nclauses}\n{formula}"
 
 
+def _split_clauses(lits):
+    """Split a flat sequence of zero-terminated DIMACS clauses."""
+    clauses = []
+    clause = []
+    for lit in lits:
+        if lit:
+            clause.append(lit)
+        else:
+            clauses.append(frozenset(clause))
+            clause = []
+    return clauses
+
+
 def _tseitin(ex, auxvarname, auxvars=None):
     """
     Convert a factored expression to a literal, and a list of constraints.
@@ -38,6 +38,9 @@ PyDoc_STRVAR(ExprNode_doc,
     "A node in an expression tree.\n\
 \n\
     This is a light-weight wrapper around the C BoolExpr data type.\n\
+\n\
+    The simplify, to_nnf, to_dnf, to_cnf, and complete_sum methods\n\
+    release the GIL, so several threads may convert expressions at once.\n\
     "
 );
 
@@ -383,6 +386,24 @@ static PyObject *
 ExprNode_complete_sum(ExprNode *self);
 
 
+/* ExprNode.tseitin(polarity=False) */
+PyDoc_STRVAR(tseitin_doc,
+    "Return the Tseitin encoding as (nvars, inputs, clauses).\n\
+\n\
+    DIMACS variable i is inputs[i-1] for i <= len(inputs),\n\
+    and higher variables are auxiliary.\n\
+    clauses is a bytes object of packed C ints,\n\
+    with each clause terminated by zero.\n\
+\n\
+    If polarity is true, use the Plaisted-Greenbaum encoding,\n\
+    which has fewer clauses, but not one model per input point.\n\
+    "
+);
+
+static PyObject *
+ExprNode_tseitin(ExprNode *self, PyObject *args);
+
+
 static PyMethodDef
 ExprNode_methods[] = {
     {"restrict", (PyCFunction) ExprNode_restrict, METH_VARARGS, restrict_doc},
@@ -404,6 +425,7 @@ ExprNode_methods[] = {
     {"to_dnf",       (PyCFunction) ExprNode_to_dnf,       METH_NOARGS, to_dnf_doc},
     {"to_cnf",       (PyCFunction) ExprNode_to_cnf,       METH_NOARGS, to_cnf_doc},
     {"complete_sum", (PyCFunction) ExprNode_complete_sum, METH_NOARGS, complete_sum_doc},
+    {"tseitin",      (PyCFunction) ExprNode_tseitin,      METH_VARARGS, tseitin_doc},
 
     {NULL}  /* sentinel */
 };
@@ -689,7 +711,12 @@ ExprNode_simplify(ExprNode *self)
 {
     struct BoolExpr *ex;
 
-    if ((ex = BX_Simplify(self->ex)) == NULL) {
+    /* The kernel is thread-safe, so release the GIL during heavy work */
+    Py_BEGIN_ALLOW_THREADS
+    ex = BX_Simplify(self->ex);
+    Py_END_ALLOW_THREADS
+
+    if (ex == NULL) {
         PyErr_SetString(Error, "BX_Simplify failed");
         return NULL;
     }
@@ -742,7 +769,11 @@ ExprNode_to_nnf(ExprNode *self)
 {
     struct BoolExpr *ex;
 
-    if ((ex = BX_ToNNF(self->ex)) == NULL) {
+    Py_BEGIN_ALLOW_THREADS
+    ex = BX_ToNNF(self->ex);
+    Py_END_ALLOW_THREADS
+
+    if (ex == NULL) {
         PyErr_SetString(Error, "BX_ToNNF failed");
         return NULL;
     }
@@ -768,7 +799,11 @@ ExprNode_to_dnf(ExprNode *self)
 {
     struct BoolExpr *ex;
 
-    if ((ex = BX_ToDNF(self->ex)) == NULL) {
+    Py_BEGIN_ALLOW_THREADS
+    ex = BX_ToDNF(self->ex);
+    Py_END_ALLOW_THREADS
+
+    if (ex == NULL) {
         PyErr_SetString(Error, "BX_ToDNF failed");
         return NULL;
     }
@@ -794,7 +829,11 @@ ExprNode_to_cnf(ExprNode *self)
 {
     struct BoolExpr *ex;
 
-    if ((ex = BX_ToCNF(self->ex)) == NULL) {
+    Py_BEGIN_ALLOW_THREADS
+    ex = BX_ToCNF(self->ex);
+    Py_END_ALLOW_THREADS
+
+    if (ex == NULL) {
         PyErr_SetString(Error, "BX_ToCNF failed");
         return NULL;
     }
@@ -820,7 +859,11 @@ ExprNode_complete_sum(ExprNode *self)
 {
     struct BoolExpr *ex;
 
-    if ((ex = BX_CompleteSum(self->ex)) == NULL) {
+    Py_BEGIN_ALLOW_THREADS
+    ex = BX_CompleteSum(self->ex);
+    Py_END_ALLOW_THREADS
+
+    if (ex == NULL) {
         PyErr_SetString(Error, "BX_CompleteSum failed");
         return NULL;
     }
@@ -841,6 +884,57 @@ ExprNode_complete_sum(ExprNode *self)
 }
 
 
+static PyObject *
+ExprNode_tseitin(ExprNode *self, PyObject *args)
+{
+    int polarity = 0;
+    struct BX_CNF *cnf;
+    PyObject *inputs, *clauses, *ret;
+
+    if (!PyArg_ParseTuple(args, "|p", &polarity))
+        return NULL;
+
+    Py_BEGIN_ALLOW_THREADS
+    cnf = BX_Tseitin(self->ex, polarity);
+    Py_END_ALLOW_THREADS
+
+    if (cnf == NULL) {
+        PyErr_SetString(Error, "BX_Tseitin failed");
+        return NULL;
+    }
+
+    inputs = PyTuple_New(cnf->ninputs);
+    if (inputs == NULL) {
+        BX_CNF_Del(cnf);
+        return NULL;
+    }
+
+    for (size_t i = 0; i < cnf->ninputs; ++i) {
+        ExprNode *node = (ExprNode *) PyObject_CallObject((PyObject *) &ExprNode_T, NULL);
+        if (node == NULL) {
+            Py_DECREF(inputs);
+            BX_CNF_Del(cnf);
+            return NULL;
+        }
+        node->ex = BX_IncRef(cnf->inputs[i]);
+        PyTuple_SET_ITEM(inputs, i, (PyObject *) node);
+    }
+
+    clauses = PyBytes_FromStringAndSize((const char *) cnf->lits,
+                                        cnf->length * sizeof(int));
+    if (clauses == NULL) {
+        Py_DECREF(inputs);
+        BX_CNF_Del(cnf);
+        return NULL;
+    }
+
+    ret = Py_BuildValue("(iNN)", cnf->nvars, inputs, clauses);
+    BX_CNF_Del(cnf);
+
+    return ret;
+}
+
+
 /* exprnode.lit */
 PyDoc_STRVAR(lit_doc,
     "\n\
@@ -1253,6 +1347,58 @@ ite(PyObject *self, PyObject *args)
 }
 
 
+/* exprnode.set_unique */
+PyDoc_STRVAR(set_unique_doc,
+    "\n\
+    Enable/disable the unique table of operator nodes.\n\
+\n\
+    While the table is enabled, structurally identical operators\n\
+    share one node.\n\
+    Threads that create operators take turns on the table's lock.\n\
+\n\
+    Parameters\n\
+    ----------\n\
+    enabled : bool\n\
+        Whether the unique table is enabled\n\
+    "
+);
+
+static PyObject *
+set_unique(PyObject *self, PyObject *args)
+{
+    int enabled;
+
+    if (!PyArg_ParseTuple(args, "p", &enabled))
+        return NULL;
+
+    if (!enabled) {
+        BX_UniqueTable_Disable();
+    }
+    else if (!BX_UniqueTable_Enable()) {
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    Py_RETURN_NONE;
+}
+
+
+/* exprnode.unique_info */
+PyDoc_STRVAR(unique_info_doc,
+    "\n\
+    Return (enabled, length) of the unique table of operator nodes.\n\
+    "
+);
+
+static PyObject *
+unique_info(PyObject *self, PyObject *args)
+{
+    return Py_BuildValue("(Nn)",
+                         PyBool_FromLong(BX_UniqueTable_Enabled()),
+                         (Py_ssize_t) BX_UniqueTable_Length());
+}
+
+
 /* exprnode module definition */
 PyDoc_STRVAR(m_doc,
 "\n\
@@ -1286,6 +1432,9 @@ static PyMethodDef m_methods[] = {
     {"impl", (PyCFunction) impl, METH_VARARGS, impl_doc},
     {"ite",  (PyCFunction) ite,  METH_VARARGS, ite_doc},
 
+    {"set_unique",  (PyCFunction) set_unique,  METH_VARARGS, set_unique_doc},
+    {"unique_info", (PyCFunction) unique_info, METH_NOARGS,  unique_info_doc},
+
     /* sentinel */
     {NULL, NULL, 0, NULL}
 };
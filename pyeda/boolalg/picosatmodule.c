@@ -13,6 +13,9 @@
 ** Interface Functions:
 **     satisfy_one
 **     satisfy_all
+**
+** Interface Types:
+**     Solver
 */
 
 
@@ -20,6 +23,8 @@
 
 #include <math.h>       /* abs */
 #include <stdbool.h>    /* bool, false, true */
+#include <stdint.h>     /* int32_t, int64_t */
+#include <string.h>     /* memcpy, strchr */
 
 #include "picosat.h"
 
@@ -52,76 +57,211 @@ _pyfree(void *pmgr, void *p, size_t nbytes)
 }
 
 
-static bool
-_add_clause(PicoSAT *picosat, PyObject *clause)
+/*
+** Return a sequence of the literals in an iterable,
+** or NULL if any of them is not an int in [-nvars, 0) or (0, nvars].
+**
+** Every literal is checked before any is given to PicoSAT,
+** because a persistent Solver keeps whatever it was given.
+** The kind argument names the literals in error messages.
+*/
+static PyObject *
+_check_lits(PyObject *lits, int nvars, const char *kind)
 {
-    int nvars = picosat_variables(picosat);
-    PyObject *iter;
+    PyObject *seq;
     PyObject *pylit;
     long lit;
 
-    iter = PyObject_GetIter(clause);
-    if (iter == NULL)
-        return false;
+    seq = PySequence_Fast(lits, "expected an iterable of literals");
+    if (seq == NULL)
+        return NULL;
+
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); ++i) {
+        pylit = PySequence_Fast_GET_ITEM(seq, i);
 
-    while ((pylit = PyIter_Next(iter)) != 0) {
         if (!PyLong_Check(pylit)) {
-            PyErr_SetString(PyExc_TypeError, "expected clause literal to be an int");
-            Py_DECREF(pylit);
-            Py_DECREF(iter);
-            return false;
+            PyErr_Format(PyExc_TypeError, "expected %s literal to be an int", kind);
+            Py_DECREF(seq);
+            return NULL;
         }
 
         lit = PyLong_AsLong(pylit);
-        if (lit == 0 || abs(lit) > nvars) {
+        if (lit == -1 && PyErr_Occurred()) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+        if (lit == 0 || labs(lit) > nvars) {
             PyErr_Format(
                 PyExc_ValueError,
-                "expected clause literal in range [-%d, 0), (0, %d], got: %ld",
-                nvars, nvars, lit
+                "expected %s literal in range [-%d, 0), (0, %d], got: %ld",
+                kind, nvars, nvars, lit
             );
-            Py_DECREF(pylit);
-            Py_DECREF(iter);
-            return false;
+            Py_DECREF(seq);
+            return NULL;
         }
+    }
 
-        /* Add clause literal */
-        picosat_add(picosat, lit);
+    return seq;
+}
 
-        Py_DECREF(pylit);
-    } /* for pylit in iter */
 
-    Py_DECREF(iter);
+/*
+** Add one clause to a PicoSAT instance.
+**
+** Literals must be in [-nvars, 0) or (0, nvars].
+** That is not always picosat_variables,
+** which also counts the internal variables of contexts.
+*/
+static bool
+_add_clause(PicoSAT *picosat, int nvars, PyObject *clause)
+{
+    PyObject *seq;
 
-    if (PyErr_Occurred())
+    seq = _check_lits(clause, nvars, "clause");
+    if (seq == NULL)
         return false;
 
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); ++i)
+        picosat_add(picosat, (int) PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i)));
+
     /* Terminate clause */
     picosat_add(picosat, 0);
 
+    Py_DECREF(seq);
+
     return true;
 }
 
 
+/* Return the i'th literal of a packed buffer, which may be unaligned */
+static long long
+_packed_lit(const char *buf, Py_ssize_t itemsize, Py_ssize_t i)
+{
+    int32_t lit32;
+    int64_t lit64;
+
+    if (itemsize == 4) {
+        memcpy(&lit32, buf + i * itemsize, 4);
+        return (long long) lit32;
+    }
+    else {
+        memcpy(&lit64, buf + i * itemsize, 8);
+        return (long long) lit64;
+    }
+}
+
+
+/*
+** Add zero-terminated clause literals from a buffer to a PicoSAT instance.
+**
+** The buffer holds signed 32-bit or 64-bit native integers,
+** or raw bytes of packed C ints.
+** Every literal is checked before any is added,
+** so a bad buffer leaves the clauses unchanged.
+**
+** Returns
+** -------
+**     false : Exception
+**     true  : Success
+*/
+static bool
+_add_packed_clauses(PicoSAT *picosat, int nvars, PyObject *clauses)
+{
+    static const int one = 1;
+    const char native = *((const char *) &one) ? '<' : '>';
+
+    Py_buffer view;
+    const char *fmt;
+    Py_ssize_t itemsize, length;
+    long long lit = 0;
+    bool ok = true;
+
+    if (PyObject_GetBuffer(clauses, &view, PyBUF_C_CONTIGUOUS | PyBUF_FORMAT) < 0)
+        return false;
+
+    fmt = view.format != NULL ? view.format : "B";
+    if (*fmt == '@' || *fmt == '=' || *fmt == native)
+        fmt += 1;
+
+    if (*fmt != '\0' && strchr("bBc", *fmt) != NULL && fmt[1] == '\0' &&
+        view.itemsize == 1) {
+        itemsize = sizeof(int);
+        if (view.len % itemsize != 0) {
+            PyErr_Format(PyExc_ValueError,
+                         "expected clauses length to be a multiple of %zd bytes",
+                         itemsize);
+            ok = false;
+        }
+    }
+    else if (*fmt != '\0' && strchr("ilqn", *fmt) != NULL && fmt[1] == '\0' &&
+             (view.itemsize == 4 || view.itemsize == 8)) {
+        itemsize = view.itemsize;
+    }
+    else {
+        PyErr_Format(PyExc_TypeError,
+                     "expected clauses buffer of signed ints, got format: %s",
+                     view.format != NULL ? view.format : "B");
+        ok = false;
+    }
+
+    if (ok) {
+        length = view.len / itemsize;
+
+        for (Py_ssize_t i = 0; ok && i < length; ++i) {
+            lit = _packed_lit(view.buf, itemsize, i);
+            if (lit < -nvars || lit > nvars) {
+                PyErr_Format(
+                    PyExc_ValueError,
+                    "expected clause literal in range [-%d, 0), (0, %d], got: %lld",
+                    nvars, nvars, lit
+                );
+                ok = false;
+            }
+        }
+
+        if (ok && lit != 0) {
+            PyErr_SetString(PyExc_ValueError, "expected last clause to end with 0");
+            ok = false;
+        }
+    }
+
+    if (ok) {
+        for (Py_ssize_t i = 0; i < length; ++i)
+            picosat_add(picosat, (int) _packed_lit(view.buf, itemsize, i));
+    }
+
+    PyBuffer_Release(&view);
+
+    return ok;
+}
+
+
 /*
 ** Add all clause literals to a PicoSAT instance.
 **
+** Clauses are either an iter of iter of (nonzero) int,
+** or a buffer of zero-terminated literals, which skips all Python objects.
+**
 ** Returns
 ** -------
 **     false : Exception
 **     true  : Success
 */
 static bool
-_add_clauses(PicoSAT *picosat, PyObject *clauses)
+_add_clauses(PicoSAT *picosat, int nvars, PyObject *clauses)
 {
     PyObject *iter;
     PyObject *clause;
 
+    if (PyObject_CheckBuffer(clauses))
+        return _add_packed_clauses(picosat, nvars, clauses);
+
     iter = PyObject_GetIter(clauses);
     if (iter == NULL)
         return false;
 
     while ((clause = PyIter_Next(iter)) != 0) {
-        if (!_add_clause(picosat, clause)) {
+        if (!_add_clause(picosat, nvars, clause)) {
             Py_DECREF(clause);
             Py_DECREF(iter);
             return false;
@@ -146,42 +286,19 @@ _add_clauses(PicoSAT *picosat, PyObject *clauses)
 **     true  : Success
 */
 static bool
-_add_assumptions(PicoSAT *picosat, PyObject *assumptions)
+_add_assumptions(PicoSAT *picosat, int nvars, PyObject *assumptions)
 {
-    PyObject *iter;
-    PyObject *pylit;
-    int lit;
+    PyObject *seq;
 
-    iter = PyObject_GetIter(assumptions);
-    if (iter == NULL)
+    /* A bad literal must not leave the others assumed for the next call */
+    seq = _check_lits(assumptions, nvars, "assumption");
+    if (seq == NULL)
         return false;
 
-    while ((pylit = PyIter_Next(iter)) != 0) {
-        if (!PyLong_Check(pylit)) {
-            PyErr_SetString(PyExc_TypeError, "expected assumption literal to be an int");
-            Py_DECREF(pylit);
-            Py_DECREF(iter);
-            return false;
-        }
-
-        lit = PyLong_AsLong(pylit);
-        if (lit == 0) {
-            PyErr_SetString(PyExc_ValueError, "expected nonzero assumption literal");
-            Py_DECREF(pylit);
-            Py_DECREF(iter);
-            return false;
-        }
-
-        /* Add assumption literal */
-        picosat_assume(picosat, lit);
-
-        Py_DECREF(pylit);
-    } /* for pylit in iter */
-
-    Py_DECREF(iter);
+    for (Py_ssize_t i = 0; i < PySequence_Fast_GET_SIZE(seq); ++i)
+        picosat_assume(picosat, (int) PyLong_AsLong(PySequence_Fast_GET_ITEM(seq, i)));
 
-    if (PyErr_Occurred())
-        return false;
+    Py_DECREF(seq);
 
     return true;
 }
@@ -197,14 +314,11 @@ _add_assumptions(PicoSAT *picosat, PyObject *assumptions)
 **      1 : 1
 */
 static PyObject *
-_get_soln(PicoSAT *picosat)
+_get_soln(PicoSAT *picosat, int nvars)
 {
     int i;
-    int nvars;
     PyObject *pytuple, *pylong;
 
-    nvars = picosat_variables(picosat);
-
     pytuple = PyTuple_New(nvars);
     if (pytuple == NULL)
         goto error;
@@ -270,8 +384,10 @@ PyDoc_STRVAR(_satisfy_one_docstring,
     nvars : posint\n\
         Number of variables in the CNF\n\
 \n\
-    clauses : iter of iter of (nonzero) int\n\
-        The CNF clauses\n\
+    clauses : iter of iter of (nonzero) int, or buffer of int\n\
+        The CNF clauses.\n\
+        A buffer, such as array('i'), bytes, or memoryview,\n\
+        holds the literals of all clauses, each terminated by zero.\n\
 \n\
     assumptions : iter of (nonzero) int\n\
         Add assumptions (unit clauses) to the CNF\n\
@@ -370,11 +486,11 @@ _satisfy_one(PyObject *self, PyObject *args, PyObject *kwargs)
 
     picosat_adjust(picosat, nvars);
 
-    if (!_add_clauses(picosat, clauses))
+    if (!_add_clauses(picosat, nvars, clauses))
         goto reset_picosat;
 
     if (assumptions != NULL && assumptions != Py_None) {
-        if (!_add_assumptions(picosat, assumptions))
+        if (!_add_assumptions(picosat, nvars, assumptions))
             goto reset_picosat;
     }
 
@@ -390,7 +506,7 @@ _satisfy_one(PyObject *self, PyObject *args, PyObject *kwargs)
     }
     else if (result == PICOSAT_SATISFIABLE) {
         /* Might be NULL */
-        pyret = _get_soln(picosat);
+        pyret = _get_soln(picosat, nvars);
     }
     else if (result == PICOSAT_UNKNOWN) {
         PyErr_SetString(Error, "PicoSAT returned UNKNOWN");
@@ -419,8 +535,10 @@ PyDoc_STRVAR(_satisfy_all_docstring,
     nvars : posint\n\
         Number of variables in the CNF\n\
 \n\
-    clauses : iter of iter of (nonzero) int\n\
-        The CNF clauses\n\
+    clauses : iter of iter of (nonzero) int, or buffer of int\n\
+        The CNF clauses.\n\
+        A buffer, such as array('i'), bytes, or memoryview,\n\
+        holds the literals of all clauses, each terminated by zero.\n\
 \n\
     verbosity : int, optional\n\
         Set verbosity level. A verbosity level of 1 and above prints more and\n\
@@ -522,7 +640,7 @@ _satisfy_all_new(PyTypeObject *cls, PyObject *args, PyObject *kwargs)
 
     picosat_adjust(picosat, nvars);
 
-    if (!_add_clauses(picosat, clauses))
+    if (!_add_clauses(picosat, nvars, clauses))
         goto reset_picosat;
 
     /* Initialize iterator state */
@@ -583,7 +701,7 @@ _satisfy_all_next(_satisfy_all_state *state)
     }
     else if (result == PICOSAT_SATISFIABLE) {
         /* Might be NULL */
-        pysoln = _get_soln(state->picosat);
+        pysoln = _get_soln(state->picosat, picosat_variables(state->picosat));
         if (pysoln != NULL) {
             _block_soln(state->picosat, state->soln);
             pyret = pysoln;
@@ -645,6 +763,432 @@ SatisfyAll_T = {
 };
 
 
+/*
+** Python type definition: picosat.Solver
+*/
+PyDoc_STRVAR(_solver_docstring,
+    "\n\
+    Incremental SAT solver with a persistent clause database.\n\
+\n\
+    One PicoSAT instance lives as long as the solver,\n\
+    so clauses are added once,\n\
+    and clauses learned by one call to solve speed up the next.\n\
+\n\
+    Parameters\n\
+    ----------\n\
+    nvars : posint\n\
+        Number of variables\n\
+\n\
+    verbosity : int, optional\n\
+        Set verbosity level. A verbosity level of 1 and above prints more and\n\
+        more detailed progress reports to stdout.\n\
+\n\
+    default_phase : {0, 1, 2, 3}\n\
+        Set default initial phase:\n\
+            0 = false\n\
+            1 = true\n\
+            2 = Jeroslow-Wang (default)\n\
+            3 = random\n\
+\n\
+    progagation_limit : int\n\
+        Set a limit on the number of propagations. A negative value sets no\n\
+        propagation limit.\n\
+\n\
+    decision_limit : int\n\
+        Set a limit on the number of decisions for each call to solve.\n\
+        A negative value sets no decision limit.\n\
+\n\
+    seed : int\n\
+        Set a seed for PicoSAT's random number generator.\n\
+        Defaults to 1.\n\
+    "
+);
+
+
+/* Solver state */
+typedef struct {
+    PyObject_HEAD
+
+    PicoSAT *picosat;
+    int nvars;
+    int decision_limit;
+
+    /* Number of open contexts */
+    int depth;
+
+    /* True while PicoSAT runs without the GIL */
+    bool busy;
+
+    /* Model of the last call to solve, or None */
+    PyObject *model;
+} _solver_state;
+
+
+/* Solver.tp_new */
+static PyObject *
+_solver_new(PyTypeObject *cls, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {
+        "nvars",
+        "verbosity", "default_phase", "propagation_limit", "decision_limit",
+        "seed",
+        NULL
+    };
+
+    /* PicoSAT instance */
+    PicoSAT *picosat;
+
+    /* PicoSAT input parameters */
+    int nvars = 0;
+    int verbosity = 0;
+    int default_phase = 2; /* Jeroslow-Wang */
+    int propagation_limit = -1;
+    int decision_limit = -1;
+    unsigned seed = 1;
+
+    /* Python return value */
+    _solver_state *state;
+
+    if (!PyArg_ParseTupleAndKeywords(
+            args, kwargs, "i|iiiiI:Solver", keywords,
+            &nvars,
+            &verbosity, &default_phase, &propagation_limit, &decision_limit,
+            &seed))
+        goto error;
+
+    if (nvars < 0) {
+        PyErr_Format(PyExc_ValueError, "expected nvars >= 0, got: %d", nvars);
+        goto error;
+    }
+    if (default_phase < 0 || default_phase > 3) {
+        PyErr_Format(PyExc_ValueError,
+                     "expected default_phase in {0, 1, 2, 3}, got: %d",
+                     default_phase);
+        goto error;
+    }
+
+    picosat = picosat_minit(NULL, _pymalloc, _pyrealloc, _pyfree);
+    if (picosat == NULL) {
+        PyErr_SetString(Error, "could not initialize PicoSAT");
+        goto error;
+    }
+
+    picosat_set_verbosity(picosat, verbosity);
+    picosat_set_global_default_phase(picosat, default_phase);
+    picosat_set_propagation_limit(picosat, propagation_limit);
+    picosat_set_seed(picosat, seed);
+
+    /* Contexts get internal variables above nvars */
+    picosat_adjust(picosat, nvars);
+
+    state = (_solver_state *) cls->tp_alloc(cls, 0);
+    if (state == NULL)
+        goto reset_picosat;
+
+    state->picosat = picosat;
+    state->nvars = nvars;
+    state->decision_limit = decision_limit;
+    state->depth = 0;
+    state->busy = false;
+    Py_INCREF(Py_None);
+    state->model = Py_None;
+
+    /* Success! */
+    return (PyObject *) state;
+
+reset_picosat:
+    picosat_reset(picosat);
+
+error:
+    return NULL;
+}
+
+
+/* Solver.tp_dealloc */
+static void
+_solver_dealloc(_solver_state *state)
+{
+    Py_XDECREF(state->model);
+    picosat_reset(state->picosat);
+
+    Py_TYPE(state)->tp_free(state);
+}
+
+
+/* Raise an error if another thread is solving */
+static bool
+_solver_ready(_solver_state *state)
+{
+    if (state->busy) {
+        PyErr_SetString(Error, "Solver is busy");
+        return false;
+    }
+    return true;
+}
+
+
+/* Solver.add_clause */
+PyDoc_STRVAR(_solver_add_clause_docstring,
+    "\n\
+    Add one clause, an iter of (nonzero) int.\n\
+\n\
+    The clause belongs to the innermost open context.\n\
+    "
+);
+
+static PyObject *
+_solver_add_clause(_solver_state *state, PyObject *clause)
+{
+    if (!_solver_ready(state))
+        return NULL;
+
+    if (!_add_clause(state->picosat, state->nvars, clause))
+        return NULL;
+
+    Py_RETURN_NONE;
+}
+
+
+/* Solver.add_clauses */
+PyDoc_STRVAR(_solver_add_clauses_docstring,
+    "\n\
+    Add clauses, an iter of iter of (nonzero) int,\n\
+    or a buffer of zero-terminated int literals.\n\
+\n\
+    The clauses belong to the innermost open context.\n\
+    "
+);
+
+static PyObject *
+_solver_add_clauses(_solver_state *state, PyObject *clauses)
+{
+    if (!_solver_ready(state))
+        return NULL;
+
+    if (!_add_clauses(state->picosat, state->nvars, clauses))
+        return NULL;
+
+    Py_RETURN_NONE;
+}
+
+
+/* Solver.solve */
+PyDoc_STRVAR(_solver_solve_docstring,
+    "\n\
+    If the clauses are satisfiable, return a satisfying input point.\n\
+    A contradiction will return None.\n\
+\n\
+    Parameters\n\
+    ----------\n\
+    assumptions : iter of (nonzero) int, optional\n\
+        Literals that hold for this call only\n\
+\n\
+    Returns\n\
+    -------\n\
+    tuple of {-1, 0, 1}\n\
+        -1 : zero\n\
+         0 : dont-care\n\
+         1 : one\n\
+    "
+);
+
+static PyObject *
+_solver_solve(_solver_state *state, PyObject *args, PyObject *kwargs)
+{
+    static char *keywords[] = {"assumptions", NULL};
+
+    PyObject *assumptions = NULL;
+
+    /* PicoSAT return value */
+    int result;
+
+    /* Python return value */
+    PyObject *pyret = NULL;
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwargs, "|O:solve", keywords,
+                                     &assumptions))
+        goto done;
+
+    if (!_solver_ready(state))
+        goto done;
+
+    if (assumptions != NULL && assumptions != Py_None) {
+        if (!_add_assumptions(state->picosat, state->nvars, assumptions))
+            goto done;
+    }
+
+    /* Do the damn thing */
+    state->busy = true;
+    Py_BEGIN_ALLOW_THREADS
+    result = picosat_sat(state->picosat, state->decision_limit);
+    Py_END_ALLOW_THREADS
+    state->busy = false;
+
+    /* Prepare Python return value */
+    if (result == PICOSAT_UNSATISFIABLE) {
+        Py_INCREF(Py_None);
+        pyret = Py_None;
+    }
+    else if (result == PICOSAT_SATISFIABLE) {
+        /* Might be NULL */
+        pyret = _get_soln(state->picosat, state->nvars);
+    }
+    else if (result == PICOSAT_UNKNOWN) {
+        PyErr_SetString(Error, "PicoSAT returned UNKNOWN");
+    }
+    else {
+        PyErr_Format(Error, "PicoSAT returned: %d", result);
+    }
+
+    if (pyret != NULL) {
+        Py_INCREF(pyret);
+        Py_SETREF(state->model, pyret);
+    }
+
+done:
+    return pyret;
+}
+
+
+/* Solver.push */
+PyDoc_STRVAR(_solver_push_docstring,
+    "\n\
+    Open a new context, and return the number of open contexts.\n\
+\n\
+    Clauses added until the matching pop are discarded by it.\n\
+    Learned clauses that only involve outer contexts are kept.\n\
+    "
+);
+
+static PyObject *
+_solver_push(_solver_state *state, PyObject *Py_UNUSED(ignored))
+{
+    if (!_solver_ready(state))
+        return NULL;
+
+    picosat_push(state->picosat);
+    state->depth += 1;
+
+    return PyLong_FromLong((long) state->depth);
+}
+
+
+/* Solver.pop */
+PyDoc_STRVAR(_solver_pop_docstring,
+    "\n\
+    Close the innermost context, and discard its clauses.\n\
+    Return the number of contexts that are still open.\n\
+    "
+);
+
+static PyObject *
+_solver_pop(_solver_state *state, PyObject *Py_UNUSED(ignored))
+{
+    if (!_solver_ready(state))
+        return NULL;
+
+    /* PicoSAT aborts on a pop without a push */
+    if (state->depth == 0) {
+        PyErr_SetString(Error, "no context to pop");
+        return NULL;
+    }
+
+    picosat_pop(state->picosat);
+    state->depth -= 1;
+
+    return PyLong_FromLong((long) state->depth);
+}
+
+
+static PyObject *
+_solver_get_nvars(_solver_state *state, void *closure)
+{
+    return PyLong_FromLong((long) state->nvars);
+}
+
+
+static PyObject *
+_solver_get_depth(_solver_state *state, void *closure)
+{
+    return PyLong_FromLong((long) state->depth);
+}
+
+
+static PyObject *
+_solver_get_model(_solver_state *state, void *closure)
+{
+    Py_INCREF(state->model);
+    return state->model;
+}
+
+
+static PyMethodDef _solver_methods[] = {
+    {"add_clause",  (PyCFunction) _solver_add_clause,  METH_O, _solver_add_clause_docstring},
+    {"add_clauses", (PyCFunction) _solver_add_clauses, METH_O, _solver_add_clauses_docstring},
+    {"solve",       (PyCFunction) _solver_solve,       METH_VARARGS | METH_KEYWORDS, _solver_solve_docstring},
+    {"push",        (PyCFunction) _solver_push,        METH_NOARGS, _solver_push_docstring},
+    {"pop",         (PyCFunction) _solver_pop,         METH_NOARGS, _solver_pop_docstring},
+
+    /* sentinel */
+    {NULL, NULL, 0, NULL}
+};
+
+
+static PyGetSetDef _solver_getset[] = {
+    {"nvars", (getter) _solver_get_nvars, NULL, "Number of variables", NULL},
+    {"depth", (getter) _solver_get_depth, NULL, "Number of open contexts", NULL},
+    {"model", (getter) _solver_get_model, NULL, "Model of the last call to solve, or None", NULL},
+
+    /* sentinel */
+    {NULL, NULL, NULL, NULL, NULL}
+};
+
+
+/* Solver.__class__ */
+static PyTypeObject
+Solver_T = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+
+    "Solver",                           /* tp_name */
+    sizeof(_solver_state),              /* tp_basicsize */
+    0,                                  /* tp_itemsize */
+    (destructor) _solver_dealloc,       /* tp_dealloc */
+    0,                                  /* tp_print */
+    0,                                  /* tp_getattr */
+    0,                                  /* tp_setattr */
+    0,                                  /* tp_reserved */
+    0,                                  /* tp_repr */
+    0,                                  /* tp_as_number */
+    0,                                  /* tp_as_sequence */
+    0,                                  /* tp_as_mapping */
+    0,                                  /* tp_hash */
+    0,                                  /* tp_call */
+    0,                                  /* tp_str */
+    0,                                  /* tp_getattro */
+    0,                                  /* tp_setattro */
+    0,                                  /* tp_as_buffer */
+    Py_TPFLAGS_DEFAULT,                 /* tp_flags */
+    _solver_docstring,                  /* tp_doc */
+    0,                                  /* tp_traverse */
+    0,                                  /* tp_clear */
+    0,                                  /* tp_richcompare */
+    0,                                  /* tp_weaklistoffset */
+    0,                                  /* tp_iter */
+    0,                                  /* tp_iternext */
+    _solver_methods,                    /* tp_methods */
+    0,                                  /* tp_members */
+    _solver_getset,                     /* tp_getset */
+    0,                                  /* tp_base */
+    0,                                  /* tp_dict */
+    0,                                  /* tp_descr_get */
+    0,                                  /* tp_descr_set */
+    0,                                  /* tp_dictoffset */
+    0,                                  /* tp_init */
+    PyType_GenericAlloc,                /* tp_alloc */
+    (newfunc) _solver_new,              /* tp_new */
+};
+
+
 /*
 ** picosat module definition
 */
@@ -662,6 +1206,9 @@ Exceptions:\n\
 Interface Functions:\n\
     satisfy_one\n\
     satisfy_all\n\
+\n\
+Interface Types:\n\
+    Solver\n\
 "
 );
 
@@ -715,10 +1262,19 @@ PyInit_picosat(void)
     if (PyModule_AddObject(m, "satisfy_all", (PyObject *) &SatisfyAll_T) < 0)
         goto decref_satisfy_all;
 
+    /* Create picosat.Solver */
+    if (PyType_Ready(&Solver_T) < 0)
+        goto decref_satisfy_all;
+    Py_INCREF((PyObject *) &Solver_T);
+    if (PyModule_AddObject(m, "Solver", (PyObject *) &Solver_T) < 0)
+        goto decref_Solver;
+
     /* Success! */
     return m;
 
 /* Error! */
+decref_Solver:
+    Py_DECREF((PyObject *) &Solver_T);
 decref_satisfy_all:
     Py_DECREF((PyObject *) &SatisfyAll_T);
 decref_Error:
@@ -3,10 +3,29 @@ Test binary decision diagrams
 """
 
 
-from pyeda.boolalg.bdd import (BDDNODEONE, BDDNODEZERO, BinaryDecisionDiagram,
-                               bdd2expr, bddvar, expr2bdd, ite,
-                               upoint2bddpoint)
-from pyeda.boolalg.expr import AndOp, OrOp, expr
+import collections
+import functools
+import io
+import itertools
+import operator
+import random
+import struct
+
+import pytest
+
+from pyeda.boolalg import bdd
+from pyeda.boolalg.bdd import (_STORE, BDDNODEONE, BDDNODEZERO,
+                               BDDManager, BinaryDecisionDiagram, _ArrayNodeStore,
+                               _find_path, _ite, _Reorderer, _restrict,
+                               add_node_callback, and_exists, bdd2expr,
+                               bddvar, cache_clear, cache_info, constrain,
+                               dump, load, expr2bdd, ite,
+                               remove_node_callback, reorder, set_cache_size,
+                               set_reorder_threshold, simplify_with_dont_cares,
+                               stats, stats_clear, upoint2bddpoint, var_order)
+from pyeda.boolalg.boolfunc import Function
+from pyeda.boolalg.expr import (AndOp, Equal, ITE, Implies, Not, OrOp, Xor,
+                                expr, exprvar)
 
 zero = BinaryDecisionDiagram.box(0)
 one = BinaryDecisionDiagram.box(1)
@@ -44,6 +63,32 @@ def test_expr2bdd():
     assert f.node.hi.hi.hi == BDDNODEONE
 
 
+def test_expr2bdd_structural():
+    ea, eb, ec, ed = map(exprvar, "abcd")
+    exs = [
+        Xor(ea, eb, ec, simplify=False),
+        Equal(ea, ~eb, ec, simplify=False),
+        Implies(ea & eb, ec | ~ed, simplify=False),
+        ITE(ea, eb ^ ec, ~ed, simplify=False),
+        Not(Equal(ea, eb) | ea & ~ec, simplify=False),
+        # Shared sub-expressions
+        (ea ^ eb) & (ec | (ea ^ eb)) | ~(ea ^ eb) & ed,
+    ]
+    for ex in exs:
+        f = expr2bdd(ex)
+        for point in f.iter_domain():
+            epoint = {exprvar(v.names, v.indices): val
+                      for v, val in point.items()}
+            assert f.restrict(point) is expr2bdd(ex.restrict(epoint))
+
+    # Parity is exponential in Shannon expansion of the expression
+    xs = [exprvar("px", i) for i in range(200)]
+    f = expr2bdd(Xor(*xs))
+    assert f is functools.reduce(operator.xor,
+                                 [bddvar("px", i) for i in range(200)])
+    assert len(list(f.dfs_preorder())) == 2 * 200 + 1
+
+
 def test_bdd2expr():
     ex = bdd2expr(a ^ b ^ c, conj=False)
     assert ex.equivalent(expr("a ^ b ^ c"))
@@ -54,6 +99,29 @@ def test_bdd2expr():
     assert isinstance(ex, AndOp) and ex.depth == 2
 
 
+def test_bdd2expr_isop():
+    assert bdd2expr(zero, isop=True).is_zero()
+    assert bdd2expr(one, conj=True, isop=True).is_one()
+    fs = [a & b | c & d | w & x, a ^ b ^ c, ~a | b, ~(a & b | c & ~d),
+          a & b | a & c | b & c | ~d & w]
+    for f in fs:
+        sop = bdd2expr(f, isop=True)
+        pos = bdd2expr(f, conj=True, isop=True)
+        assert expr2bdd(sop) is f and expr2bdd(pos) is f
+        assert sop.depth <= 2 and pos.depth <= 2
+        # Irredundant: no term or literal can be removed
+        terms = [expr2bdd(t) for t in sop.xs] if isinstance(sop, OrOp) else []
+        for i, term in enumerate(terms):
+            rest = functools.reduce(operator.or_, terms[:i] + terms[i+1:], zero)
+            assert rest is not f
+            for v in term.support:
+                assert ~f & term.smoothing(v) is not zero
+    # Paths repeat literals of shared nodes
+    f = a & b | c & d | w & x
+    assert len(bdd2expr(f, isop=True).xs) == 3
+    assert len(bdd2expr(f).xs) == 7
+
+
 def test_upoint2bddpoint():
     upoint = (frozenset([a.uniqid, c.uniqid]), frozenset([b.uniqid, d.uniqid]))
     assert upoint2bddpoint(upoint) == {a: 0, b: 1, c: 0, d: 1}
@@ -103,7 +171,7 @@ def test_boolfunc():
                {a: 1, b: 0, c: 1},
                {a: 1, b: 1}
            ]
-    assert g.satisfy_count() == 3
+    assert g.satisfy_count() == 4
     assert g.satisfy_one() == {a: 0, b: 1, c: 1}
 
     # is_zero, is_one
@@ -143,7 +211,515 @@ def test_satisfy():
                {a: 1, b: 0, c: 1},
                {a: 1, b: 1}
            ]
-    assert f.satisfy_count() == 3
+    assert f.satisfy_count() == 4
     assert f.satisfy_one() == {a: 0, b: 1, c: 1}
     assert (a & ~a).satisfy_one() is None
     assert (a | ~a).satisfy_one() == {}
+
+
+def test_satisfy_cubes():
+    assert not list(zero.satisfy_cubes())
+    assert list(one.satisfy_cubes()) == [{}]
+    for f in (a & b | c, a ^ b ^ c ^ d, ~a | b & ~w | c & x & y):
+        cubes = list(f.satisfy_cubes())
+        assert sum(2 ** (len(f.support) - len(cube))
+                   for cube in cubes) == f.satisfy_count()
+        for cube in cubes:
+            assert f.restrict(cube) is one
+        for c1, c2 in itertools.combinations(cubes, 2):
+            assert any(c1[v] != c2[v] for v in set(c1) & set(c2))
+
+
+def test_satisfy_random():
+    assert not list(zero.satisfy_random())
+    assert next(one.satisfy_random()) == {}
+
+    rng = random.Random(42)
+    f = a & b | ~a & c & d | w & ~x
+    num = f.satisfy_count()
+    counts = collections.Counter()
+    for point in itertools.islice(f.satisfy_random(rng), 200 * num):
+        assert set(point) == f.support
+        assert f.restrict(point) is one
+        counts[tuple(sorted(point.items()))] += 1
+    # Every point appears, with roughly the same frequency
+    assert len(counts) == num
+    assert all(100 < cnt < 300 for cnt in counts.values())
+
+    # Skipped variables are random too
+    points = list(itertools.islice((a | d).satisfy_random(rng), 300))
+    assert {(p[a], p[d]) for p in points} == {(0, 1), (1, 0), (1, 1)}
+
+
+def test_satisfy_count():
+    assert zero.satisfy_count() == 0
+    assert one.satisfy_count() == 1
+    assert a.satisfy_count() == 1
+    assert (~a).satisfy_count() == 1
+    # Paths skip levels
+    for f in (a | b & c ^ d, ~(a & d) | b & ~c, a ^ b ^ ~c ^ d, ~a & ~d):
+        count = sum(f.restrict(point).is_one() for point in f.iter_domain())
+        assert f.satisfy_count() == count
+    # Far too many points to enumerate
+    xs = [bddvar("sc", i) for i in range(60)]
+    f = functools.reduce(operator.or_, xs)
+    assert f.satisfy_count() == 2**60 - 1
+    assert (f & ~xs[0]).satisfy_count() == 2**59 - 1
+
+    g = a & b | ~c
+    assert g.weighted_count({}) == g.satisfy_count() == 5
+    assert g.weighted_count({a: 0.5, b: 0.5, c: 0.5}) == 0.625
+    # (1 + 2) * (1 + 1) * (1 - 3) + 2 * 1 * 3
+    assert g.weighted_count({a: (1, 2), c: 3}) == -6
+    assert one.weighted_count({}) == 1
+    assert zero.weighted_count({a: 0.5}) == 0
+
+
+def test_compose():
+    # Substitutions are simultaneous
+    assert (a & ~b).compose({a: b, b: a}) is b & ~a
+    assert (a ^ b).compose({a: 1, c: d}) is ~b
+    assert (a ^ b).compose({}) is a ^ b
+    fs = [a & b | ~a & c & d, a ^ b ^ c ^ d, ~(a & w) | b & x ^ c & y]
+    for f in fs:
+        for g in (zero, one, w, x & ~y, ~(c ^ z)):
+            f0, f1 = f.restrict({a: 0}), f.restrict({a: 1})
+            assert f.compose({a: g}) is ite(g, f1, f0)
+            assert (~f).compose({a: g}) is ~ite(g, f1, f0)
+
+    # x[i] := x[i+1]
+    xs = [bddvar("cx", i) for i in range(200)]
+    f = functools.reduce(operator.xor, xs)
+    g = f.compose({x: y for x, y in zip(xs, xs[1:])})
+    assert g is functools.reduce(operator.xor, xs[1:-1])
+
+
+def test_quantify():
+    fs = [a & b | ~a & c & d, a ^ b ^ c ^ d, (a | ~b) & (c | ~d) | w & x,
+          ~(a & w) | b & x ^ c & y]
+    for f, g in itertools.product(fs, repeat=2):
+        for vs in ([a], [a, c], [b, d, x], [a, b, c, d, w, x, y]):
+            assert f.exists(vs) is Function.smoothing(f, vs)
+            assert f.forall(vs) is Function.consensus(f, vs)
+            assert and_exists(f, g, vs) is (f & g).exists(vs)
+    assert f.smoothing() is f.consensus() is f
+    assert f.exists(z) is f.forall(z) is f
+    assert and_exists(a, ~a, [b]) is zero
+    assert and_exists(one, a & b, [a]) is b
+    assert and_exists(a, b, []) is a & b
+
+    # Quantify too many variables to enumerate cofactors
+    xs, ys = zip(*[(bddvar("qx", i), bddvar("qy", i)) for i in range(40)])
+    # x[i] => y[i]
+    rel = functools.reduce(operator.and_, (~x | y for x, y in zip(xs, ys)))
+    init = functools.reduce(operator.and_, xs)
+    assert and_exists(init, rel, xs) is functools.reduce(operator.and_, ys)
+    assert rel.exists(ys) is one
+    assert rel.forall(ys) is functools.reduce(operator.and_, (~x for x in xs))
+
+
+def test_care_set():
+    fs = [a & b | ~a & c & d, a ^ b ^ c ^ d, (a | ~b) & (c | ~d) | w & x,
+          ~(a & w) | b & x ^ c & y]
+    cs = [a, ~b & c, a | d, b ^ w, (a | x) & (~c | y), one] + fs
+    for f, c_ in itertools.product(fs, cs):
+        g = constrain(f, c_)
+        h = simplify_with_dont_cares(f, c_)
+        assert g & c_ is f & c_
+        assert h & c_ is f & c_
+        assert h.support <= f.support
+        assert constrain(~f, c_) is ~g
+        assert simplify_with_dont_cares(~f, c_) is ~h
+    # Generalized cofactors by cubes are cofactors
+    assert constrain(fs[0], a & ~c) is fs[0].restrict({a: 1, c: 0})
+    assert constrain(a, zero) is zero
+    assert simplify_with_dont_cares(a, zero) is zero
+    assert constrain(a & b, a & b) is one
+    assert simplify_with_dont_cares(a & b, ~(a & b)) is zero
+
+    # Simplify a frontier against the reached set
+    xs = [bddvar("cs", i) for i in range(8)]
+    reached = functools.reduce(operator.and_, xs[:4])
+    frontier = reached & (xs[4] ^ xs[5] ^ xs[6]) | ~reached & xs[7]
+    assert simplify_with_dont_cares(frontier, reached) is xs[4] ^ xs[5] ^ xs[6]
+
+
+def test_dump_load():
+    v = bddvar(("v", "dl"), (1, 2))
+    f = a & b | c & v
+    bdds = [f, ~f, a ^ b ^ v, f & d, zero, one, v]
+    buf = io.BytesIO()
+    dump(bdds, buf)
+    assert buf.getvalue().startswith(b"PYEDABDD")
+    buf.seek(0)
+    assert load(buf) == bdds
+
+    # Shared nodes are written once
+    buf1, buf2 = io.BytesIO(), io.BytesIO()
+    dump([f], buf1)
+    dump([f, ~f, f], buf2)
+    assert len(buf2.getvalue()) - len(buf1.getvalue()) == 8
+
+    buf = io.BytesIO()
+    dump([], buf)
+    buf.seek(0)
+    assert load(buf) == []
+
+    # Variables are listed from top to bottom: b, then a.
+    # Nodes: 1 = a, 2 = ITE(b, 0, a)
+    pack = struct.pack
+    data = b"PYEDABDD" + pack("<II", 1, 2)
+    for name in ("b", "a"):
+        data += pack("<II", 1, 1) + name.encode() + pack("<I", 0)
+    data += pack("<I", 2) + pack("<III", 1, 1, 0) + pack("<III", 0, 2, 1)
+    data += pack("<II", 1, 4)
+    # The file order does not agree with the current order
+    assert load(io.BytesIO(data)) == [~b & a]
+
+    with pytest.raises(ValueError):
+        load(io.BytesIO(b"PYEDAXDD"))
+    with pytest.raises(ValueError):
+        load(io.BytesIO(b"PYEDABDD" + pack("<I", 2)))
+    with pytest.raises(ValueError):
+        load(io.BytesIO(data[:-2]))
+    with pytest.raises(ValueError):
+        # Forward reference
+        load(io.BytesIO(data.replace(pack("<III", 1, 1, 0),
+                                     pack("<III", 1, 4, 0))))
+
+
+def test_load_gc(monkeypatch):
+    with BDDManager(store="array") as mgr:
+        xs = [mgr.bddvar("lg", i) for i in range(8)]
+        f = xs[0] & xs[1] | xs[2] & xs[3]
+        g = (xs[4] ^ xs[5]) & (xs[6] | xs[7])
+        buf = io.BytesIO()
+        dump([f, g], buf)
+        counts = [f.satisfy_count(), g.satisfy_count()]
+
+    # Wrapping the first root crosses the GC threshold,
+    # which must not reclaim the nodes of the second root.
+    monkeypatch.setattr(bdd, "_GC_THRESHOLD", 1)
+    with BDDManager(store="array") as mgr:
+        buf.seek(0)
+        bdds = mgr.load(buf)
+        assert mgr.store._gc_threshold > 1
+        assert [h.satisfy_count() for h in bdds] == counts
+
+
+def test_computed_table():
+    cache_clear()
+    info = cache_info()
+    assert info.hits == 0 and info.misses == 0 and info.currsize == 0
+
+    f = a & b | c & d
+    misses = cache_info().misses
+    assert misses > 0
+    assert cache_info().currsize > 0
+
+    # Recomputing an identical function hits the cache
+    assert a & b | c & d is f
+    assert cache_info().hits > 0
+    assert cache_info().misses == misses
+
+    # Capacity is bounded
+    set_cache_size(4)
+    assert cache_info().currsize <= 4
+    _ = a ^ b ^ c ^ d ^ w ^ x
+    assert cache_info().currsize <= 4
+    assert a ^ b ^ c ^ d ^ w ^ x is _
+
+    set_cache_size(2**18)
+    cache_clear()
+    assert cache_info() == (0, 0, 2**18, 0)
+
+
+def test_stats():
+    stats_clear()
+    info = stats()
+    assert info.ops == {}
+    assert info.peak_nodes == info.nodes == len(_STORE)
+
+    xs = [bddvar("st", i) for i in range(8)]
+    f = _pairs(xs[:4], xs[4:])
+    g = ite(xs[0], f, ~f)
+    info = stats()
+    assert info.ops["and"].calls == 4
+    assert info.ops["or"].calls == 3
+    assert info.ops["ite"].calls == 1
+    assert info.ops["ite"].time >= 0.0
+    assert info.peak_nodes >= info.nodes
+    assert info.cache == cache_info()
+    assert info.load_factor == _STORE.load_factor()
+    del f, g
+
+    # Callbacks fire once per crossing
+    counts = []
+    threshold = len(_STORE) + 5
+    add_node_callback(threshold, counts.append)
+    f = xs[0] ^ xs[1] ^ xs[2] ^ xs[3] ^ xs[4] ^ xs[5]
+    assert len(counts) == 1 and counts[0] > threshold
+    g = f ^ xs[6] ^ xs[7]
+    assert len(counts) == 1
+    remove_node_callback(counts.append)
+    with pytest.raises(TypeError):
+        add_node_callback(1.0, counts.append)
+    with pytest.raises(ValueError):
+        add_node_callback(-1, counts.append)
+
+    def abort(nodes):
+        raise MemoryError(nodes)
+
+    add_node_callback(0, abort)
+    with pytest.raises(MemoryError):
+        _ = xs[1] & ~xs[3] & xs[5]
+    remove_node_callback(abort)
+    assert not _STORE.callbacks
+
+    with pytest.raises(TypeError):
+        set_cache_size(1.0)
+    with pytest.raises(ValueError):
+        set_cache_size(-1)
+
+
+def test_manager():
+    num_nodes = len(_STORE)
+    stats_clear()
+    with BDDManager() as mgr:
+        ma, mb, mc = map(mgr.bddvar, "abc")
+        assert ma.manager is mgr and a.manager is not mgr
+        assert ma is not a and ma.uniqid == a.uniqid
+        f = ma & mb | ~mc
+        assert len(_STORE) == num_nodes
+        assert mgr.stats().ops["and"].calls == 1
+        assert stats().ops == {}
+        assert f.satisfy_count() == (a & b | ~c).satisfy_count()
+        assert mgr.expr2bdd(expr("a & b | ~c")) is f
+        assert mgr.var_order() == (ma, mb, mc)
+
+        # Constants are shared by value
+        assert f & 1 is f and f | zero is f
+        assert (ma | one).is_one() and (ma | one) is mgr.one
+        assert ite(ma, 1, mb) is ma | mb
+        assert mgr.box(one) is mgr.one
+
+        # Operators on its own constants stay in the manager
+        assert ite(mgr.one, mgr.zero, mgr.one) is mgr.zero
+        assert ite(mgr.one, mgr.zero, mgr.one) & ma is mgr.zero
+        assert constrain(mgr.one, mgr.one) is mgr.one
+        assert simplify_with_dont_cares(mgr.zero, mgr.one) is mgr.zero
+        assert and_exists(mgr.one, mgr.one, [mb]) is mgr.one
+        assert and_exists(1, 1, [mb]) is mgr.one
+
+        # BDDs of different managers do not mix
+        with pytest.raises(ValueError):
+            _ = ma & a
+        with pytest.raises(ValueError):
+            ite(ma, a, mb)
+        with pytest.raises(ValueError):
+            mgr.box(a)
+        with pytest.raises(ValueError):
+            and_exists(mgr.one, mgr.one, [b])
+        with pytest.raises(ValueError):
+            ma.exists([a])
+
+        # Reordering is independent
+        mgr.reorder()
+        assert f.satisfy_count() == 5
+
+    assert mgr.closed
+    with pytest.raises(RuntimeError):
+        _ = f & ma
+    with pytest.raises(RuntimeError):
+        mgr.bddvar("d")
+    mgr.close()
+
+    with pytest.raises(ValueError):
+        BDDManager(store="foo")
+    with pytest.raises(RuntimeError):
+        a.manager.close()
+
+
+def test_complement_edges():
+    f = a & b | c ^ d
+    num_nodes = len(_STORE)
+
+    g = ~f
+    assert ~g is f
+    assert g.node is not f.node
+    # A function and its inverse share all nodes
+    assert len(_STORE) == num_nodes
+
+    assert g is expr2bdd(expr("~(a & b | c ^ d)"))
+    assert g.node.root == f.node.root
+    assert g.node.lo is (~f.restrict({a: 0})).node
+    assert g.node.hi is (~f.restrict({a: 1})).node
+    assert g.restrict({a: 1, b: 1}) is zero
+    assert list(g.satisfy_all()) == list((~f).satisfy_all())
+
+    assert ~zero is one and ~one is zero
+    assert BDDNODEZERO.lo is None and BDDNODEZERO.hi is None
+    assert (a ^ b ^ c) is ~(a ^ b ^ ~c)
+    assert (a ^ b) & ~(a ^ b) is zero
+
+
+def test_deep():
+    # Deeper than the default interpreter recursion limit
+    xs = [bddvar("deep", i) for i in range(5000)]
+    f = functools.reduce(lambda f, x: x & f, reversed(xs))
+    g = functools.reduce(lambda f, x: x ^ f, reversed(xs))
+
+    point = f.satisfy_one()
+    assert len(point) == len(xs) and all(point.values())
+    assert f.restrict({xs[-1]: 0}) is zero
+    assert f.restrict({xs[0]: 1}) is xs[1] & f.restrict({xs[0]: 1, xs[1]: 1})
+    assert len(list(f.dfs_preorder())) == len(xs) + 2
+    assert len(list(f.dfs_postorder())) == len(xs) + 2
+    assert len(list(g.dfs_postorder())) == 2 * len(xs) + 1
+    # Even parity
+    assert f & g is zero
+    assert list((f & ~g).satisfy_all()) == [point]
+    assert (f | ~g).restrict(next((f | ~g).satisfy_all())) is one
+
+    h = functools.reduce(lambda f, x: x & f, reversed(xs[:1500]))
+    assert expr2bdd(bdd2expr(h)) is h
+    assert expr2bdd(bdd2expr(h, isop=True)) is h
+
+
+def _array_eval(st, edge, point):
+    """Evaluate an array store edge at a point of uniqid => {0, 1}."""
+    while st.root(edge) > 0:
+        lo, hi = st.children(edge)
+        edge = hi if point[st.root(edge)] else lo
+    return int(edge == st.one)
+
+
+def test_array_store():
+    st = _ArrayNodeStore()
+    assert st.neg(st.zero) == st.one
+    assert st.root(st.zero) == -1 and st.root(st.one) == -2
+    assert st.children(st.one) == (None, None)
+
+    va, vb, vc, vd = [st.mk(v.uniqid, st.zero, st.one) for v in (a, b, c, d)]
+    assert st.mk(a.uniqid, st.zero, st.one) == va
+    assert len(st) == 4
+
+    f = _ite(st, va, vb, vc)
+    g = _ite(st, _ite(st, va, vb, st.zero), st.one,
+             _ite(st, st.neg(va), vc, st.zero))
+    assert f == g
+    assert _ite(st, f, st.zero, st.one) == st.neg(f)
+
+    # Negation does not create nodes
+    num_nodes = len(st)
+    h = st.neg(_ite(st, f, st.neg(vd), vd))
+    assert len(st) == num_nodes + 3
+    assert st.neg(h) == _ite(st, f, st.neg(vd), vd)
+
+    uniqids = [v.uniqid for v in (a, b, c, d)]
+    points = [dict(zip(uniqids, vals))
+              for vals in itertools.product((0, 1), repeat=4)]
+    h_vals = [_array_eval(st, h, point) for point in points]
+    for vals in itertools.product((0, 1), repeat=4):
+        point = dict(zip(uniqids, vals))
+        va_, vb_, vc_, vd_ = vals
+        assert _array_eval(st, f, point) == (vb_ if va_ else vc_)
+        assert _array_eval(st, h, point) == 1 - (_array_eval(st, f, point) ^ vd_)
+
+    npoint = {a.uniqid: st.one}
+    assert _restrict(st, f, npoint, frozenset(npoint.items())) == vb
+    assert _find_path(st, st.neg(f), st.one)[-1] == st.one
+
+    # The unique table grows
+    xs = [st.mk(uniqid, st.zero, st.one) for uniqid in range(1000, 2000)]
+    parity = functools.reduce(lambda f, x: _ite(st, x, st.neg(f), f),
+                              reversed(xs))
+    assert len(st) > 2000
+
+    # Garbage collection keeps nodes reachable from roots and views
+    view = st.view(h)
+    assert view.root == a.uniqid
+    assert view.lo is st.view(st.children(h)[0])
+    st.collect([parity])
+    assert len(st) == 1000 + 4
+    assert [_array_eval(st, h, point) for point in points] == h_vals
+    assert st.mk(1999, st.zero, st.one) == xs[-1]
+    del view
+    st.collect([])
+    assert len(st) == 0
+    assert st.mk(a.uniqid, st.zero, st.one) == 2
+
+
+def _pairs(xs, ys):
+    """Return x0 & y0 | x1 & y1 | ..."""
+    return functools.reduce(operator.or_, (x & y for x, y in zip(xs, ys)))
+
+
+def test_reorder():
+    # The best order interleaves the x and y variables
+    xs = [bddvar("ro_x", i) for i in range(5)]
+    ys = [bddvar("ro_y", i) for i in range(5)]
+    f = _pairs(xs, ys)
+    g = ~f & xs[0]
+    points = [dict(zip(xs + ys, vals))
+              for vals in itertools.product((0, 1), repeat=10)]
+    f_vals = [f.restrict(point) for point in points]
+    g_vals = [g.restrict(point) for point in points]
+    assert len(list(f.dfs_preorder())) == 64
+
+    reorder()
+    order = [v for v in var_order() if v in f.support]
+    assert order == [v for xy in zip(xs, ys) for v in xy]
+    assert len(list(f.dfs_preorder())) == 12
+    # Existing BDDs remain valid
+    assert [f.restrict(point) for point in points] == f_vals
+    assert [g.restrict(point) for point in points] == g_vals
+    assert _pairs(xs, ys) is f
+    assert ~f & xs[0] is g
+    assert expr2bdd(bdd2expr(f)) is f
+
+    # A window permutation does not increase the size
+    for method in ("window2", "window3"):
+        reorder(method)
+        assert len(list(f.dfs_preorder())) == 12
+        assert _pairs(xs, ys) is f
+
+    with pytest.raises(ValueError):
+        reorder("random")
+
+
+def test_reorder_threshold():
+    xs = [bddvar("rt_x", i) for i in range(8)]
+    ys = [bddvar("rt_y", i) for i in range(8)]
+    set_reorder_threshold(len(_STORE) + 64)
+    try:
+        f = _pairs(xs, ys)
+    finally:
+        set_reorder_threshold(None)
+    assert len(list(f.dfs_preorder())) < 2**8
+    assert f.restrict({x: 0 for x in xs}) is zero
+    assert f.restrict({xs[3]: 1, ys[3]: 1}) is one
+
+    with pytest.raises(TypeError):
+        set_reorder_threshold(1.0)
+    with pytest.raises(ValueError):
+        set_reorder_threshold(-1)
+
+
+def test_array_reorder():
+    st = _ArrayNodeStore()
+    xs = [st.mk(uniqid, st.zero, st.one) for uniqid in range(1, 6)]
+    ys = [st.mk(uniqid, st.zero, st.one) for uniqid in range(6, 11)]
+    f = functools.reduce(lambda f, xy: _ite(st, _ite(st, *xy, st.zero),
+                                            st.one, f),
+                         zip(xs, ys), st.zero)
+    points = [dict(zip(range(1, 11), vals))
+              for vals in itertools.product((0, 1), repeat=10)]
+    f_vals = [_array_eval(st, f, point) for point in points]
+
+    reorderer = _Reorderer(st, [f])
+    reorderer.sift()
+    # Only the nodes of f remain, and the variable nodes are freed
+    assert reorderer.size == len(st) == 10
+    assert st.order == [1, 6, 2, 7, 3, 8, 4, 9, 5, 10]
+    assert [_array_eval(st, f, point) for point in points] == f_vals
@@ -3,13 +3,19 @@ Test expression Boolean functions
 """
 
 
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
+from pyeda.boolalg import exprnode, picosat
 from pyeda.boolalg.bfarray import exprvars
+from pyeda.boolalg.boolfunc import iter_points
 from pyeda.boolalg.expr import (ITE, AchillesHeel, And, Equal, Expression,
                                 Implies, Majority, Mux, Nand, NHot, Nor, Not,
                                 One, OneHot, OneHot0, Or, Unequal, Xnor, Xor,
-                                Zero, expr, expr2dimacssat, exprvar)
+                                Zero, expr, expr2dimacscnf, expr2dimacssat,
+                                exprvar, set_unique_table)
+from pyeda.logic.addition import kogge_stone_add, ripple_carry_add
 
 a, b, c, d, e, p, q, s = map(exprvar, "abcdepqs")
 
@@ -707,13 +713,16 @@ def test_satisfy():
     f = (a | b | c) & (~a | ~b | c)
     assert f.satisfy_one() == {a: 0, b: 0, c: 1}
 
-    points = list(Xor(a, b, c).satisfy_all())
+    points = list(Xor(a, b, c).satisfy_all(solver="backtrack"))
     assert points == [
         {a: 0, b: 0, c: 1},
         {a: 0, b: 1, c: 0},
         {a: 1, b: 0, c: 0},
         {a: 1, b: 1, c: 1},
     ]
+    assert sorted(tuple(sorted(point.items()))
+                  for point in Xor(a, b, c).satisfy_all()) == \
+           [tuple(sorted(point.items())) for point in points]
     assert Xor(a, b, c).satisfy_count() == 4
 
     # CNF SAT UNSAT
@@ -732,6 +741,8 @@ def test_satisfy():
     with a & ~b:
         assert f.satisfy_one() == {a: 1, b: 0, c: 0}
         assert g.satisfy_one() == {a: 1, b: 0, c: 0}
+    with a, ~b:
+        assert g.satisfy_one(solver="backtrack") == {a: 1, b: 0, c: 0}
 
 
 def test_depth():
@@ -786,3 +797,184 @@ def test_complete_sum():
     f = ~v&x&y&z | ~v&~w&x | ~v&~x&~z | ~v&w&x&z | ~w&y&~z | v&~w&z | v&w&~x&z
     cs = ~v&~w&x | v&~w&y | ~v&~w&~z | v&~w&z | ~v&~x&~z | ~v&x&z | v&~x&z | ~w&x&y | ~w&x&z | ~w&y&~z
     assert f.complete_sum().equivalent(cs)
+
+
+def test_unique_table():
+    f = Or(a, b, simplify=False)
+    assert Or(a, b, simplify=False).node.id() != f.node.id()
+
+    set_unique_table(True)
+    try:
+        assert exprnode.unique_info()[0]
+        g = Or(a, b, simplify=False)
+        assert Or(a, b, simplify=False).node.id() == g.node.id()
+        assert Or(b, a, simplify=False).node.id() != g.node.id()
+        assert f.node.id() != g.node.id()
+        h1 = Xor(g, And(g, c, simplify=False), simplify=False)
+        h2 = Xor(g, And(g, c, simplify=False), simplify=False)
+        assert h1.node.id() == h2.node.id()
+        assert h1.to_cnf().node.id() == h2.to_cnf().node.id()
+        assert h1.to_cnf().equivalent(Xor(a | b, (a | b) & c))
+        assert exprnode.unique_info()[1] >= 3
+    finally:
+        set_unique_table(False)
+
+    assert exprnode.unique_info() == (False, 0)
+    assert Or(a, b, simplify=False).node.id() != g.node.id()
+
+
+def test_shared_transform():
+    # Tree size is 2**60, but the DAG is linear
+    xs = exprvars("m", 61)
+    f = xs[0]
+    for x in xs[1:]:
+        f = And(Or(f, x, simplify=False), Or(f, ~x, simplify=False),
+                simplify=False)
+    assert f.restrict({x: 1 for x in xs[1:]}) is xs[0]
+    assert f.restrict({xs[0]: 1}) is One
+    assert f.simplify().simple
+    g = (~f).to_nnf()
+    assert g.restrict({x: 1 for x in xs[1:]}) is ~xs[0]
+
+
+def test_parallel_transform():
+    # Every property shares its variables with its neighbors
+    fs = [Or(Xor(X[i % 16], X[(i+1) % 16]), Equal(X[(i+2) % 16], ~X[(i+3) % 16]),
+             Implies(X[(i+4) % 16], Y[i % 16, 0, 0]), simplify=False)
+          for i in range(64)]
+
+    def convert(f):
+        return (f.simplify().to_ast(), f.to_nnf().to_ast(),
+                f.to_dnf().to_ast(), f.to_cnf().to_ast(),
+                f.complete_sum().to_ast())
+
+    expected = [convert(f) for f in fs]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for _ in range(4):
+            assert list(executor.map(convert, fs)) == expected
+
+
+def _split_clauses(clauses):
+    clause = []
+    for lit in clauses:
+        if lit:
+            clause.append(lit)
+        else:
+            yield clause
+            clause = []
+
+
+def test_encode_tseitin():
+    assert list(Zero.encode_tseitin()[2]) == [0]
+    assert list(One.encode_tseitin()[2]) == []
+
+    litmap, nvars, clauses = (~a).encode_tseitin()
+    assert litmap[1] is a and nvars == 1
+    assert list(clauses) == [-1, 0]
+
+    fs = [
+        Xor(a, Implies(b, c)),
+        Equal(a, ~b, Or(c, d), simplify=False),
+        ITE(s, Xor(a, b, c), Nand(p, q, ~a)),
+        Or(And(a, b), And(a, b, simplify=False), Not(Xor(p, q)), simplify=False),
+    ]
+    for f in fs:
+        litmap, nvars, clauses = f.encode_tseitin()
+        assert [litmap[i] for i in range(1, len(f.inputs)+1)] == list(f.inputs)
+
+        # Every model of f extends to exactly one model of the clauses
+        points = {tuple(sorted(point.items()))
+                  for point in iter_points(f.inputs) if f.restrict(point) is One}
+        solns = list(picosat.satisfy_all(nvars, list(_split_clauses(clauses)),
+                                         0, 2, -1, -1, 1))
+        assert len(solns) == len(points)
+        assert {tuple(sorted((litmap[i], int(val > 0))
+                             for i, val in enumerate(soln[:len(f.inputs)], start=1)))
+                for soln in solns} == points
+
+
+def _true_points(f):
+    return {tuple(sorted(point.items()))
+            for point in iter_points(f.inputs) if f.restrict(point) is One}
+
+
+def test_encode_polarity():
+    fs = [
+        Xor(a, Implies(b, c)),
+        ITE(s, Xor(a, b, c), Nand(p, q, ~a)),
+        And(Or(a, b), Or(c, d), Not(Equal(a, p, q))),
+        Implies(Or(a, b), And(b, Or(a, b, simplify=False), simplify=False)),
+    ]
+    for f in fs:
+        _, _, full = f.encode_tseitin()
+        litmap, nvars, clauses = f.encode_tseitin(polarity=True)
+        assert len(clauses) < len(full)
+
+        # Satisfiable exactly where f is
+        for point in iter_points(f.inputs):
+            assumptions = [litmap[v] if val else -litmap[v]
+                           for v, val in point.items()]
+            soln = picosat.satisfy_one(nvars, list(_split_clauses(clauses)),
+                                       assumptions)
+            assert (soln is not None) == (f.restrict(point) is One)
+
+    # Structurally identical sub-expressions share one variable
+    f = Xor(Or(a, b), Or(b, a, simplify=False), c, simplify=False)
+    _, nvars, _ = f.encode_tseitin()
+    assert nvars == 3 + 1 + 2
+
+
+def test_expr2dimacscnf():
+    litmap, cnf = expr2dimacscnf(And(Or(a, b), Or(~a, c)))
+    assert cnf.nvars == 3 and cnf.nclauses == 2
+
+    litmap, cnf = expr2dimacscnf(Or(And(a, b), c))
+    assert cnf.nvars == 5
+    assert [litmap[i] for i in range(1, 4)] == [a, b, c]
+    assert 4 not in litmap
+    assert str(cnf).startswith("p cnf 5 4\n")
+
+
+def test_satisfy_picosat():
+    fs = [
+        Xor(a, b, c) | Equal(c, d),
+        ITE(a, Implies(b, c), Xor(c, d)),
+        Nand(a, Or(b, ~c), d),
+    ]
+    for f in fs:
+        assert f.restrict(f.satisfy_one(solver="picosat")) is One
+        points = [tuple(sorted(point.items()))
+                  for point in f.satisfy_all(solver="picosat")]
+        assert len(points) == len(set(points))
+        assert set(points) == _true_points(f)
+
+    f = And(a, ~a, simplify=False)
+    assert f.satisfy_one(solver="picosat") is None
+    assert not list(f.satisfy_all(solver="picosat"))
+
+    # Assumptions outside the support are kept
+    with a, ~b:
+        assert Xor(a, b, c).satisfy_one(solver="picosat") == {a: 1, b: 0, c: 0}
+        assert Xor(c, d).satisfy_one(solver="picosat") == {a: 1, b: 0, c: 0, d: 1}
+    with a:
+        assert Xor(a, b).satisfy_one(solver="picosat") == {a: 1, b: 0}
+
+    with pytest.raises(ValueError):
+        Xor(a, b).satisfy_one(solver="bogus")
+    with pytest.raises(ValueError):
+        list(Xor(a, b).satisfy_all(solver="bogus"))
+
+
+def test_satisfy_large():
+    # 128 inputs, far beyond what backtracking can finish
+    A = exprvars("a", 64)
+    B = exprvars("b", 64)
+    S1, C1 = ripple_carry_add(A, B)
+    S2, C2 = kogge_stone_add(A, B)
+    assert S1[63].equivalent(S2[63])
+    assert C1[63].equivalent(C2[63])
+
+    f = Xor(S1[40], S2[40]) | And(A[0], B[0], C1[63])
+    point = f.satisfy_one()
+    assert set(point) == set(A) | set(B)
+    assert f.restrict(point) is One
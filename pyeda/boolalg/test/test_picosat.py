@@ -3,6 +3,8 @@ Test the PicoSAT interface
 """
 
 
+from array import array
+
 import pytest
 
 from pyeda.boolalg import picosat
@@ -25,3 +27,114 @@ def test_satisfy_one():
     _, cnf = expr2dimacscnf(expr("And(a, b, c)"))
     assert picosat.satisfy_one(cnf.nvars, cnf.clauses) == (1, 1, 1)
     assert list(picosat.satisfy_all(cnf.nvars, cnf.clauses)) == [(1, 1, 1)]
+
+
+def test_satisfy_one_assumptions():
+    with pytest.raises(ValueError):
+        picosat.satisfy_one(3, ((1, 2), (-1, 3)), (4, ))
+    assert picosat.satisfy_one(3, ((1, 2), (-1, 3)), (-2, )) == (1, -1, 1)
+
+
+def test_solver():
+    solver = picosat.Solver(3)
+    assert solver.nvars == 3 and solver.depth == 0
+    assert solver.model is None
+
+    solver.add_clauses([(1, 2), (-1, 3)])
+    soln = solver.solve()
+    assert soln == solver.model
+    lits = [i * val for i, val in enumerate(soln, start=1)]
+    assert picosat.satisfy_one(3, ((1, 2), (-1, 3)), lits) == soln
+
+    # Assumptions only hold for one call
+    assert solver.solve([-2]) == (1, -1, 1)
+    assert solver.solve(assumptions=[-2, -3]) is None
+    assert solver.model is None
+    assert solver.solve([-3]) == (-1, 1, -1)
+
+    # Clauses in a context are discarded when it is closed
+    assert solver.push() == 1
+    solver.add_clause([-3])
+    assert solver.push() == 2
+    solver.add_clause((-2, ))
+    assert solver.solve() is None
+    assert solver.pop() == 1
+    assert solver.solve() == (-1, 1, -1)
+    assert solver.pop() == 0
+    assert solver.solve([1, -2]) == (1, -1, 1)
+
+    with pytest.raises(picosat.Error):
+        solver.pop()
+    with pytest.raises(ValueError):
+        solver.add_clause([4])
+    with pytest.raises(TypeError):
+        solver.add_clause([1, "bad_lit"])
+    with pytest.raises(ValueError):
+        solver.solve([-4])
+    with pytest.raises(ValueError):
+        picosat.Solver(-1)
+
+
+def test_solver_bad_input():
+    # A rejected clause adds none of its literals
+    solver = picosat.Solver(2)
+    with pytest.raises(ValueError):
+        solver.add_clause([2, 5])
+    with pytest.raises(TypeError):
+        solver.add_clause([-2, "bad_lit"])
+    solver.add_clause([1])
+    assert solver.solve(assumptions=[-1]) is None
+    assert solver.solve()[0] == 1
+
+    # Rejected assumptions are not left over for the next call
+    solver = picosat.Solver(2)
+    solver.add_clause([1, 2])
+    with pytest.raises(ValueError):
+        solver.solve([-1, -2, 7])
+    with pytest.raises(TypeError):
+        solver.solve([-1, -2, "bad_lit"])
+    assert solver.solve() is not None
+
+
+def test_cnf_solver():
+    litmap, cnf = expr2dimacscnf(expr("OneHot(a, b, c)"))
+    solver = cnf.solver()
+    for v in "abc":
+        soln = solver.solve([litmap[expr(v)]])
+        point = cnf.soln2point(soln, litmap)
+        assert [point[expr(u)] for u in "abc"] == [int(u == v) for u in "abc"]
+    assert solver.solve([litmap[expr("a")], litmap[expr("b")]]) is None
+
+
+def test_buffer_clauses():
+    lits = [1, 2, 0, -1, 3, 0]
+    packed = array("i", lits).tobytes()
+    for clauses in [array("i", lits), array("q", lits), packed,
+                    memoryview(packed).cast("i")]:
+        assert picosat.satisfy_one(3, clauses, [-2]) == (1, -1, 1)
+        assert len(list(picosat.satisfy_all(3, clauses))) == 4
+
+        solver = picosat.Solver(3)
+        solver.add_clauses(clauses)
+        assert solver.solve([-2]) == (1, -1, 1)
+
+    # No clauses at all
+    assert picosat.satisfy_one(1, b"") is not None
+
+    # An empty clause
+    assert picosat.satisfy_one(1, array("i", [0])) is None
+
+    with pytest.raises(ValueError):
+        picosat.satisfy_one(3, array("i", [1, 2]))
+    with pytest.raises(ValueError):
+        picosat.satisfy_one(3, array("i", [1, 4, 0]))
+    with pytest.raises(ValueError):
+        picosat.satisfy_one(3, b"\x01\x00\x00")
+    with pytest.raises(TypeError):
+        picosat.satisfy_one(3, array("d", [1.0, 0.0]))
+
+    # A bad buffer adds nothing
+    solver = picosat.Solver(3)
+    with pytest.raises(ValueError):
+        solver.add_clauses(array("i", [-1, 0, 4, 0]))
+    assert solver.solve([1]) is not None
@@ -0,0 +1,151 @@
+"""
+Test zero-suppressed decision diagrams
+"""
+
+
+import functools
+import itertools
+import operator
+
+import pytest
+
+from pyeda.boolalg.bdd import bddvar, reorder
+from pyeda.boolalg.zdd import (ZDDNODEONE, ZDDNODEZERO, ZeroSuppressedDD,
+                               bdd2zdd, zdd2bdd, zddvar)
+
+zero = ZeroSuppressedDD.box(0)
+one = ZeroSuppressedDD.box(1)
+a, b, c, d = map(zddvar, "abcd")
+
+
+def fam(f):
+    """Return a family as a set of frozensets of variable names."""
+    return {frozenset(str(v) for v in s) for s in f.iter_sets()}
+
+
+def test_constants():
+    assert zero.node is ZDDNODEZERO
+    assert one.node is ZDDNODEONE
+    assert ZeroSuppressedDD.box("0") is zero
+    assert ZeroSuppressedDD.box(True) is one
+    assert fam(zero) == set()
+    assert fam(one) == {frozenset()}
+    assert zero.support == frozenset()
+    assert a.support == {a}
+
+
+def test_set_ops():
+    f = a.join(b) | c
+    g = c | d | one
+    assert fam(f) == {frozenset("ab"), frozenset("c")}
+    assert fam(f | g) == {frozenset("ab"), frozenset("c"), frozenset("d"),
+                          frozenset()}
+    assert f & g is c
+    assert fam(f - g) == {frozenset("ab")}
+    assert fam(g - f) == {frozenset("d"), frozenset()}
+    assert f ^ g is (f - g) | (g - f)
+    assert f | f is f and f & f is f and f - f is zero
+    assert f | 0 is f and f & 0 is zero and 1 - one is zero
+
+    # Operations are canonical
+    assert a | b is b | a
+    assert a.join(b) is b.join(a)
+    assert (a | b).join(c | d) is (c | d).join(a | b)
+
+
+def test_join():
+    f = (a | b | one).join(b | c)
+    assert fam(f) == {frozenset("ab"), frozenset("ac"), frozenset("b"),
+                      frozenset("bc"), frozenset("c")}
+    assert f.join(one) is f
+    assert f.join(zero) is zero
+    assert a.join(a) is a
+
+
+def test_subsets():
+    f = a.join(b) | a.join(c) | b | one
+    assert fam(f.subset0(a)) == {frozenset("b"), frozenset()}
+    assert fam(f.subset1(a)) == {frozenset("b"), frozenset("c")}
+    assert fam(f.onset(a)) == {frozenset("ab"), frozenset("ac")}
+    assert f.offset(a) is f.subset0(a)
+    assert f.onset(d) is zero and f.offset(d) is f
+    assert fam(f.change(c)) == {frozenset("abc"), frozenset("a"),
+                                frozenset("bc"), frozenset("c")}
+    assert f.change(d).change(d) is f
+
+    assert f.restrict({a: 1, b: 0}) is c
+    assert f.restrict({a: 0}) is b | one
+    assert f.restrict({d: 1}) is zero
+
+
+def test_satisfy():
+    f = a.join(b) | c
+    assert f.inputs == (a, b, c)
+    assert f.satisfy_count() == 2
+    points = list(f.satisfy_all())
+    assert len(points) == 2
+    assert {a: 1, b: 1, c: 0} in points
+    assert {a: 0, b: 0, c: 1} in points
+    assert f.satisfy_one() in points
+    assert zero.satisfy_one() is None
+    assert one.satisfy_one() == {}
+    assert zero.satisfy_count() == 0
+    assert one.satisfy_count() == 1
+
+    with pytest.raises(NotImplementedError):
+        _ = ~f
+
+
+def test_bdd_conversion():
+    ba, bb, bc, bd = map(bddvar, "abcd")
+    f = ba & bb | ~ba & bc & bd
+    z = bdd2zdd(f)
+    assert fam(z) == {frozenset("ab"), frozenset("abc"), frozenset("abd"),
+                      frozenset("abcd"), frozenset("cd"), frozenset("bcd")}
+    assert z.satisfy_count() == f.satisfy_count()
+    assert zdd2bdd(z) is f
+
+    # A larger universe adds variables that must be zero
+    bw = bddvar("w")
+    assert bdd2zdd(f & ~bw, [ba, bb, bc, bd, bw]) is z
+    assert bdd2zdd(f, [ba, bb, bc, bd, bw]) is z | z.change(zddvar("w"))
+    assert zdd2bdd(z, [ba, bb, bc, bd, bw]) is f & ~bw
+    assert zdd2bdd(a, [a, b]) is ba & ~bb
+    assert bdd2zdd(ba, [ba, bb]) is a | a.join(b)
+
+    with pytest.raises(ValueError):
+        bdd2zdd(f, [ba, bb])
+    with pytest.raises(ValueError):
+        zdd2bdd(z, [a])
+
+    assert bdd2zdd(0) is zero
+    assert bdd2zdd(1) is one
+    assert zdd2bdd(zero).is_zero()
+    assert zdd2bdd(one).is_one()
+
+
+def test_bdd_conversion_reordered():
+    xs = [bddvar("rz", i) for i in range(6)]
+    f = functools.reduce(operator.or_,
+                         [xs[i] & xs[i+3] for i in range(3)])
+    z = bdd2zdd(f)
+    reorder()
+    assert bdd2zdd(f) is z
+    assert zdd2bdd(z) is f
+
+
+def test_queens():
+    n = 6
+    xs = {(r, c): bddvar("q", (r, c))
+          for r, c in itertools.product(range(n), repeat=2)}
+    f = 1
+    for r in range(n):
+        f &= functools.reduce(operator.or_, [xs[r, c] for c in range(n)])
+    for (r1, c1), (r2, c2) in itertools.combinations(xs, 2):
+        if r1 == r2 or c1 == c2 or abs(r1 - r2) == abs(c1 - c2):
+            f &= ~(xs[r1, c1] & xs[r2, c2])
+    z = bdd2zdd(f)
+    assert z.satisfy_count() == f.satisfy_count() == 4
+    assert len(list(z.dfs_preorder())) < len(list(f.dfs_preorder()))
+    for s in z.iter_sets():
+        assert len(s) == n
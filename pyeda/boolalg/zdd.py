@@ -0,0 +1,700 @@
+"""
+The :mod:`pyeda.boolalg.zdd` module implements
+families of sets represented as zero-suppressed decision diagrams.
+
+A ZDD node with variable *x* denotes the union of the sets in its ``lo``
+child, and the sets in its ``hi`` child, each extended with *x*.
+Nodes whose ``hi`` child is the empty family are removed,
+so variables that do not appear in any set do not take up space.
+For sparse families, such as N-queens placements or set covers,
+a ZDD is usually much smaller than the BDD of the same family.
+
+Interface Functions:
+
+* :func:`zddvar` --- Return a unique ZDD variable
+* :func:`bdd2zdd` --- Convert a binary decision diagram into a ZDD
+* :func:`zdd2bdd` --- Convert a ZDD into a binary decision diagram
+
+Interface Classes:
+
+* :class:`ZDDNode`
+* :class:`ZeroSuppressedDD`
+
+  * :class:`ZDDConstant`
+  * :class:`ZDDVariable`
+"""
+
+import weakref
+from functools import cached_property
+
+from pyeda.boolalg import bdd, boolfunc
+from pyeda.boolalg.bdd import (_CACHE_SIZE, _TERMINAL_LEVEL, _apply, _bfs,
+                               _ComputedTable, _dfs_postorder, _dfs_preorder,
+                               _Split)
+
+
+class ZDDNode:
+    """Zero-suppressed decision diagram node
+
+    Nodes are uniquely identified by a ``root`` integer,
+    ``lo`` child node, and ``hi`` child node:
+
+    * ``root`` is the variable's ``uniqid`` attribute
+    * ``lo`` is the family of sets that do not contain the variable
+    * ``hi`` is the family of sets that contain the variable,
+      with the variable removed
+
+    The ``root`` of the zero (empty family) node is -1,
+    and the ``root`` of the one (family of the empty set) node is -2.
+    Both zero/one nodes have ``lo=None`` and ``hi=None``.
+
+    Do **NOT** create ZDD nodes using the ``ZDDNode`` constructor.
+    ZDD node instances are managed internally.
+    """
+    def __init__(self, root, lo, hi):
+        self.root = root
+        self.lo = lo
+        self.hi = hi
+
+
+ZDDNODEZERO = ZDDNode(-1, None, None)
+ZDDNODEONE = ZDDNode(-2, None, None)
+
+
+class _ZDDNodeStore:
+    """Node store for zero-suppressed decision diagrams
+
+    The store owns the unique table, and the computed table.
+    Variables are ordered by uniqid,
+    and the terminal nodes are below all variables.
+    The unique table only holds weak references,
+    so a node is freed as soon as it is no longer referenced.
+    """
+    zero = ZDDNODEZERO
+    one = ZDDNODEONE
+
+    def __init__(self):
+        self.cache = _ComputedTable(_CACHE_SIZE)
+        self._table = weakref.WeakValueDictionary()
+
+    def __len__(self):
+        return len(self._table)
+
+    def mk(self, root, lo, hi):
+        """Return a unique node.
+
+        If *hi* is the empty family, the node is suppressed,
+        and *lo* is returned.
+        """
+        if hi is ZDDNODEZERO:
+            return lo
+        key = (root, lo, hi)
+        try:
+            node = self._table[key]
+        except KeyError:
+            node = self._table[key] = ZDDNode(root, lo, hi)
+        return node
+
+    @staticmethod
+    def level(node):
+        """Return the position of *node* in the variable order."""
+        return node.root if node.root > 0 else _TERMINAL_LEVEL
+
+    @staticmethod
+    def children(node):
+        """Return the (lo, hi) children of *node*."""
+        return node.lo, node.hi
+
+    @staticmethod
+    def cofactors(node, root):
+        """Return the (zero, one) cofactors of *node* w.r.t. *root*."""
+        if node.root == root:
+            return node.lo, node.hi
+        else:
+            return node, ZDDNODEZERO
+
+
+_STORE = _ZDDNodeStore()
+
+# existing ZDDVariable references
+_VARS = {}
+
+# zdd cache
+_ZDDS = weakref.WeakValueDictionary()
+
+
+def zddvar(name, index=None):
+    """Return a unique ZDD variable.
+
+    A ZDD variable is the family that contains one set,
+    whose only element is the variable.
+    Larger families are constructed with the set operators,
+    for example the family ``{{a, b}, {c}}`` is ``a.join(b) | c``.
+
+    The *name* and *index* arguments are the same as for
+    :func:`pyeda.boolalg.bdd.bddvar`.
+    A ZDD variable has the same ``uniqid`` as the BDD variable of the same
+    name.
+    """
+    bvar = boolfunc.var(name, index)
+    try:
+        var = _VARS[bvar.uniqid]
+    except KeyError:
+        var = _VARS[bvar.uniqid] = ZDDVariable(bvar)
+        _ZDDS[var.node] = var
+    return var
+
+
+def bdd2zdd(f, vs=None):
+    """Convert a binary decision diagram into a ZDD.
+
+    The result is the family of all sets of variables in *vs*,
+    such that *f* is one when the variables in the set are one,
+    and all other variables are zero.
+    By default, *vs* is the support of *f*.
+
+    For example::
+
+       >>> a, b = map(bdd.bddvar, "ab")
+       >>> bdd2zdd(a | b).satisfy_count()
+       3
+       >>> bdd2zdd(a, [a, b]).satisfy_count()
+       2
+    """
+    f = bdd.BinaryDecisionDiagram.box(f)
+    vs = _expect_universe(f, vs)
+    mgr = f.manager
+    bst = mgr.store
+    roots = [v.uniqid for v in vs]
+    for v in vs:
+        _ = mgr.bddvar(v.names, v.indices)
+        _ = zddvar(v.names, v.indices)
+    n = len(roots)
+
+    def cofactors(node, root):
+        if bst.levels[root] <= bst.levels[bst.root(node)]:
+            return bst.cofactors(node, root)
+        npoint = {root: bst.zero}
+        lo = bdd._restrict(bst, node, npoint, frozenset(npoint.items()))
+        npoint = {root: bst.one}
+        hi = bdd._restrict(bst, node, npoint, frozenset(npoint.items()))
+        return lo, hi
+
+    results = {}
+    stack = [(f.node, 0, None)]
+    while stack:
+        node, i, cofs = stack.pop()
+        if (node, i) in results:
+            continue
+        if i == n:
+            results[node, i] = (_STORE.one if node == bst.one
+                                else _STORE.zero)
+        elif cofs is not None:
+            lo, hi = (results[cf, i+1] for cf in cofs)
+            results[node, i] = _STORE.mk(roots[i], lo, hi)
+        else:
+            cofs = cofactors(node, roots[i])
+            stack.append((node, i, cofs))
+            stack.extend((cf, i+1, None) for cf in cofs)
+    return _zdd(results[f.node, 0])
+
+
+def zdd2bdd(f, vs=None):
+    """Convert a ZDD into a binary decision diagram.
+
+    The result is the characteristic function of the family over the
+    variables in *vs*:
+    a point is one if the set of variables that are one is in the family.
+    By default, *vs* is the support of *f*.
+
+    The result is a BDD of BDD variables in the default manager,
+    and :func:`bdd2zdd` is its inverse.
+    """
+    f = ZeroSuppressedDD.box(f)
+    vs = _expect_universe(f, vs)
+    mgr = bdd._MANAGER
+    bst = mgr.store
+    roots = [v.uniqid for v in vs]
+    nodes = [mgr.bddvar(v.names, v.indices).node for v in vs]
+    n = len(roots)
+
+    results = {}
+    stack = [(f.node, 0, False)]
+    while stack:
+        node, i, expanded = stack.pop()
+        if (node, i) in results:
+            continue
+        if i == n:
+            results[node, i] = bst.one if node is ZDDNODEONE else bst.zero
+        else:
+            lo, hi = _STORE.cofactors(node, roots[i])
+            if expanded:
+                # Sets that do not contain x are zero where x is one
+                lo, hi = results[lo, i+1], results[hi, i+1]
+                results[node, i] = bdd._ite(bst, nodes[i], hi, lo)
+            else:
+                stack.append((node, i, True))
+                stack.append((lo, i+1, False))
+                stack.append((hi, i+1, False))
+    return mgr._bdd(results[f.node, 0])
+
+
+def _expect_universe(f, vs):
+    """Return the variables of a conversion, in uniqid order.
+
+    The variables must include the support of *f*.
+    """
+    if vs is None:
+        vs = f.support
+    else:
+        # pylint: disable=protected-access
+        vs = boolfunc.Function._expect_vars(vs)
+        uniqids = {v.uniqid for v in vs}
+        missing = [v for v in f.support if v.uniqid not in uniqids]
+        if missing:
+            fstr = "expected vs to include the support, missing {}"
+            raise ValueError(fstr.format(", ".join(map(str, missing))))
+    return sorted({v.uniqid: v for v in vs}.values(),
+                  key=lambda v: v.uniqid)
+
+
+def _zdd(node):
+    """Return a unique ZDD."""
+    try:
+        zdd = _ZDDS[node]
+    except KeyError:
+        zdd = _ZDDS[node] = ZeroSuppressedDD(node)
+    return zdd
+
+
+class ZeroSuppressedDD(boolfunc.Function):
+    """Family of sets represented by a zero-suppressed decision diagram
+
+    .. seealso::
+       This is a subclass of :class:`pyeda.boolalg.boolfunc.Function`
+
+    ZDDs have a single attribute, ``node``,
+    that points to a node in the managed unique table.
+
+    Use the ``zddvar`` function to create ZDD variables,
+    and use the set operators to construct larger families:
+
+    * ``f | g`` --- union
+    * ``f & g`` --- intersection
+    * ``f - g`` --- difference
+    * ``f ^ g`` --- symmetric difference
+    * ``f.join(g)`` --- every union of a set in *f* and a set in *g*
+
+    As a Boolean function,
+    a ZDD is the characteristic function of its family:
+    a point is one if the set of variables that are one is in the family,
+    and every other variable is zero.
+    Therefore the union, intersection, and symmetric difference of two
+    families are the OR, AND, and XOR of their functions.
+    Complement is not defined,
+    because it depends on the set of all variables.
+
+    For example::
+
+       >>> a, b, c = map(zddvar, "abc")
+       >>> f = a.join(b) | c
+       >>> sorted(sorted(map(str, s)) for s in f.iter_sets())
+       [['a', 'b'], ['c']]
+
+    Do **NOT** create a ZDD using the ``ZeroSuppressedDD`` constructor.
+    ZDD instances are managed internally,
+    and you will not be able to use the Python ``is`` operator to establish
+    formal equivalence with manually constructed ZDDs.
+    """
+    def __init__(self, node):
+        self.node = node
+
+    # Operators
+    def __or__(self, other):
+        other_node = self.box(other).node
+        return _zdd(_union(_STORE, self.node, other_node))
+
+    def __and__(self, other):
+        other_node = self.box(other).node
+        return _zdd(_intersect(_STORE, self.node, other_node))
+
+    def __xor__(self, other):
+        other_node = self.box(other).node
+        return _zdd(_symdiff(_STORE, self.node, other_node))
+
+    def __sub__(self, other):
+        other_node = self.box(other).node
+        return _zdd(_diff(_STORE, self.node, other_node))
+
+    def __rsub__(self, other):
+        other_node = self.box(other).node
+        return _zdd(_diff(_STORE, other_node, self.node))
+
+    # From Function
+    @cached_property
+    def support(self):
+        return frozenset(self.inputs)
+
+    @cached_property
+    def inputs(self):
+        roots = {node.root for node in _dfs_postorder(_STORE, self.node, set())
+                 if node.root > 0}
+        return tuple(_VARS[root] for root in sorted(roots))
+
+    def restrict(self, point):
+        node = self.node
+        for v, val in point.items():
+            if self.box(val).is_one():
+                node = _subset1(_STORE, node, v.uniqid)
+            else:
+                node = _subset0(_STORE, node, v.uniqid)
+        return _zdd(node)
+
+    def satisfy_one(self):
+        if self.node is ZDDNODEZERO:
+            return None
+        # Every non-terminal node has a path to the one node
+        point = {v: 0 for v in self.inputs}
+        node = self.node
+        while node is not ZDDNODEONE:
+            if node.lo is ZDDNODEZERO:
+                point[_VARS[node.root]] = 1
+                node = node.hi
+            else:
+                node = node.lo
+        return point
+
+    def satisfy_all(self):
+        inputs = self.inputs
+        for s in self.iter_sets():
+            yield {v: int(v in s) for v in inputs}
+
+    def satisfy_count(self):
+        """Return the number of sets in the family.
+
+        The count is computed in one bottom-up pass over the nodes.
+        """
+        counts = {ZDDNODEZERO: 0, ZDDNODEONE: 1}
+        for node in _dfs_postorder(_STORE, self.node, set()):
+            if node.root > 0:
+                counts[node] = counts[node.lo] + counts[node.hi]
+        return counts[self.node]
+
+    def is_zero(self):
+        return self.node is ZDDNODEZERO
+
+    def is_one(self):
+        return self.node is ZDDNODEONE
+
+    @staticmethod
+    def box(obj):
+        if isinstance(obj, ZeroSuppressedDD):
+            return obj
+        elif obj in (0, "0"):
+            return ZDDZERO
+        elif obj in (1, "1"):
+            return ZDDONE
+        else:
+            return ZDDONE if bool(obj) else ZDDZERO
+
+    # Specific to ZeroSuppressedDD
+    def join(self, other):
+        r"""Return the join of this family and *other*.
+
+        The join is the family of all unions of a set in this family,
+        and a set in *other*:
+        :math:`\{a \cup b \mid a \in f, b \in g\}`
+        """
+        other_node = self.box(other).node
+        return _zdd(_join(_STORE, self.node, other_node))
+
+    def subset0(self, v):
+        """Return the family of sets that do not contain variable *v*."""
+        return _zdd(_subset0(_STORE, self.node, v.uniqid))
+
+    def subset1(self, v):
+        """Return the family of sets that contain variable *v*,
+        with *v* removed from every set.
+        """
+        return _zdd(_subset1(_STORE, self.node, v.uniqid))
+
+    def change(self, v):
+        """Return the family with variable *v* toggled in every set."""
+        return _zdd(_change(_STORE, self.node, v.uniqid))
+
+    def onset(self, v):
+        """Return the family of sets that contain variable *v*."""
+        node = _subset1(_STORE, self.node, v.uniqid)
+        return _zdd(_change(_STORE, node, v.uniqid))
+
+    def offset(self, v):
+        """Return the family of sets that do not contain variable *v*.
+
+        This is the same as :meth:`subset0`.
+        """
+        return self.subset0(v)
+
+    def iter_sets(self):
+        """Iterate through the sets in the family.
+
+        Every set is a frozenset of variables.
+        """
+        stack = [(self.node, ())]
+        while stack:
+            node, roots = stack.pop()
+            if node is ZDDNODEONE:
+                yield frozenset(_VARS[root] for root in roots)
+            elif node is not ZDDNODEZERO:
+                stack.append((node.hi, roots + (node.root, )))
+                stack.append((node.lo, roots))
+
+    def dfs_preorder(self):
+        """Iterate through nodes in depth first search (DFS) pre-order."""
+        yield from _dfs_preorder(_STORE, self.node, set())
+
+    def dfs_postorder(self):
+        """Iterate through nodes in depth first search (DFS) post-order."""
+        yield from _dfs_postorder(_STORE, self.node, set())
+
+    def bfs(self):
+        """Iterate through nodes in breadth first search (BFS) order."""
+        yield from _bfs(_STORE, self.node, set())
+
+    def equivalent(self, other):
+        """Return whether this ZDD is equivalent to *other*.
+
+        You can also use Python's ``is`` operator for ZDD equivalency testing.
+        """
+        other = self.box(other)
+        return self.node is other.node
+
+
+class ZDDConstant(ZeroSuppressedDD):
+    """Zero-suppressed decision diagram constant zero/one
+
+    Zero is the empty family,
+    and one is the family that contains only the empty set.
+
+    Do **NOT** create a ZDD using the ``ZDDConstant`` constructor.
+    ZDD instances are managed internally,
+    and the ZDD zero/one instances are singletons.
+    """
+    def __init__(self, node, value):
+        super().__init__(node)
+        self.value = value
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __int__(self):
+        return self.value
+
+    def __repr__(self):
+        return self.__str__()
+
+    def __str__(self):
+        return str(self.value)
+
+
+ZDDZERO = _ZDDS[ZDDNODEZERO] = ZDDConstant(ZDDNODEZERO, 0)
+ZDDONE = _ZDDS[ZDDNODEONE] = ZDDConstant(ZDDNODEONE, 1)
+
+
+class ZDDVariable(boolfunc.Variable, ZeroSuppressedDD):
+    """Zero-suppressed decision diagram variable
+
+    Do **NOT** create a ZDD using the ``ZDDVariable`` constructor.
+    Use the :func:`zddvar` function instead.
+    """
+    def __init__(self, bvar):
+        boolfunc.Variable.__init__(self, bvar.names, bvar.indices)
+        node = _STORE.mk(bvar.uniqid, ZDDNODEZERO, ZDDNODEONE)
+        ZeroSuppressedDD.__init__(self, node)
+
+
+def _binary_split(st, op, f, g):
+    """Split a binary set operation on the top variable of *f* and *g*."""
+    key = (op, f, g)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return ret
+    root = min(st.level(f), st.level(g))
+    fv0, fv1 = st.cofactors(f, root)
+    gv0, gv1 = st.cofactors(g, root)
+    return _Split(key, False, root, (fv0, gv0), (fv1, gv1))
+
+
+def _union(st, f, g):
+    """Return the union of families *f* and *g*."""
+    return _apply(st, _union_step, st.mk, (f, g))
+
+
+def _union_step(st, f, g):
+    """Return the union of *f* and *g*, or split it on the top variable."""
+    if f is st.zero or f is g:
+        return g
+    elif g is st.zero:
+        return f
+    # f | g = g | f
+    if hash(f) > hash(g):
+        f, g = g, f
+    return _binary_split(st, "union", f, g)
+
+
+def _intersect(st, f, g):
+    """Return the intersection of families *f* and *g*."""
+    return _apply(st, _intersect_step, st.mk, (f, g))
+
+
+def _intersect_step(st, f, g):
+    """Return the intersection of *f* and *g*,
+    or split it on the top variable.
+    """
+    if f is st.zero or g is st.zero:
+        return st.zero
+    elif f is g:
+        return f
+    # f & g = g & f
+    if hash(f) > hash(g):
+        f, g = g, f
+    return _binary_split(st, "intersect", f, g)
+
+
+def _diff(st, f, g):
+    """Return the difference of families *f* and *g*."""
+    return _apply(st, _diff_step, st.mk, (f, g))
+
+
+def _diff_step(st, f, g):
+    """Return the difference of *f* and *g*, or split it on the top variable.
+    """
+    if f is st.zero or f is g:
+        return st.zero
+    elif g is st.zero:
+        return f
+    return _binary_split(st, "diff", f, g)
+
+
+def _symdiff(st, f, g):
+    """Return the symmetric difference of families *f* and *g*."""
+    return _apply(st, _symdiff_step, st.mk, (f, g))
+
+
+def _symdiff_step(st, f, g):
+    """Return the symmetric difference of *f* and *g*,
+    or split it on the top variable.
+    """
+    if f is g:
+        return st.zero
+    elif f is st.zero:
+        return g
+    elif g is st.zero:
+        return f
+    # f ^ g = g ^ f
+    if hash(f) > hash(g):
+        f, g = g, f
+    return _binary_split(st, "symdiff", f, g)
+
+
+def _subset0(st, node, root):
+    """Return the sets of *node* that do not contain variable *root*."""
+    return _apply(st, _subset_step, st.mk, (node, root, 0))
+
+
+def _subset1(st, node, root):
+    """Return the sets of *node* that contain variable *root*,
+    with *root* removed.
+    """
+    return _apply(st, _subset_step, st.mk, (node, root, 1))
+
+
+def _subset_step(st, node, root, val):
+    """Return the subset of *node*, or split it on its root variable."""
+    if st.level(node) > root:
+        return st.zero if val else node
+    elif node.root == root:
+        return node.hi if val else node.lo
+
+    key = ("subset", node, root, val)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return ret
+    return _Split(key, False, node.root, (node.lo, root, val),
+                  (node.hi, root, val))
+
+
+def _change(st, node, root):
+    """Return the family *node* with variable *root* toggled in every set."""
+    return _apply(st, _change_step, st.mk, (node, root))
+
+
+def _change_step(st, node, root):
+    """Return the change of *node*, or split it on its root variable."""
+    if st.level(node) > root:
+        return st.mk(root, st.zero, node)
+    elif node.root == root:
+        return st.mk(root, node.hi, node.lo)
+
+    key = ("change", node, root)
+    ret = st.cache.get(key)
+    if ret is not None:
+        return ret
+    return _Split(key, False, node.root, (node.lo, root), (node.hi, root))
+
+
+def _join(st, f, g):
+    """Return the join of families *f* and *g*.
+
+    Sub-problems are generators,
+    which yield ``(f, g)`` sub-problems,
+    and receive their results.
+    """
+    zero, one = st.zero, st.one
+
+    def solve(f, g):
+        key = ("join", f, g)
+        root = min(st.level(f), st.level(g))
+        fv0, fv1 = st.cofactors(f, root)
+        gv0, gv1 = st.cofactors(g, root)
+        lo = yield (fv0, gv0)
+        # Sets that contain x come from either side, or both
+        hi1 = yield (fv1, _union(st, gv0, gv1))
+        hi0 = yield (fv0, gv1)
+        ret = st.mk(root, lo, _union(st, hi0, hi1))
+        st.cache.put(key, ret)
+        return ret
+
+    def terminal(f, g):
+        """Return the result of a terminal case, or a cached result."""
+        if f is zero or g is zero:
+            return zero
+        elif f is one:
+            return g
+        elif g is one:
+            return f
+        # f * g = g * f
+        if hash(f) > hash(g):
+            f, g = g, f
+        return st.cache.get(("join", f, g))
+
+    def subproblem(f, g):
+        if hash(f) > hash(g):
+            f, g = g, f
+        return solve(f, g)
+
+    ret = terminal(f, g)
+    if ret is not None:
+        return ret
+    stack = [subproblem(f, g)]
+    ret = None
+    while stack:
+        try:
+            args = stack[-1].send(ret)
+        except StopIteration as stop:
+            stack.pop()
+            ret = stop.value
+        else:
+            ret = terminal(*args)
+            if ret is None:
+                stack.append(subproblem(*args))
+    return ret
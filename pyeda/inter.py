@@ -11,7 +11,7 @@ To prepare a terminal for interactive use:
 # pylint: disable=W0611
 
 
-from pyeda.boolalg.bdd import (BDDConstant, BDDNode, BDDVariable,
+from pyeda.boolalg.bdd import (BDDConstant, BDDManager, BDDNode, BDDVariable,
                                BinaryDecisionDiagram, bdd2expr, bddvar,
                                expr2bdd, ite, upoint2bddpoint)
 from pyeda.boolalg.bfarray import (bddones, bddvars, bddzeros, exprones,
@@ -33,6 +33,8 @@ from pyeda.boolalg.minimization import espresso_exprs, espresso_tts
 from pyeda.boolalg.table import (TruthTable, TTConstant, TTVariable,
                                  expr2truthtable, truthtable, truthtable2expr,
                                  ttvar)
+from pyeda.boolalg.zdd import (ZDDConstant, ZDDNode, ZDDVariable,
+                               ZeroSuppressedDD, bdd2zdd, zdd2bdd, zddvar)
 from pyeda.parsing.boolexpr import parse as parse_expr
 from pyeda.parsing.dimacs import parse_cnf, parse_sat
 from pyeda.util import clog2, parity
@@ -35,9 +35,12 @@ class SudokuSolver:
 
         self.litmap, self.S = expr2dimacscnf(And(V, R, C, B))
 
+        # Add the clauses once, and solve every grid under assumptions
+        self._solver = self.S.solver()
+
     def solve(self, grid):
         """Return a solution point for a Sudoku grid."""
-        soln = self.S.satisfy_one(assumptions=self._parse_grid(grid))
+        soln = self._solver.solve(self._parse_grid(grid))
         return self.S.soln2point(soln, self.litmap)
 
     def display_solve(self, grid):
@@ -144,6 +144,7 @@ EXPRNODE = dict(
         pjoin("extension", "boolexpr"),
     ],
     sources=[
+        pjoin("extension", "boolexpr", "alloc.c"),
         pjoin("extension", "boolexpr", "argset.c"),
         pjoin("extension", "boolexpr", "array.c"),
         pjoin("extension", "boolexpr", "binary.c"),
@@ -156,6 +157,8 @@ EXPRNODE = dict(
         pjoin("extension", "boolexpr", "product.c"),
         pjoin("extension", "boolexpr", "set.c"),
         pjoin("extension", "boolexpr", "simple.c"),
+        pjoin("extension", "boolexpr", "tseitin.c"),
+        pjoin("extension", "boolexpr", "unique.c"),
         pjoin("extension", "boolexpr", "util.c"),
         pjoin("extension", "boolexpr", "vector.c"),
         pjoin("pyeda", "boolalg", "exprnodemodule.c"),